@@ -4,6 +4,9 @@ import datetime
 import time
 import sys
 
+# Origin of the startup timeline; phases before elysium is importable are
+# timed with raw monotonic readings and recorded once it is.
+_STARTUP_T0 = time.monotonic()
 _REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
 
 
@@ -76,7 +79,30 @@ def _ensure_repo_runtime() -> str:
     return _REPO_ROOT
 
 
+def _hand_off_to_running_instance() -> bool:
+    """
+    Pass this launch to an ELYSIUM that is already running, before the repo
+    sync and dependency checks. True means the running instance took it.
+    """
+    if not os.path.isfile(os.path.join(_REPO_ROOT, "elysium", "core", "single_instance.py")):
+        return False
+    if _REPO_ROOT not in sys.path:
+        sys.path.insert(0, _REPO_ROOT)
+    try:
+        from elysium.core.single_instance import hand_off, request_from_argv
+    except ImportError:
+        return False
+    try:
+        return hand_off(request_from_argv(sys.argv[1:]))
+    except Exception:
+        return False
+
+
+if __name__ == "__main__" and _hand_off_to_running_instance():
+    sys.exit(0)
+
 _REPO_ROOT = _ensure_repo_runtime()
+_RUNTIME_READY_T = time.monotonic()
 
 
 def setup_logging():
@@ -97,11 +123,10 @@ import subprocess
 import re
 import shutil
 import tempfile
-import winreg
 import ctypes
 import faulthandler
+import importlib.util
 import traceback
-from subprocess import Popen, PIPE
 
 
 def _subprocess_no_window_flags():
@@ -158,37 +183,38 @@ def bootstrap_startup():
         pass
 
 
+PIP_TIMEOUT_SECONDS = 1800
+
+# pip name -> module probed for it. Probing uses find_spec, so nothing here
+# is actually imported before the splash is up.
+ELYSIUM_REQUIRED_MODULES = {
+    "PyQt5": "PyQt5.QtCore",
+    "PySide6": "PySide6.QtCore",
+    "requests": "requests",
+    "openpyxl": "openpyxl",
+    "packaging": "packaging",
+    "platformdirs": "platformdirs",
+    "pydantic": "pydantic",
+    "pyyaml": "yaml",
+}
+
+
+def _module_available(module_name):
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
 def check_and_install_elysium_dependencies():
     """Check and install Elysium's own dependencies."""
     logger.info("Checking Elysium's own dependencies")
     
-    # List of required packages for Elysium itself
-    required_packages = [
-        "PyQt5",
-        "PySide6",
-        "requests",
-        "openpyxl",
-        "setuptools",
-        "platformdirs",
-        "pydantic",
-        "pyyaml",
-    ]
-
     missing_packages = []
-    for package in required_packages:
-        try:
-            if package == "PyQt5":
-                __import__("PyQt5.QtCore")
-            elif package == "PySide6":
-                __import__("PySide6.QtCore")
-            elif package == "setuptools":
-                __import__("pkg_resources")
-            elif package == "pyyaml":
-                __import__("yaml")
-            else:
-                __import__(package)
+    for package, module_name in ELYSIUM_REQUIRED_MODULES.items():
+        if _module_available(module_name):
             logger.info(f"Package already installed: {package}")
-        except ImportError:
+        else:
             missing_packages.append(package)
             logger.warning(f"Package needs installation: {package}")
     
@@ -200,40 +226,30 @@ def check_and_install_elysium_dependencies():
     logger.info(f"Installing {len(missing_packages)} missing Elysium dependencies: {', '.join(missing_packages)}")
     
     try:
-        # Use subprocess to run pip
-        process = subprocess.Popen(
-            [sys.executable, "-m", "pip", "install"] + missing_packages,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True
-        )
-        
-        stdout, stderr = process.communicate()
+        from elysium.core import proc
+
+        result = proc.run([sys.executable, "-m", "pip", "install"] + missing_packages, timeout=PIP_TIMEOUT_SECONDS)
         
-        if stdout:
-            logger.info(f"Installation output:\n{stdout}")
-        if stderr:
-            logger.warning(f"Installation stderr:\n{stderr}")
+        if result.stdout:
+            logger.info(f"Installation output:\n{result.stdout}")
+        if result.stderr:
+            logger.warning(f"Installation stderr:\n{result.stderr}")
         
-        if process.returncode == 0:
+        if result.ok:
             logger.info("Successfully installed all Elysium dependencies")
             return True
         else:
-            logger.error(f"Failed to install dependencies, return code: {process.returncode}")
+            logger.error(f"Failed to install dependencies: {result.describe()}")
             # Try installing packages one by one
             logger.info("Attempting to install packages individually")
             all_success = True
             for package in missing_packages:
-                try:
-                    logger.info(f"Installing {package} individually")
-                    subprocess.check_call(
-                        [sys.executable, "-m", "pip", "install", package],
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE
-                    )
+                logger.info(f"Installing {package} individually")
+                single = proc.run([sys.executable, "-m", "pip", "install", package], timeout=PIP_TIMEOUT_SECONDS)
+                if single.ok:
                     logger.info(f"Successfully installed {package}")
-                except subprocess.CalledProcessError as e:
-                    logger.error(f"Failed to install {package}: {str(e)}")
+                else:
+                    logger.error(f"Failed to install {package}: {single.describe()}")
                     all_success = False
             
             return all_success
@@ -243,38 +259,37 @@ def check_and_install_elysium_dependencies():
 
 def ensure_elysium_dependencies():
     """Verify third-party packages; install and restart if any are missing."""
-    try:
-        __import__("requests")
-        __import__("PyQt5.QtCore")
-        __import__("PySide6.QtCore")
-        __import__("openpyxl")
-        __import__("pkg_resources")
-        __import__("platformdirs")
-        __import__("pydantic")
-        __import__("yaml")
+    missing = [module for module in ELYSIUM_REQUIRED_MODULES.values() if not _module_available(module)]
+    if not missing:
         logger.info("All required packages are already installed")
         return True
-    except ImportError as e:
-        logger.warning(f"Missing dependency: {str(e)}")
-        print("Some dependencies are missing. Attempting to install them...")
-        if check_and_install_elysium_dependencies():
-            print("Dependencies installed successfully. Launching Elysium...")
-            restart_application()
-        else:
-            manual_cmd = "pip install PyQt5 PySide6 requests openpyxl setuptools platformdirs pydantic pyyaml"
-            print("Failed to install dependencies. Please install them manually:")
-            print(manual_cmd)
-            show_fatal_error(
-                "ELYSIUM - Missing Dependencies",
-                f"Required Python packages could not be installed.\n\n"
-                f"Open a terminal and run:\n{manual_cmd}"
-            )
-            sys.exit(1)
+
+    logger.warning(f"Missing dependency: {', '.join(missing)}")
+    print("Some dependencies are missing. Attempting to install them...")
+    if check_and_install_elysium_dependencies():
+        print("Dependencies installed successfully. Launching Elysium...")
+        restart_application()
+    else:
+        manual_cmd = "pip install PyQt5 PySide6 requests openpyxl packaging platformdirs pydantic pyyaml"
+        print("Failed to install dependencies. Please install them manually:")
+        print(manual_cmd)
+        show_fatal_error(
+            "ELYSIUM - Missing Dependencies",
+            f"Required Python packages could not be installed.\n\n"
+            f"Open a terminal and run:\n{manual_cmd}"
+        )
+        sys.exit(1)
 
 
 ensure_elysium_dependencies()
+_DEPENDENCIES_READY_T = time.monotonic()
 
 from elysium.core.paths import get_crash_log_path
+from elysium.core.timeline import get_startup_timer
+
+_startup_timer = get_startup_timer(origin=_STARTUP_T0)
+_startup_timer.record("ensure_runtime_ready", _STARTUP_T0, _RUNTIME_READY_T)
+_startup_timer.record("ensure_elysium_dependencies", _RUNTIME_READY_T, _DEPENDENCIES_READY_T)
 
 
 def _should_launch_qml_ui() -> bool:
@@ -282,9 +297,9 @@ def _should_launch_qml_ui() -> bool:
     if os.environ.get("ELYSIUM_FORCE_LEGACY") == "1":
         return False
     try:
-        from elysium.core.settings import load_settings
+        from elysium.core.settings import peek_setting
 
-        return bool(load_settings().get("use_qml_ui", True))
+        return bool(peek_setting("use_qml_ui", True))
     except Exception:
         return True
 
@@ -310,29 +325,35 @@ if __name__ == "__main__" and _should_launch_qml_ui():
         print(f"QML UI failed ({exc}). Falling back to classic UI...", file=sys.stderr)
 
 from elysium import __version__ as ELYSIUM_VERSION
+from elysium.core.lazy import lazy_import
 from elysium.core.logging_config import setup_dependency_logger
 from elysium.core.paths import get_base_dir, get_logs_dir, resolve_app_dir
-from elysium.core.settings import load_settings
-from elysium.core.exceptions import ElysiumError, NodeMissingError
-from elysium.services.app_registry import AppRegistry
-from elysium.services.diagnostics_service import export_diagnostics
-from elysium.services.environment_service import should_use_isolated_env
-from elysium.services.git_service import is_git_installed, resolve_git_executable, git_command
-from elysium.services.launcher_service import LauncherService
-from elysium.services.process_service import (
-    close_stale_application_state,
-    patch_flow_launcher,
-    stop_flow_server,
-)
-from elysium.windows.titlebar import apply_native_title_bar_theme
+from elysium.core.exceptions import ElysiumError, EnvironmentNotReadyError, NodeMissingError
+from elysium.core.single_instance import claim_single_instance, request_from_argv
+
+# Everything below loads on first use so the splash can paint before
+# pydantic, yaml, requests and the service layer are imported.
+requests = lazy_import("requests")
+_app_registry = lazy_import("elysium.services.app_registry")
+_cancel = lazy_import("elysium.core.cancel")
+_cleanup_service = lazy_import("elysium.services.cleanup_service")
+_dependency_service = lazy_import("elysium.services.dependency_service")
+_diagnostics_service = lazy_import("elysium.services.diagnostics_service")
+_env_prep_service = lazy_import("elysium.services.env_prep_service")
+_environment_service = lazy_import("elysium.services.environment_service")
+_flow_server = lazy_import("elysium.services.flow_server")
+_git_service = lazy_import("elysium.services.git_service")
+_launcher_service = lazy_import("elysium.services.launcher_service")
+_manifest_sources = lazy_import("elysium.services.manifest_sources")
+_pip_installer = lazy_import("elysium.services.pip_installer")
+_proc = lazy_import("elysium.core.proc")
+_process_service = lazy_import("elysium.services.process_service")
+_titlebar = lazy_import("elysium.windows.titlebar")
+_update_service = lazy_import("elysium.services.update_service")
 
 logger = setup_dependency_logger()
 
-import requests
-import openpyxl
-import pkg_resources
-from pkg_resources import DistributionNotFound, VersionConflict
-from PyQt5.QtCore import QSize, Qt, pyqtSignal, QRect, QThread, QTimer
+from PyQt5.QtCore import QObject, QSize, Qt, pyqtSignal, QRect, QThread, QTimer
 from PyQt5.QtWidgets import (
     QApplication, QHBoxLayout, QWidget, QVBoxLayout, QLabel, QPushButton,
     QListWidget, QListWidgetItem, QMessageBox, QToolButton, QGridLayout,
@@ -367,6 +388,18 @@ def _set_widget_background(widget, color):
     widget.setPalette(palette)
 
 
+def unsatisfied_requirements(required_packages):
+    """Return requirement lines that are missing or at the wrong version."""
+    result = _dependency_service.check_requirements(required_packages)
+    for requirement in result.satisfied:
+        logger.info(f"Package already satisfied: {requirement}")
+    for issue in result.missing + result.conflicting:
+        logger.warning(f"Package needs installation: {issue.requirement} - Reason: {issue.reason}")
+    for line in result.invalid:
+        logger.warning(f"Skipping unparseable requirement: {line}")
+    return result.to_install()
+
+
 ICON_DOWNLOAD_TIMEOUT = 8
 
 
@@ -426,6 +459,9 @@ def ensure_nodejs_path(env):
 
     return os.path.exists(os.path.join(node_dir, 'npm.cmd'))
 
+GIT_INSTALL_TIMEOUT_SECONDS = 900
+
+
 def install_git():
     """Download and install Git for Windows."""
     logger.info("Starting Git installation...")
@@ -478,30 +514,24 @@ def install_git():
             "/SP-",
             "/CLOSEAPPLICATIONS",
             "/RESTARTAPPLICATIONS",
-            '/COMPONENTS="icons,ext\reg\shellhere,assoc,assoc_sh"'
+            r'/COMPONENTS="icons,ext\reg\shellhere,assoc,assoc_sh"'
         ]
         
-        process = subprocess.Popen(
-            install_args,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        
-        stdout, stderr = process.communicate()
+        result = _proc.run(install_args, timeout=GIT_INSTALL_TIMEOUT_SECONDS, encoding='utf-8')
         
-        if stdout:
-            logger.info(f"Installer stdout: {stdout.decode('utf-8', errors='replace')}")
-        if stderr:
-            logger.warning(f"Installer stderr: {stderr.decode('utf-8', errors='replace')}")
+        if result.stdout:
+            logger.info(f"Installer stdout: {result.stdout}")
+        if result.stderr:
+            logger.warning(f"Installer stderr: {result.stderr}")
         
-        if process.returncode != 0:
-            logger.error(f"Git installer failed with return code {process.returncode}")
+        if not result.ok:
+            logger.error(f"Git installer failed: {result.describe()}")
             return False
         
         logger.info("Git installation completed successfully")
 
         time.sleep(2)
-        git_ready = resolve_git_executable() is not None
+        git_ready = _git_service.resolve_git_executable() is not None
 
         try:
             os.remove(installer_path)
@@ -716,22 +746,29 @@ class IconDownloadThread(QThread):
 
 
 class StartupInitThread(QThread):
-    """Run blocking startup cleanup off the UI thread."""
+    """Load the workspace off the UI thread; stale-state cleanup runs alongside."""
     status_signal = pyqtSignal(str, int)
     finished_signal = pyqtSignal()
 
     def run(self):
         try:
-            self.status_signal.emit("Closing previous sessions...", 15)
-            close_stale_application_state()
+            _cleanup_service.get_startup_cleanup().start()
             self.status_signal.emit("Preparing workspace...", 55)
-            AppRegistry()
+            with _startup_timer.phase("manifest_sources"):
+                _manifest_sources.resolve_manifest_path(fetch=True)
+            with _startup_timer.phase("app_registry_load"):
+                _app_registry.AppRegistry()
             self.status_signal.emit("Finishing setup...", 85)
         except Exception as exc:
             logger.warning("Startup cleanup encountered an issue: %s", exc)
         self.finished_signal.emit()
 
 
+class InstanceRequestRelay(QObject):
+    """Moves hand-off requests from the listener thread onto the UI thread."""
+    request_signal = pyqtSignal(object)
+
+
 class StartupSplash(QWidget):
     """Lightweight splash shown while startup work runs."""
 
@@ -813,41 +850,47 @@ class GitUpdateThread(QThread):
     progress_signal = pyqtSignal(str)
     finished_signal = pyqtSignal()
 
-    def __init__(self, program_name, git_repo_url, program_directory, icon_basename=None):
+    def __init__(self, program_name, git_repo_url, program_directory, icon_basename=None, app_id=None):
         super().__init__()
         self.program_name = program_name
         self.git_repo_url = git_repo_url
         self.program_directory = program_directory
         self.icon_basename = icon_basename
+        self.app_id = app_id or program_name.lower()
+        self._cancel = _cancel.CancelToken()
+
+    def cancel(self):
+        """Kill the running git/pip child; the thread then finishes normally."""
+        self._cancel.cancel()
 
     def run(self):
+        with _cancel.use_token(self._cancel):
+            self._run()
+
+    def _run(self):
         try:
             if not os.path.exists(self.program_directory) or not os.listdir(self.program_directory):
                 self.progress_signal.emit(f"Cloning {self.program_name}...")
                 # Use shallow clone (--depth 1) and single branch for faster cloning
-                process = subprocess.Popen(
-                    git_command('clone', '--depth', '1', '--single-branch', self.git_repo_url, self.program_directory),
-                    stdout=PIPE, stderr=PIPE, universal_newlines=True
-                )
+                git_args = _git_service.git_command('clone', '--depth', '1', '--single-branch', self.git_repo_url, self.program_directory)
             else:
                 self.progress_signal.emit(f"Updating {self.program_name}...")
-                process = subprocess.Popen(
-                    git_command('-C', self.program_directory, 'pull', '--depth', '1', '--no-tags'),
-                    stdout=PIPE, stderr=PIPE, universal_newlines=True
-                )
+                git_args = _git_service.git_command('-C', self.program_directory, 'pull', '--depth', '1', '--no-tags')
 
-            while True:
-                output = process.stderr.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    self.progress_signal.emit(output.strip())
+            # git reports progress on stderr; both pipes are drained so neither can fill up.
+            result = _proc.run(
+                git_args,
+                timeout=_update_service.update_timeout_seconds(),
+                on_stderr=self.progress_signal.emit,
+            )
 
-            if process.returncode == 0:
+            if result.cancelled:
+                self.progress_signal.emit(f"{self.program_name} update cancelled.")
+            elif result.ok:
                 self.progress_signal.emit(f"{self.program_name} update completed successfully.")
 
                 if self.program_name == "Flow":
-                    patch_flow_launcher(self.program_directory)
+                    _process_service.patch_flow_launcher(self.program_directory)
 
                 if self.icon_basename:
                     source_icon = os.path.join(self.program_directory, self.icon_basename)
@@ -864,6 +907,7 @@ class GitUpdateThread(QThread):
                     self.progress_signal.emit(f"Checking dependencies for {self.program_name}...")
                     self.check_and_install_dependencies(requirements_file)
             else:
+                logger.error(f"git failed for {self.program_name}: {result.describe()}")
                 self.progress_signal.emit(f"Error updating {self.program_name}.")
 
         except Exception as e:
@@ -874,18 +918,14 @@ class GitUpdateThread(QThread):
     def check_and_install_dependencies(self, requirements_file):
         try:
             logger.info(f"Starting dependency check for {self.program_name} using {requirements_file}")
+
+            fingerprint = _dependency_service.requirements_fingerprint(requirements_file)
+            if _dependency_service.is_fingerprint_satisfied(self.app_id, fingerprint):
+                self.progress_signal.emit("All dependencies are already satisfied.")
+                logger.info(f"Requirements unchanged since last check for {self.program_name}; skipping scan")
+                return
             
-            # Read requirements file
-            with open(requirements_file, 'r') as f:
-                # Handle both full-line comments and inline comments
-                required_packages = []
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        # Remove inline comments
-                        if '#' in line:
-                            line = line.split('#')[0].strip()
-                        required_packages.append(line)
+            required_packages = _dependency_service.read_requirements(requirements_file)
             
             logger.info(f"Found {len(required_packages)} required packages: {', '.join(required_packages)}")
             
@@ -895,203 +935,50 @@ class GitUpdateThread(QThread):
                 return
                 
             # Check which packages need to be installed
-            missing_packages = []
-            installed_packages = []
-            for package_req in required_packages:
-                # Handle package with version specifier and strip inline comments
-                package_req_clean = package_req.split('#')[0].strip()
-                package_name = package_req_clean.split('==')[0].split('>')[0].split('<')[0].strip()
-                try:
-                    # Use the clean version for requirement checking
-                    pkg_resources.require(package_req_clean)
-                    installed_packages.append(package_req_clean)
-                    logger.info(f"Package already satisfied: {package_req}")
-                except (DistributionNotFound, VersionConflict) as e:
-                    missing_packages.append(package_req_clean)
-                    logger.warning(f"Package needs installation: {package_req} - Reason: {str(e)}")
+            missing_packages = unsatisfied_requirements(required_packages)
             
             if not missing_packages:
                 self.progress_signal.emit("All dependencies are already satisfied.")
                 logger.info("All dependencies are already satisfied.")
+                _dependency_service.record_satisfied(self.app_id, fingerprint)
                 return
             
             logger.info(f"Need to install {len(missing_packages)} packages: {', '.join(missing_packages)}")
                 
-            # Try batch installation first
-            self.progress_signal.emit(f"Installing {len(missing_packages)} dependencies in batch mode...")
-            logger.info(f"Attempting batch installation of {len(missing_packages)} packages")
-            
-            try:
-                process = subprocess.Popen(
-                    [sys.executable, '-m', 'pip', 'install'] + missing_packages,
-                    stdout=PIPE, stderr=PIPE, universal_newlines=True
+            self.progress_signal.emit(f"Installing {len(missing_packages)} dependencies...")
+            result = _pip_installer.PipInstaller(on_output=self.progress_signal.emit).install(missing_packages)
+
+            if result.ok:
+                self.progress_signal.emit("All dependencies installed successfully.")
+                logger.info(
+                    f"Installed {len(result.installed)} packages in {len(result.attempts)} pip call(s): "
+                    + ", ".join(f"{name}=={version}" for name, version in result.installed.items())
                 )
-                
-                # Log the exact command being run
-                logger.info(f"Running command: {sys.executable} -m pip install {' '.join(missing_packages)}")
-                
-                # Collect all output for logging
-                all_output = []
-                
-                # Monitor the installation process
-                while True:
-                    output = process.stdout.readline()
-                    if output == '' and process.poll() is not None:
-                        break
-                    if output:
-                        output = output.strip()
-                        self.progress_signal.emit(output)
-                        all_output.append(output)
-                
-                # Also collect any stderr output
-                stderr_output = process.stderr.read() if process.stderr else ""
-                if stderr_output:
-                    logger.warning(f"Stderr from batch installation: {stderr_output}")
-                
-                # Log all collected output
-                if all_output:
-                    logger.info("Batch installation output:\n" + "\n".join(all_output))
-                
-                if process.returncode == 0:
-                    self.progress_signal.emit("All dependencies installed successfully.")
-                    logger.info("Batch installation completed successfully")
-                    return
-                else:
-                    self.progress_signal.emit("Batch installation failed. Trying individual installations...")
-                    logger.warning(f"Batch installation failed with return code {process.returncode}. Falling back to individual installations.")
-            except Exception as e:
-                error_msg = f"Batch installation error: {str(e)}. Trying individual installations..."
-                self.progress_signal.emit(error_msg)
-                logger.error(error_msg, exc_info=True)
-            
-            # If batch installation fails, try installing packages individually
-            logger.info("Starting individual package installations")
-            successful_installs = 0
-            failed_packages = []
-            
-            for package in missing_packages:
-                try:
-                    self.progress_signal.emit(f"Installing {package}...")
-                    logger.info(f"Attempting to install {package}")
-                    
-                    # Try to install the package with multiple retry strategies if needed
-                    success, output = self.install_package_with_retries(package)
-                    
-                    if success:
-                        successful_installs += 1
-                        logger.info(f"Successfully installed {package}")
-                    else:
-                        failed_packages.append(package)
-                        logger.error(f"Failed to install {package} after all retry attempts")
-                        self.progress_signal.emit(f"Failed to install {package} after multiple attempts")
-                except Exception as e:
-                    failed_packages.append(package)
-                    error_msg = f"Error installing {package}: {str(e)}"
-                    self.progress_signal.emit(error_msg)
-                    logger.error(error_msg, exc_info=True)
-            
-            status_msg = f"Dependency installation completed. {successful_installs}/{len(missing_packages)} packages installed successfully."
-            self.progress_signal.emit(status_msg)
-            
-            if failed_packages:
-                logger.warning(f"Failed to install these packages: {', '.join(failed_packages)}")
-            
-            logger.info(status_msg)
+            else:
+                status_msg = f"Dependency installation failed ({result.failure.value}): {', '.join(result.failed)}"
+                self.progress_signal.emit(status_msg)
+                logger.warning(status_msg)
             
         except Exception as e:
             error_msg = f"Error checking dependencies: {str(e)}"
             self.progress_signal.emit(error_msg)
             logger.error(error_msg, exc_info=True)
-            
-    def install_package_with_retries(self, package):
-        """Try multiple strategies to install a package with retries."""
-        # Strategy 1: Standard pip install
-        self.progress_signal.emit(f"Trying standard installation for {package}...")
-        logger.info(f"Strategy 1: Standard pip install for {package}")
-        success, output = self.try_install_package(package)
-        if success:
-            return True, output
-            
-        # Strategy 2: Try with --no-cache-dir option
-        self.progress_signal.emit(f"Retrying {package} with --no-cache-dir...")
-        logger.info(f"Strategy 2: Trying pip install with --no-cache-dir for {package}")
-        success, output = self.try_install_package(package, ["--no-cache-dir"])
-        if success:
-            return True, output
-            
-        # Strategy 3: Try with --no-deps option
-        self.progress_signal.emit(f"Retrying {package} with --no-deps...")
-        logger.info(f"Strategy 3: Trying pip install with --no-deps for {package}")
-        success, output = self.try_install_package(package, ["--no-deps"])
-        if success:
-            return True, output
-            
-        # Strategy 4: Try with --user option
-        self.progress_signal.emit(f"Retrying {package} with --user...")
-        logger.info(f"Strategy 4: Trying pip install with --user for {package}")
-        success, output = self.try_install_package(package, ["--user"])
-        if success:
-            return True, output
-            
-        # Strategy 5: Try with an alternative index URL (PyPI mirror)
-        self.progress_signal.emit(f"Retrying {package} with alternative index...")
-        logger.info(f"Strategy 5: Trying pip install with alternative index for {package}")
-        success, output = self.try_install_package(package, ["--index-url", "https://pypi.org/simple"])
-        if success:
-            return True, output
-            
-        # Strategy 6: Try with --trusted-host option if it might be a certificate issue
-        self.progress_signal.emit(f"Retrying {package} with trusted-host option...")
-        logger.info(f"Strategy 6: Trying pip install with trusted-host for {package}")
-        success, output = self.try_install_package(package, ["--trusted-host", "pypi.org", "--trusted-host", "files.pythonhosted.org"])
-        if success:
-            return True, output
-            
-        # All strategies failed
-        return False, output
-        
-    def try_install_package(self, package, extra_args=None):
-        """Try to install a package with the given extra arguments."""
-        try:
-            # Clean the package name by removing any comments
-            package_clean = package.split('#')[0].strip()
-            
-            cmd = [sys.executable, '-m', 'pip', 'install', package_clean]
-            if extra_args:
-                cmd.extend(extra_args)
-                
-            logger.info(f"Running command: {' '.join(cmd)}")
-            
-            process = subprocess.Popen(
-                cmd,
-                stdout=PIPE, stderr=PIPE, universal_newlines=True
-            )
-            
-            stdout, stderr = process.communicate()
-            
-            # Log the output
-            if stdout:
-                logger.info(f"Output from installing {package}:\n{stdout}")
-            if stderr:
-                logger.warning(f"Error output for {package}:\n{stderr}")
-                
-            if process.returncode == 0:
-                return True, stdout
-            else:
-                return False, stderr
-        except Exception as e:
-            logger.error(f"Exception during installation of {package}: {str(e)}", exc_info=True)
-            return False, str(e)
 
 class ProgramUpdater(QWidget):
+    cleanup_finished_signal = pyqtSignal()
+
     def __init__(self, defer_app_status=False):
         super().__init__()
+        self._startup_cleanup = _cleanup_service.get_startup_cleanup()
+        self._launch_after_cleanup = []
+        self.cleanup_finished_signal.connect(self._on_startup_cleanup_finished, Qt.QueuedConnection)
+        self._startup_cleanup.add_done_callback(self.cleanup_finished_signal.emit)
         self.setObjectName("elysiumMain")
         self._dark_mode = True
         self._defer_app_status = defer_app_status
         self.base_dir = get_base_dir()
-        self.app_registry = AppRegistry()
-        self.launcher_service = LauncherService(self.app_registry)
+        self.app_registry = _app_registry.AppRegistry()
+        self.launcher_service = _launcher_service.LauncherService(self.app_registry)
         self.program_icons = {}
 
         self.user_first_name = get_user_first_name()
@@ -1104,6 +991,8 @@ class ProgramUpdater(QWidget):
         self.icon_download_threads = []
         self.completed_updates = 0
         self.total_updates = 0
+        self._first_update_started = None
+        self._first_update_timed = False
         self.programs = self.app_registry.legacy_programs_dict()
 
         self.init_ui()
@@ -1123,11 +1012,11 @@ class ProgramUpdater(QWidget):
             self.apps_scroll.setStyleSheet(build_scroll_stylesheet(dark))
             _set_widget_background(self.apps_scroll.viewport(), t["surface"])
             self.apps_grid_host.setStyleSheet("background: transparent;")
-        QTimer.singleShot(0, lambda: apply_native_title_bar_theme(self, dark))
+        QTimer.singleShot(0, lambda: _titlebar.apply_native_title_bar_theme(self, dark))
 
     def showEvent(self, event):
         super().showEvent(event)
-        apply_native_title_bar_theme(self, self._dark_mode)
+        _titlebar.apply_native_title_bar_theme(self, self._dark_mode)
 
     def init_ui(self):
         self.setWindowTitle('ELYSIUM')
@@ -1350,6 +1239,18 @@ class ProgramUpdater(QWidget):
         for program, info in self.programs.items():
             self.set_program_status(program, self.get_program_status(program, info))
 
+    def handle_instance_request(self, message):
+        """Request handed over by a second launch (see elysium.core.single_instance)."""
+        if self.isMinimized():
+            self.showNormal()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        if message.get("action") == "launch":
+            app = self.app_registry.get(message.get("app_id", ""))
+            if app is not None and app.name in self.programs:
+                self.program_clicked(app.name)
+
     def begin_post_show_startup(self):
         """Non-blocking tasks after the main window is visible."""
         self.start_background_icon_downloads()
@@ -1401,7 +1302,7 @@ class ProgramUpdater(QWidget):
     def update_program_direct(self, program_name, git_repo_url):
         try:
             # Check if Git is installed before attempting to update
-            if not is_git_installed():
+            if not _git_service.is_git_installed():
                 logger.warning(f"Cannot update {program_name}: Git is not installed")
                 self.update_status(f"Cannot update {program_name}: Git is not installed")
                 return
@@ -1419,7 +1320,7 @@ class ProgramUpdater(QWidget):
 
             self.set_program_status(program_name, "Updating")
             update_thread = GitUpdateThread(
-                program_name, git_repo_url, program_directory, icon_basename
+                program_name, git_repo_url, program_directory, icon_basename, app_id=app_id or None
             )
             update_thread.progress_signal.connect(self.update_status)
             update_thread.finished_signal.connect(lambda: self.thread_finished(program_name))
@@ -1432,10 +1333,19 @@ class ProgramUpdater(QWidget):
             self.update_status(error_msg)
             logger.error(error_msg, exc_info=True)
 
+    def cancel_all_updates(self):
+        for thread in self.active_threads:
+            if thread.isRunning():
+                thread.cancel()
+        _env_prep_service.get_env_prep_queue().cancel_all()
+
     def thread_finished(self, program_name):
         self.completed_updates += 1
         self.progress_bar.setValue(int((self.completed_updates / self.total_updates) * 100))
         self.set_program_status(program_name, "Ready")
+        app = self.app_registry.get_by_name(program_name)
+        if app is not None and self.app_registry.is_installed(app):
+            _env_prep_service.get_env_prep_queue().submit(app)
         
         if self.completed_updates == self.total_updates:
             self.progress_bar.hide()
@@ -1443,12 +1353,16 @@ class ProgramUpdater(QWidget):
             self.refresh_program_icons()
             self.active_threads.clear()
             self.completed_updates = 0
+            if self._first_update_started is not None and not self._first_update_timed:
+                self._first_update_timed = True
+                _startup_timer.record("first_update_pass", self._first_update_started)
+                _startup_timer.save()
 
     def update_status(self, message):
         self.status_label.setText(message)
 
     def update_all_programs(self, interactive=True):
-        if not is_git_installed():
+        if not _git_service.is_git_installed():
             logger.info("Git not found during startup update check")
             if interactive:
                 reply = QMessageBox.question(
@@ -1484,6 +1398,8 @@ class ProgramUpdater(QWidget):
         
         self.completed_updates = 0
         self.total_updates = len(git_programs)
+        if self._first_update_started is None:
+            self._first_update_started = time.monotonic()
         self.progress_bar.setMaximum(100)
         self.progress_bar.setValue(0)
         self.progress_bar.show()
@@ -1491,7 +1407,20 @@ class ProgramUpdater(QWidget):
         for program_name, info in git_programs.items():
             self.update_program_direct(program_name, info["repo_url"])
 
+    def _on_startup_cleanup_finished(self):
+        pending, self._launch_after_cleanup = self._launch_after_cleanup, []
+        for program_name in pending:
+            self.selected_program = program_name
+            self.update_and_launch_program()
+
     def update_and_launch_program(self):
+        if self.selected_program == "Flow" and not self._startup_cleanup.done():
+            # Flow's server port and log file are what the startup cleanup frees.
+            self._startup_cleanup.start()
+            if "Flow" not in self._launch_after_cleanup:
+                self._launch_after_cleanup.append("Flow")
+            self.status_label.setText("Flow will launch once startup cleanup finishes")
+            return
         if self.selected_program:
             try:
                 program_info = self.programs[self.selected_program]
@@ -1503,7 +1432,7 @@ class ProgramUpdater(QWidget):
                 app_def = self.app_registry.get_by_name(program_name)
                 app_id = program_info.get("id", "")
 
-                if git_repo_url and not is_git_installed():
+                if git_repo_url and not _git_service.is_git_installed():
                     logger.info(f"Git not found when launching {program_name}, prompting user for installation")
                     reply = QMessageBox.question(
                         self, 
@@ -1529,7 +1458,7 @@ class ProgramUpdater(QWidget):
                         # Continue without updating
                         pass
                 
-                if git_repo_url and is_git_installed():
+                if git_repo_url and _git_service.is_git_installed():
                     self.update_program_direct(program_name, git_repo_url)
 
                 if local_dir:
@@ -1540,7 +1469,7 @@ class ProgramUpdater(QWidget):
                     installation_directory = os.path.join(self.base_dir, folder_name)
 
                 requirements_file = os.path.join(installation_directory, 'requirements.txt')
-                use_isolated = app_id and should_use_isolated_env(app_id)
+                use_isolated = app_id and _environment_service.should_use_isolated_env(app_id)
                 if os.path.exists(requirements_file) and not use_isolated:
                     self.status_label.setText(f"Checking dependencies for {program_name}...")
                     self.check_dependencies_before_launch(requirements_file)
@@ -1560,19 +1489,24 @@ class ProgramUpdater(QWidget):
                         )
                         return
 
-                    patch_flow_launcher(installation_directory)
-                    stop_flow_server(self.app_registry)
-
-                    program_path = os.path.join(installation_directory, script_name)
-                    if not os.path.exists(program_path):
-                        raise FileNotFoundError(f"Could not find {script_name} in {installation_directory}")
-
-                    subprocess.Popen(
-                        ['wscript.exe', program_path],
-                        cwd=installation_directory,
-                        env=launch_env,
-                        creationflags=subprocess.CREATE_NO_WINDOW
-                    )
+                    flow_lifecycle = _flow_server.FlowLifecycle(installation_directory)
+                    if flow_lifecycle.reusable():
+                        flow_lifecycle.open_client()
+                    else:
+                        _process_service.patch_flow_launcher(installation_directory)
+                        _process_service.stop_flow_server(self.app_registry, keep_reusable=False)
+
+                        program_path = os.path.join(installation_directory, script_name)
+                        if not os.path.exists(program_path):
+                            raise FileNotFoundError(f"Could not find {script_name} in {installation_directory}")
+
+                        subprocess.Popen(
+                            ['wscript.exe', program_path],
+                            cwd=installation_directory,
+                            env=launch_env,
+                            creationflags=subprocess.CREATE_NO_WINDOW
+                        )
+                        flow_lifecycle.record_launch()
                 elif use_isolated:
                     self.launcher_service.launch(program_name, extra_env=launch_env)
                 else:
@@ -1590,6 +1524,13 @@ class ProgramUpdater(QWidget):
                 self.set_program_status(program_name, "Ready")
                 QMessageBox.information(self, 'Launch', f"Launching {program_name} for {self.user_first_name}...")
 
+            except EnvironmentNotReadyError as e:
+                app = self.app_registry.get_by_name(program_name)
+                if app is not None:
+                    _env_prep_service.get_env_prep_queue().submit(app)
+                self.set_program_status(program_name, "Ready")
+                QMessageBox.information(self, 'Preparing Environment', f"{e.friendly_message}\n\n{e.recommended_action}")
+                logger.info(str(e))
             except ElysiumError as e:
                 error_msg = str(e)
                 QMessageBox.warning(self, 'Error', error_msg)
@@ -1608,18 +1549,14 @@ class ProgramUpdater(QWidget):
         try:
             program_name = self.selected_program
             logger.info(f"Checking dependencies before launching {program_name} using {requirements_file}")
+
+            app_id = self.programs.get(program_name, {}).get("id") or program_name.lower()
+            fingerprint = _dependency_service.requirements_fingerprint(requirements_file)
+            if _dependency_service.is_fingerprint_satisfied(app_id, fingerprint):
+                logger.info(f"Requirements unchanged since last check for {program_name}; skipping scan")
+                return
             
-            # Read requirements file
-            with open(requirements_file, 'r') as f:
-                # Handle both full-line comments and inline comments
-                required_packages = []
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        # Remove inline comments
-                        if '#' in line:
-                            line = line.split('#')[0].strip()
-                        required_packages.append(line)
+            required_packages = _dependency_service.read_requirements(requirements_file)
             
             logger.info(f"Found {len(required_packages)} required packages: {', '.join(required_packages)}")
             
@@ -1628,34 +1565,12 @@ class ProgramUpdater(QWidget):
                 return
                 
             # Check which packages need to be installed
-            missing_packages = []
-            installed_packages = []
-            
-            # Make sure pkg_resources is available
-            try:
-                import pkg_resources
-                from pkg_resources import DistributionNotFound, VersionConflict
-                
-                for package_req in required_packages:
-                    # Handle package with version specifier and strip inline comments
-                    package_req_clean = package_req.split('#')[0].strip()
-                    package_name = package_req_clean.split('==')[0].split('>')[0].split('<')[0].strip()
-                    try:
-                        # Use the clean version for requirement checking
-                        pkg_resources.require(package_req_clean)
-                        installed_packages.append(package_req_clean)
-                        logger.info(f"Package already satisfied: {package_req}")
-                    except (DistributionNotFound, VersionConflict) as e:
-                        missing_packages.append(package_req_clean)
-                        logger.warning(f"Package needs installation: {package_req} - Reason: {str(e)}")
-            except ImportError:
-                # If pkg_resources is not available, assume all packages need to be installed
-                logger.warning("pkg_resources not available, assuming all packages need installation")
-                missing_packages = required_packages
+            missing_packages = unsatisfied_requirements(required_packages)
             
             if not missing_packages:
                 self.status_label.setText("All dependencies are already satisfied.")
                 logger.info("All dependencies are already satisfied.")
+                _dependency_service.record_satisfied(app_id, fingerprint)
                 return
             
             logger.info(f"Need to install {len(missing_packages)} packages for {program_name}: {', '.join(missing_packages)}")
@@ -1672,86 +1587,22 @@ class ProgramUpdater(QWidget):
             if reply == QMessageBox.Yes:
                 logger.info("User chose to install missing dependencies")
                 
-                # Try batch installation
                 self.status_label.setText("Installing dependencies...")
-                logger.info(f"Attempting batch installation of {len(missing_packages)} packages")
-                
-                try:
-                    # Log the exact command being run
-                    cmd = f"{sys.executable} -m pip install {' '.join(missing_packages)}"
-                    logger.info(f"Running command: {cmd}")
-                    
-                    process = subprocess.Popen(
-                        [sys.executable, '-m', 'pip', 'install'] + missing_packages,
-                        stdout=PIPE, stderr=PIPE, universal_lines=True
-                    )
-                    
-                    output, error = process.communicate()
-                    
-                    # Log the output
-                    if output:
-                        logger.info(f"Batch installation output:\n{output}")
-                    if error:
-                        logger.warning(f"Batch installation stderr:\n{error}")
-                    
-                    if process.returncode == 0:
-                        self.status_label.setText("All dependencies installed successfully.")
-                        logger.info("Batch installation completed successfully")
-                    else:
-                        # If batch installation fails, try individual installations
-                        error_msg = f"Batch installation failed with return code {process.returncode}. Trying individual installations."
-                        self.status_label.setText("Batch installation failed. Trying individual installations...")
-                        logger.warning(error_msg)
-                        
-                        successful_installs = 0
-                        failed_packages = []
-                        
-                        # Create a temporary GitUpdateThread just to use its retry methods
-                        temp_thread = GitUpdateThread("temp", "", "")
-                        # Connect the progress signal to update the status
-                        temp_thread.progress_signal.connect(lambda msg: self.status_label.setText(msg))
-                        
-                        for package in missing_packages:
-                            try:
-                                logger.info(f"Attempting to install {package} individually with retries")
-                                self.status_label.setText(f"Installing {package}...")
-                                
-                                # Use the retry mechanism
-                                success, output = temp_thread.install_package_with_retries(package)
-                                
-                                if success:
-                                    successful_installs += 1
-                                    logger.info(f"Successfully installed {package}")
-                                else:
-                                    failed_packages.append(package)
-                                    logger.error(f"Failed to install {package} after multiple retry strategies")
-                            except Exception as e:
-                                failed_packages.append(package)
-                                logger.error(f"Error installing {package}: {str(e)}", exc_info=True)
-                        
-                        if failed_packages:
-                            error_msg = f"Failed to install {len(failed_packages)} packages: {', '.join(failed_packages)}"
-                            self.status_label.setText(error_msg)
-                            logger.error(error_msg)
-                            
-                            QMessageBox.warning(
-                                self, 
-                                'Installation Failed', 
-                                f"Failed to install some dependencies: {', '.join(failed_packages)}\n\nYou may need to install them manually."
-                            )
-                        else:
-                            success_msg = f"Successfully installed all {successful_installs} packages"
-                            self.status_label.setText(success_msg)
-                            logger.info(success_msg)
-                except Exception as e:
-                    error_msg = f"Error installing dependencies: {str(e)}"
+                result = _pip_installer.PipInstaller(on_output=self.status_label.setText).install(missing_packages)
+
+                if result.ok:
+                    self.status_label.setText("All dependencies installed successfully.")
+                    logger.info(f"Installed {len(result.installed)} packages in {len(result.attempts)} pip call(s)")
+                else:
+                    error_msg = f"Failed to install {len(result.failed)} packages ({result.failure.value}): {', '.join(result.failed)}"
                     self.status_label.setText(error_msg)
-                    logger.error(error_msg, exc_info=True)
+                    logger.error(error_msg)
                     
                     QMessageBox.warning(
                         self, 
-                        'Installation Error', 
-                        f"Error installing dependencies: {str(e)}"
+                        'Installation Failed', 
+                        f"Failed to install some dependencies: {', '.join(result.failed)}\n\n"
+                        f"Reason: {result.failure.value}. You may need to install them manually."
                     )
             else:
                 logger.info("User chose not to install missing dependencies")
@@ -1891,7 +1742,7 @@ class ProgramUpdater(QWidget):
     def export_diagnostics_bundle(self):
         try:
             self.status_label.setText("Exporting diagnostics...")
-            zip_path = export_diagnostics()
+            zip_path = _diagnostics_service.export_diagnostics()
             self.status_label.setText("Diagnostics exported.")
             QMessageBox.information(
                 self,
@@ -1914,7 +1765,7 @@ class ProgramUpdater(QWidget):
             elysium_dir = get_base_dir()
             
             # Check if Git is installed
-            if not is_git_installed():
+            if not _git_service.is_git_installed():
                 reply = QMessageBox.question(
                     self, 
                     'Git Required', 
@@ -1988,6 +1839,8 @@ def get_user_first_name():
     
     # Method 2: Try Windows registry
     try:
+        import winreg
+
         with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Volatile Environment") as key:
             username = winreg.QueryValueEx(key, "USERNAME")[0]
             logger.info(f"Found username from registry: {username}")
@@ -2025,8 +1878,16 @@ def _center_window(window, app):
 
 
 def main():
+    instance = claim_single_instance(
+        request_from_argv(sys.argv[1:]),
+        on_conflict=lambda: _process_service.close_other_elysium_instances(),
+    )
+    if instance is None:
+        return
+
     app = QApplication(sys.argv)
     app.setApplicationName("ELYSIUM")
+    app.aboutToQuit.connect(instance.release)
 
     splash = StartupSplash()
     _apply_window_icon(splash)
@@ -2034,16 +1895,38 @@ def main():
     splash.show()
     splash.set_progress("Starting ELYSIUM...", 5)
     app.processEvents()
+    _startup_timer.mark("splash_shown")
+
+    if os.environ.get("ELYSIUM_EXIT_AFTER_SPLASH") == "1":
+        # scripts/bench_startup.py measures time-to-splash up to this line.
+        print("ELYSIUM_SPLASH_SHOWN", flush=True)
+        return
 
     init_thread = StartupInitThread()
     main_window = {'updater': None}
+    pending_requests = []
+    if "--launch" in sys.argv:
+        pending_requests.append(request_from_argv(sys.argv[1:]))
+
+    def handle_instance_request(message):
+        updater = main_window['updater']
+        if updater is None or not updater.isVisible():
+            pending_requests.append(message)
+        else:
+            updater.handle_instance_request(message)
+
+    relay = InstanceRequestRelay()
+    relay.request_signal.connect(handle_instance_request, Qt.QueuedConnection)
+    instance.serve(relay.request_signal.emit)
 
     def open_main_window():
         splash.set_progress("Loading interface...", 92)
         app.processEvents()
 
-        updater = ProgramUpdater(defer_app_status=True)
+        with _startup_timer.phase("main_window_build"):
+            updater = ProgramUpdater(defer_app_status=True)
         main_window['updater'] = updater
+        app.aboutToQuit.connect(updater.cancel_all_updates)
         _apply_window_icon(updater)
         _center_window(updater, app)
 
@@ -2053,10 +1936,15 @@ def main():
         def reveal_main_window():
             splash.close()
             updater.show()
-            apply_native_title_bar_theme(updater, updater._dark_mode)
+            _titlebar.apply_native_title_bar_theme(updater, updater._dark_mode)
             updater.raise_()
             updater.activateWindow()
+            _startup_timer.mark("window_shown")
+            _startup_timer.save()
             updater.begin_post_show_startup()
+            for message in pending_requests:
+                updater.handle_instance_request(message)
+            pending_requests.clear()
 
         QTimer.singleShot(250, reveal_main_window)
 
@@ -14,6 +14,9 @@ from PySide6.QtQml import QQmlApplicationEngine
 from PySide6.QtWidgets import QApplication
 
 from elysium.core.paths import get_base_dir
+from elysium.core.settings import get_settings_store
+from elysium.core.single_instance import SingleInstance, request_from_argv
+from elysium.core.timeline import get_startup_timer
 from elysium.ui.bridge import ElysiumBridge
 
 _qml_messages: list[str] = []
@@ -56,14 +59,17 @@ def create_app(argv: list[str] | None = None) -> tuple[QApplication, QQmlApplica
     if os.path.isfile(icon_path):
         app.setWindowIcon(QIcon(icon_path))
 
+    timer = get_startup_timer()
     engine = QQmlApplicationEngine()
     _configure_qml_engine_paths(engine)
 
-    bridge = ElysiumBridge()
+    with timer.phase("bridge_init"):
+        bridge = ElysiumBridge()
     engine.rootContext().setContextProperty("Elysium", bridge)
 
     main_qml = os.path.join(os.path.dirname(__file__), "ui", "qml", "main.qml")
-    engine.load(QUrl.fromLocalFile(main_qml))
+    with timer.phase("qml_engine_load"):
+        engine.load(QUrl.fromLocalFile(main_qml))
     if not engine.rootObjects():
         details = "\n".join(_qml_messages[-12:]) if _qml_messages else "No QML diagnostics captured."
         raise RuntimeError(
@@ -78,8 +84,15 @@ def create_app(argv: list[str] | None = None) -> tuple[QApplication, QQmlApplica
     return app, engine, bridge
 
 
-def run_qml_app() -> int:
+def run_qml_app(instance: SingleInstance | None = None) -> int:
     app, engine, bridge = create_app()
+    if "--launch" in sys.argv:
+        bridge.post_instance_request(request_from_argv(sys.argv[1:]))
+    if instance is not None:
+        instance.serve(bridge.post_instance_request)
+    # Kill git/pip children rather than leave them running after the window closes.
+    app.aboutToQuit.connect(bridge.cancelAll)
+    app.aboutToQuit.connect(get_settings_store().flush)
     # Keep engine and bridge alive until the event loop exits.
     app._elysium_engine = engine  # type: ignore[attr-defined]
     app._elysium_bridge = bridge  # type: ignore[attr-defined]
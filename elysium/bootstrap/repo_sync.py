@@ -16,16 +16,22 @@ dependencies are installed.
 
 from __future__ import annotations
 
+import json
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
+import time
 import urllib.error
 import urllib.request
-import winreg
 import zipfile
 
+try:
+    import winreg
+except ImportError:  # non-Windows (tests, CI)
+    winreg = None  # type: ignore[assignment]
+
 ELYSIUM_REPO = "https://github.com/Protechas/Elysium.git"
 GITHUB_OWNER = "Protechas"
 GITHUB_REPO = "Elysium"
@@ -38,6 +44,15 @@ GIT_INSTALLER_URL = (
     "v2.42.0.windows.2/Git-2.42.0.2-64-bit.exe"
 )
 
+# A sync done by the launcher EXE (or a process that re-execs itself) is
+# handed down as "<sha>:<unix time>" so the child does not pull again.
+SYNC_TOKEN_ENV = "ELYSIUM_SYNC_TOKEN"
+SYNC_WINDOW_ENV = "ELYSIUM_SYNC_WINDOW_SECONDS"
+SYNC_STAMP_NAME = "elysium-sync.json"
+DEFAULT_SYNC_WINDOW_SECONDS = 120
+
+GIT_TIMEOUT_SECONDS = 300
+
 
 def _subprocess_no_window_flags() -> int:
     if hasattr(subprocess, "CREATE_NO_WINDOW"):
@@ -50,6 +65,8 @@ def _norm(path: str) -> str:
 
 
 def _get_documents_dir() -> str:
+    if winreg is None:
+        return os.path.join(os.path.expanduser("~"), "Documents")
     try:
         with winreg.OpenKey(
             winreg.HKEY_CURRENT_USER,
@@ -122,13 +139,20 @@ def is_dev_checkout(entry_script: str) -> bool:
 
 
 def _git_run(git_exe: str, args: list[str], *, cwd: str | None = None) -> subprocess.CompletedProcess[str]:
-    return subprocess.run(
-        [git_exe] + args,
-        cwd=cwd,
-        capture_output=True,
-        text=True,
-        creationflags=_subprocess_no_window_flags(),
-    )
+    # Stdlib only (see module docstring), so no elysium.core.proc here; a
+    # timeout still keeps a stalled fetch from hanging startup.
+    try:
+        return subprocess.run(
+            [git_exe] + args,
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            stdin=subprocess.DEVNULL,
+            timeout=GIT_TIMEOUT_SECONDS,
+            creationflags=_subprocess_no_window_flags(),
+        )
+    except subprocess.TimeoutExpired:
+        return subprocess.CompletedProcess([git_exe] + args, -1, "", f"git timed out after {GIT_TIMEOUT_SECONDS}s")
 
 
 def resolve_git_executable() -> str | None:
@@ -255,17 +279,117 @@ def sync_repo_via_http(install_dir: str, branch: str = "main") -> None:
     _restore_settings(install_dir, settings_backup)
 
 
-def _sync_repo_git(install_dir: str, git_exe: str) -> None:
+def read_head_sha(install_dir: str) -> str:
+    """HEAD commit of ``install_dir`` read straight from .git (no git process)."""
+    git_dir = os.path.join(install_dir, ".git")
+    try:
+        with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as handle:
+            head = handle.read().strip()
+    except OSError:
+        return ""
+    if not head.startswith("ref: "):
+        return head
+    ref = head[len("ref: ") :]
+    try:
+        with open(os.path.join(git_dir, *ref.split("/")), encoding="utf-8") as handle:
+            return handle.read().strip()
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(git_dir, "packed-refs"), encoding="utf-8") as handle:
+            for line in handle:
+                parts = line.strip().split(" ", 1)
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except OSError:
+        pass
+    return ""
+
+
+def _sync_stamp_path(install_dir: str) -> str:
+    # Inside .git when present so the stamp can never show up as an untracked file.
+    git_dir = os.path.join(install_dir, ".git")
+    if os.path.isdir(git_dir):
+        return os.path.join(git_dir, SYNC_STAMP_NAME)
+    return os.path.join(install_dir, "." + SYNC_STAMP_NAME)
+
+
+def sync_window_seconds(install_dir: str) -> float:
+    """Freshness window from the environment, then settings.json, then the default."""
+    raw = os.environ.get(SYNC_WINDOW_ENV)
+    if raw is None:
+        try:
+            with open(os.path.join(install_dir, "settings.json"), encoding="utf-8") as handle:
+                raw = json.load(handle).get("repo_sync_window_seconds")
+        except (OSError, ValueError, AttributeError):
+            raw = None
+    try:
+        return max(float(raw), 0.0) if raw is not None else float(DEFAULT_SYNC_WINDOW_SECONDS)
+    except (TypeError, ValueError):
+        return float(DEFAULT_SYNC_WINDOW_SECONDS)
+
+
+def record_sync(install_dir: str) -> str:
+    """Stamp a successful sync and export it to child processes; returns the token."""
+    sha = read_head_sha(install_dir)
+    synced_at = time.time()
+    try:
+        with open(_sync_stamp_path(install_dir), "w", encoding="utf-8") as handle:
+            json.dump({"sha": sha, "synced_at": synced_at}, handle)
+    except OSError:
+        pass
+    token = f"{sha}:{synced_at:.3f}"
+    os.environ[SYNC_TOKEN_ENV] = token
+    return token
+
+
+def _parse_sync_token(token: str) -> tuple[str, float] | None:
+    sha, sep, stamp = token.rpartition(":")
+    if not sep:
+        return None
+    try:
+        return sha, float(stamp)
+    except ValueError:
+        return None
+
+
+def recent_sync_is_fresh(install_dir: str, window: float | None = None) -> bool:
+    """
+    True when the environment token or the on-disk stamp says this tree was
+    synced within ``window`` seconds and HEAD has not moved since.
+    """
+    window = sync_window_seconds(install_dir) if window is None else window
+    if window <= 0:
+        return False
+    candidates = []
+    token = _parse_sync_token(os.environ.get(SYNC_TOKEN_ENV, ""))
+    if token is not None:
+        candidates.append(token)
+    try:
+        with open(_sync_stamp_path(install_dir), encoding="utf-8") as handle:
+            stamp = json.load(handle)
+        candidates.append((str(stamp["sha"]), float(stamp["synced_at"])))
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    if not candidates:
+        return False
+    head = read_head_sha(install_dir)
+    now = time.time()
+    return any(sha == head and 0 <= now - synced_at <= window for sha, synced_at in candidates)
+
+
+def _sync_repo_git(install_dir: str, git_exe: str) -> bool:
+    """Pull or clone; False when an existing install could not be updated."""
     elysium_script = os.path.join(install_dir, "ELYSIUM.py")
     git_dir = os.path.join(install_dir, ".git")
     if os.path.isdir(git_dir):
         result = _git_run(git_exe, ["-C", install_dir, "pull", "--ff-only"])
         if result.returncode != 0 and os.path.isfile(elysium_script):
-            return
+            return False
         if result.returncode != 0:
             detail = (result.stderr or result.stdout or "").strip()
             raise RuntimeError(f"Failed to update Elysium from GitHub.\n\n{detail}")
-        return
+        return True
 
     parent = os.path.dirname(install_dir)
     folder = os.path.basename(install_dir)
@@ -276,10 +400,11 @@ def _sync_repo_git(install_dir: str, git_exe: str) -> None:
     )
     if result.returncode != 0 and _dir_has_elysium_data(install_dir):
         _init_git_in_existing_dir(git_exe, install_dir)
-        return
+        return True
     if result.returncode != 0:
         detail = (result.stderr or result.stdout or "").strip()
         raise RuntimeError(f"Failed to clone Elysium repository.\n\n{detail}")
+    return True
 
 
 def sync_repo(install_dir: str) -> None:
@@ -293,7 +418,8 @@ def sync_repo(install_dir: str) -> None:
 
     if git_exe:
         try:
-            _sync_repo_git(install_dir, git_exe)
+            if _sync_repo_git(install_dir, git_exe):
+                record_sync(install_dir)
             return
         except RuntimeError:
             if os.path.isfile(elysium_script) and is_complete_install(install_dir):
@@ -313,6 +439,7 @@ def sync_repo(install_dir: str) -> None:
     for branch in ("main", "master"):
         try:
             sync_repo_via_http(install_dir, branch=branch)
+            record_sync(install_dir)
             return
         except (urllib.error.URLError, OSError, zipfile.BadZipFile, RuntimeError) as exc:
             last_error = exc
@@ -364,7 +491,10 @@ def ensure_runtime_ready(entry_script: str) -> str:
         runtime_root = entry_root
     else:
         os.makedirs(install_dir, exist_ok=True)
-        sync_repo(install_dir)
+        # Skip the pull when the launcher EXE (or this process before it
+        # re-exec'd) synced moments ago.
+        if not (is_complete_install(install_dir) and recent_sync_is_fresh(install_dir)):
+            sync_repo(install_dir)
         if not is_complete_install(install_dir):
             raise RuntimeError(
                 "The Elysium package is missing after syncing the repository.\n\n"
@@ -0,0 +1,102 @@
+"""Cancellation tokens for background work.
+
+A token is set from the UI thread and observed by workers. ``proc.run``
+kills the child process tree as soon as the token it runs under is
+cancelled; ``use_token`` makes a token ambient for the current thread so
+services deep below a worker do not need it threaded through every call.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+logger = logging.getLogger("Elysium.Cancel")
+
+
+class CancelToken:
+    def __init__(self, parent: CancelToken | None = None):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+        if parent is not None:
+            parent.add_callback(self.cancel)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as exc:
+                logger.debug("Cancel callback failed: %s", exc)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._event.wait(timeout)
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run ``callback`` on cancel (now, if already cancelled); returns a remover."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+class CancelScope:
+    """One token per key (app id) under a shared root, for "cancel this one" and "cancel all"."""
+
+    def __init__(self) -> None:
+        self.root = CancelToken()
+        self._tokens: dict[str, CancelToken] = {}
+        self._lock = threading.Lock()
+
+    def token(self, key: str) -> CancelToken:
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None:
+                token = self._tokens[key] = CancelToken(self.root)
+            return token
+
+    def cancel(self, key: str) -> None:
+        self.token(key).cancel()
+
+    def cancel_all(self) -> None:
+        self.root.cancel()
+
+
+_CURRENT: contextvars.ContextVar[CancelToken | None] = contextvars.ContextVar("elysium_cancel_token", default=None)
+
+
+def current_token() -> CancelToken | None:
+    return _CURRENT.get()
+
+
+def cancelled() -> bool:
+    token = _CURRENT.get()
+    return token is not None and token.cancelled
+
+
+@contextmanager
+def use_token(token: CancelToken | None) -> Iterator[CancelToken | None]:
+    reset = _CURRENT.set(token)
+    try:
+        yield token
+    finally:
+        _CURRENT.reset(reset)
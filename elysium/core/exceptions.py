@@ -26,6 +26,16 @@ class PythonEnvironmentError(ElysiumError):
     pass
 
 
+class EnvironmentNotReadyError(PythonEnvironmentError):
+    def __init__(self, app_id: str, technical_message: str | None = None):
+        super().__init__(
+            technical_message or f"Isolated environment for {app_id} is not ready",
+            friendly_message="This app's Python environment is still being prepared.",
+            recommended_action="Wait for setup to finish, then launch again.",
+        )
+        self.app_id = app_id
+
+
 class DependencyInstallError(ElysiumError):
     pass
 
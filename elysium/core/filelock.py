@@ -0,0 +1,67 @@
+"""Advisory OS file locks shared by the single-instance lock and settings writes."""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger("Elysium.FileLock")
+
+_POLL_SECONDS = 0.02
+
+
+def try_lock(handle) -> bool:
+    """Non-blocking exclusive lock on an open file; released when the process dies."""
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def unlock(handle) -> None:
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    except OSError:
+        pass
+
+
+@contextmanager
+def locked(path: str, timeout: float) -> Iterator[bool]:
+    """
+    Hold ``path`` locked for the block, waiting up to ``timeout``. Yields
+    False (and runs the block anyway) if another process kept it.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+b") as handle:
+        deadline = time.monotonic() + timeout
+        acquired = try_lock(handle)
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(_POLL_SECONDS)
+            acquired = try_lock(handle)
+        if not acquired:
+            logger.warning("Lock %s still held after %.1fs; continuing without it", path, timeout)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                unlock(handle)
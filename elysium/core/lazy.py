@@ -0,0 +1,87 @@
+"""Deferred module imports for startup-sensitive entry points."""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Any
+
+
+class _LazyModule(ModuleType):
+    """
+    Runs the module body on first attribute access.
+
+    ``importlib.util.LazyLoader`` only became thread-safe in Python 3.12:
+    before that a second thread could see the half-initialised module while
+    the first one was still executing it. Here the first access holds a
+    per-module lock until the body has run; other threads wait on it, and
+    the loading thread itself (re-entering from the module body) sees the
+    module as it is so far, as with a regular import.
+    """
+
+    def __getattribute__(self, attr: str) -> Any:
+        state = _STATES.get(object.__getattribute__(self, "__name__"))
+        if state is not None:
+            with state.lock:
+                if object.__getattribute__(self, "__class__") is _LazyModule:
+                    if state.loading:
+                        return object.__getattribute__(self, attr)
+                    state.load(self)
+        return getattr(self, attr)
+
+    def __delattr__(self, attr: str) -> None:
+        self.__getattribute__(attr)
+        delattr(self, attr)
+
+
+class _LoadState:
+    def __init__(self, spec: importlib.machinery.ModuleSpec, before: dict[str, Any]):
+        self.spec = spec
+        self.before = before
+        self.lock = threading.RLock()
+        self.loading = False
+
+    def load(self, module: ModuleType) -> None:
+        self.loading = True
+        try:
+            # Attributes set on the placeholder before loading win, as they would after an eager import.
+            attrs = object.__getattribute__(module, "__dict__")
+            updated = {
+                key: value for key, value in attrs.items() if key not in self.before or self.before[key] is not value
+            }
+            self.spec.loader.exec_module(module)
+            attrs.update(updated)
+            module.__class__ = ModuleType
+            _STATES.pop(self.spec.name, None)
+        finally:
+            self.loading = False
+
+
+_STATES: dict[str, _LoadState] = {}
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return ``name`` as a module whose body runs on first attribute access.
+
+    Already-imported modules are returned as-is. The placeholder is
+    registered in ``sys.modules`` (and on its parent package), so a later
+    regular import of the same name gets this module rather than a second copy.
+    The first access is safe to race from several threads.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None or not hasattr(spec.loader, "exec_module"):
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    module = importlib.util.module_from_spec(spec)
+    _STATES[name] = _LoadState(spec, dict(module.__dict__))
+    module.__class__ = _LazyModule
+    sys.modules[name] = module
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
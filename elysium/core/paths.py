@@ -115,6 +115,12 @@ def get_logs_dir() -> str:
     return logs
 
 
+def get_timelines_dir() -> str:
+    timelines = os.path.join(get_logs_dir(), "timelines")
+    os.makedirs(timelines, exist_ok=True)
+    return timelines
+
+
 def get_envs_dir() -> str:
     envs = os.path.join(get_base_dir(), "envs")
     os.makedirs(envs, exist_ok=True)
@@ -127,6 +133,12 @@ def get_cache_dir() -> str:
     return cache
 
 
+def get_wheelhouse_dir() -> str:
+    wheelhouse = os.path.join(get_cache_dir(), "wheelhouse")
+    os.makedirs(wheelhouse, exist_ok=True)
+    return wheelhouse
+
+
 def get_settings_path() -> str:
     return os.path.join(get_base_dir(), "settings.json")
 
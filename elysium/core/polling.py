@@ -0,0 +1,21 @@
+"""Readiness polling with deadlines, in place of fixed sleeps."""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+
+def wait_until(predicate: Callable[[], bool], timeout: float, interval: float = 0.05) -> bool:
+    """
+    Call ``predicate`` until it returns True or ``timeout`` seconds pass.
+    Returns the last result, so False means the deadline was hit.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if predicate():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
@@ -0,0 +1,256 @@
+"""
+Subprocess runner shared by the git, pip and PowerShell call sites.
+
+stdout and stderr are drained concurrently on an asyncio loop, so a chatty
+stream can never fill its pipe and stall the child. Captured output keeps
+only the last ``max_output`` characters per stream, and a timeout kills the
+whole process tree instead of leaving grandchildren (git-remote-https, pip
+build backends) holding the pipes open. Cancelling the run's token (or
+the ambient one from ``elysium.core.cancel.use_token``) does the same.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import locale
+import logging
+import os
+import signal
+import subprocess
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from elysium.core.cancel import CancelToken, current_token
+from elysium.windows.process_flags import no_window_flags
+
+logger = logging.getLogger("Elysium.Proc")
+
+DEFAULT_MAX_OUTPUT_CHARS = 256 * 1024
+KILL_GRACE_SECONDS = 5.0
+_CHUNK_BYTES = 64 * 1024
+
+LineCallback = Callable[[str], None]
+
+
+@dataclass
+class ProcResult:
+    args: list[str]
+    returncode: int | None = None
+    stdout: str = ""
+    stderr: str = ""
+    timed_out: bool = False
+    cancelled: bool = False
+    truncated: bool = False
+    error: str | None = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out and not self.cancelled and self.error is None
+
+    @property
+    def output(self) -> str:
+        return "\n".join(part for part in (self.stdout.strip(), self.stderr.strip()) if part)
+
+    def describe(self) -> str:
+        """One-line reason for a failure, for logs."""
+        if self.error:
+            return f"could not start: {self.error}"
+        if self.cancelled:
+            return "cancelled"
+        if self.timed_out:
+            return f"timed out after {self.duration:.0f}s"
+        return f"exit code {self.returncode}"
+
+
+class _TailBuffer:
+    """Keeps the last ``limit`` characters written to it."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.parts: deque[str] = deque()
+        self.size = 0
+        self.truncated = False
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+        self.size += len(text)
+        while self.size > self.limit and self.parts:
+            excess = self.size - self.limit
+            head = self.parts[0]
+            if len(head) <= excess:
+                self.parts.popleft()
+                self.size -= len(head)
+            else:
+                self.parts[0] = head[excess:]
+                self.size -= excess
+            self.truncated = True
+
+    def getvalue(self) -> str:
+        return "".join(self.parts).replace("\r\n", "\n")
+
+
+class _LineSplitter:
+    """Feeds complete lines to ``callback``; ``\\r`` counts as a break so progress meters stream."""
+
+    def __init__(self, callback: LineCallback, limit: int):
+        self.callback = callback
+        self.limit = limit
+        self.pending = ""
+
+    def feed(self, text: str) -> None:
+        self.pending += text.replace("\r\n", "\n").replace("\r", "\n")
+        *lines, self.pending = self.pending.split("\n")
+        if len(self.pending) > self.limit:
+            lines.append(self.pending)
+            self.pending = ""
+        for line in lines:
+            self._emit(line)
+
+    def flush(self) -> None:
+        self._emit(self.pending)
+        self.pending = ""
+
+    def _emit(self, line: str) -> None:
+        line = line.rstrip()
+        if not line:
+            return
+        try:
+            self.callback(line)
+        except Exception as exc:
+            logger.debug("Output callback failed: %s", exc)
+
+
+async def _drain(stream: asyncio.StreamReader, buffer: _TailBuffer, on_line: LineCallback | None, encoding: str) -> None:
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    splitter = _LineSplitter(on_line, buffer.limit) if on_line else None
+    while True:
+        chunk = await stream.read(_CHUNK_BYTES)
+        text = decoder.decode(chunk, final=not chunk)
+        if text:
+            buffer.write(text)
+            if splitter:
+                splitter.feed(text)
+        if not chunk:
+            break
+    if splitter:
+        splitter.flush()
+
+
+def kill_tree(pid: int) -> None:
+    """Kill ``pid`` and everything it started."""
+    if os.name == "nt":
+        try:
+            subprocess.run(
+                ["taskkill", "/T", "/F", "/PID", str(pid)],
+                capture_output=True,
+                timeout=10,
+                creationflags=no_window_flags(),
+            )
+        except (OSError, subprocess.TimeoutExpired) as exc:
+            logger.warning("taskkill failed for %s: %s", pid, exc)
+        return
+    try:
+        # Children are started in their own session, so the group id is the pid.
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def run_async(
+    args: Sequence[str],
+    *,
+    cwd: str | None = None,
+    env: dict[str, str] | None = None,
+    timeout: float | None = None,
+    on_stdout: LineCallback | None = None,
+    on_stderr: LineCallback | None = None,
+    merge_stderr: bool = False,
+    max_output: int = DEFAULT_MAX_OUTPUT_CHARS,
+    encoding: str | None = None,
+    cancel: CancelToken | None = None,
+) -> ProcResult:
+    """
+    Run ``args`` to completion. Never raises for launch failures, timeouts
+    or cancellation; check ``ProcResult.ok``. With ``merge_stderr`` stderr
+    is folded into stdout (and ``on_stdout``), like ``stderr=STDOUT``.
+    """
+    started = time.monotonic()
+    result = ProcResult(list(args))
+    cancel = cancel if cancel is not None else current_token()
+    if cancel is not None and cancel.cancelled:
+        result.cancelled = True
+        return result
+    encoding = encoding or locale.getpreferredencoding(False)
+    platform_kwargs: dict = {"creationflags": no_window_flags()} if os.name == "nt" else {"start_new_session": True}
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            cwd=cwd,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
+            **platform_kwargs,
+        )
+    except OSError as exc:
+        result.error = str(exc)
+        result.duration = time.monotonic() - started
+        return result
+
+    stdout, stderr = _TailBuffer(max_output), _TailBuffer(max_output)
+    tasks = [_drain(process.stdout, stdout, on_stdout, encoding)]
+    if not merge_stderr:
+        tasks.append(_drain(process.stderr, stderr, on_stderr, encoding))
+    work = asyncio.ensure_future(asyncio.gather(*tasks, process.wait()))
+    waiters = {work}
+    remove_callback = None
+    if cancel is not None:
+        loop = asyncio.get_running_loop()
+        cancel_requested = asyncio.Event()
+
+        def on_cancel() -> None:
+            try:
+                loop.call_soon_threadsafe(cancel_requested.set)
+            except RuntimeError:
+                pass  # loop already closed: the run is over
+
+        remove_callback = cancel.add_callback(on_cancel)
+        waiters.add(asyncio.ensure_future(cancel_requested.wait()))
+    try:
+        done, _ = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        if remove_callback is not None:
+            remove_callback()
+        for waiter in waiters - {work}:
+            waiter.cancel()
+    if work not in done:
+        if cancel is not None and cancel.cancelled:
+            result.cancelled = True
+            logger.info("Cancelled %s", args[0])
+        else:
+            result.timed_out = True
+            logger.warning("Killing %s after %ss", args[0], timeout)
+        kill_tree(process.pid)
+        done, _ = await asyncio.wait({work}, timeout=KILL_GRACE_SECONDS)
+        if not done:
+            work.cancel()
+            await asyncio.gather(work, return_exceptions=True)
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    result.returncode = process.returncode
+    result.stdout = stdout.getvalue()
+    result.stderr = stderr.getvalue()
+    result.truncated = stdout.truncated or stderr.truncated
+    result.duration = time.monotonic() - started
+    return result
+
+
+def run(args: Sequence[str], **kwargs) -> ProcResult:
+    """Blocking ``run_async`` on a private loop; call it from threads without a running loop."""
+    return asyncio.run(run_async(args, **kwargs))
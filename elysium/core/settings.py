@@ -1,20 +1,43 @@
-"""Application settings load/save."""
+"""Application settings: typed schema, cached store and change subscriptions."""
 
 from __future__ import annotations
 
+import atexit
+import copy
+import functools
+import inspect
 import json
+import logging
 import os
-from typing import Any
+import threading
+import time
+import weakref
+from typing import Any, Callable, Literal
 
+from elysium.core.filelock import locked
 from elysium.core.paths import get_settings_path
 
+logger = logging.getLogger("Elysium.Settings")
+
+SETTINGS_SCHEMA_VERSION = 2
+
+# A plain dict so importing this module does not load pydantic; ELYSIUM.py
+# imports it before its splash. Must match the defaults in ``settings_model()``.
 DEFAULT_SETTINGS: dict[str, Any] = {
     "theme": "Dark",
     "log_level": "INFO",
     "check_updates_on_startup": True,
     "auto_update_apps": False,
+    "max_parallel_updates": 4,
+    "update_timeout_seconds": 300.0,
+    "remote_head_ttl_seconds": 300.0,
+    "repo_sync_window_seconds": 120.0,
+    "manifest_url": "",
+    "manifest_ttl_seconds": 300.0,
     "use_isolated_envs": False,
     "isolated_env_apps": ["dfr"],
+    "wheelhouse_max_mb": 2048.0,
+    "share_env_packages": True,
     "developer_mode": False,
     "use_qml_ui": True,
     "app_view_mode": "list",
@@ -25,32 +48,349 @@ DEFAULT_SETTINGS: dict[str, Any] = {
 }
 
 
-def load_settings() -> dict[str, Any]:
-    path = get_settings_path()
-    if not os.path.isfile(path):
-        return dict(DEFAULT_SETTINGS)
+@functools.lru_cache(maxsize=1)
+def settings_model() -> type:
+    """The pydantic schema for settings.json, built on first validation."""
+    from pydantic import BaseModel, ConfigDict, Field
+
+    class Settings(BaseModel):
+        """Typed view of settings.json. Unknown keys are kept as they are."""
+
+        model_config = ConfigDict(extra="allow")
+
+        theme: Literal["Dark", "Light"] = "Dark"
+        log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
+        check_updates_on_startup: bool = True
+        auto_update_apps: bool = False
+        max_parallel_updates: int = Field(4, ge=1)
+        update_timeout_seconds: float = Field(300, ge=0)
+        remote_head_ttl_seconds: float = Field(300, ge=0)
+        repo_sync_window_seconds: float = Field(120, ge=0)
+        manifest_url: str = ""
+        manifest_ttl_seconds: float = Field(300, ge=0)
+        use_isolated_envs: bool = False
+        isolated_env_apps: list[str] = Field(default_factory=lambda: ["dfr"])
+        wheelhouse_max_mb: float = Field(2048, ge=0)
+        share_env_packages: bool = True
+        developer_mode: bool = False
+        use_qml_ui: bool = True
+        app_view_mode: Literal["list", "grid"] = "list"
+        window_width: int = Field(860, ge=1)
+        window_height: int = Field(680, ge=1)
+        window_x: int | None = None
+        window_y: int | None = None
+
+    return Settings
+
+
+def _migrate_v1(data: dict[str, Any]) -> dict[str, Any]:
+    # Files from before the typed schema: free-form casing and empty
+    # strings where a window position had not been saved yet.
+    if isinstance(data.get("theme"), str):
+        data["theme"] = data["theme"].strip().capitalize()
+    if isinstance(data.get("app_view_mode"), str):
+        data["app_view_mode"] = data["app_view_mode"].strip().lower()
+    if isinstance(data.get("log_level"), str):
+        data["log_level"] = data["log_level"].strip().upper()
+    for key in ("window_x", "window_y"):
+        if data.get(key) == "":
+            data[key] = None
+    return data
+
+
+_MIGRATIONS = {1: _migrate_v1}
+
+
+def migrate_settings(data: dict[str, Any]) -> dict[str, Any]:
+    """Bring a settings.json dict up to ``SETTINGS_SCHEMA_VERSION``."""
+    data = dict(data)
+    try:
+        version = int(data.get("schema_version", 1))
+    except (TypeError, ValueError):
+        version = 1
+    while version < SETTINGS_SCHEMA_VERSION:
+        data = _MIGRATIONS[version](data)
+        version += 1
+    data["schema_version"] = max(version, SETTINGS_SCHEMA_VERSION)
+    return data
+
+
+def validate_settings(values: dict[str, Any], *, strict: bool = True) -> dict[str, Any]:
+    """
+    Coerce ``values`` to their schema types, returning only the given keys.
+    Invalid values raise, or with ``strict=False`` are dropped so the
+    defaults apply.
+    """
+    from pydantic import ValidationError
+
+    model_cls = settings_model()
+    try:
+        model = model_cls.model_validate(values)
+    except ValidationError as exc:
+        if strict:
+            raise
+        bad = {error["loc"][0] for error in exc.errors() if error["loc"]}
+        logger.warning("Ignoring invalid settings: %s", ", ".join(sorted(map(str, bad))))
+        values = {key: value for key, value in values.items() if key not in bad}
+        model = model_cls.model_validate(values)
+    return model.model_dump(include=set(values))
+
+
+SAVE_DEBOUNCE_SECONDS = 0.5
+RELOAD_CHECK_SECONDS = 1.0
+LOCK_TIMEOUT_SECONDS = 5.0
+
+
+def _file_stamp(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_file(path: str) -> dict[str, Any]:
     try:
         with open(path, encoding="utf-8") as f:
             data = json.load(f)
-        merged = dict(DEFAULT_SETTINGS)
-        merged.update(data)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable settings file %s: %s", path, exc)
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_file(path: str, data: dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _load(raw: dict[str, Any]) -> dict[str, Any]:
+    return validate_settings(migrate_settings(raw), strict=False) if raw else {}
+
+
+class _Subscriber:
+    """Holds bound methods weakly so a subscribed QObject can still be collected."""
+
+    def __init__(self, callback: Callable[[Any], None]):
+        if inspect.ismethod(callback):
+            self._ref = weakref.WeakMethod(callback)
+        else:
+            self._ref = lambda: callback
+
+    def __call__(self) -> Callable[[Any], None] | None:
+        return self._ref()
+
+
+class SettingsStore:
+    """
+    In-memory view of settings.json.
+
+    Reads come from memory; the file is re-read when its mtime changes
+    (checked at most every ``RELOAD_CHECK_SECONDS``), migrated and validated
+    once per read. Changes are coalesced for ``debounce`` seconds, then
+    merged key by key onto a fresh read of the file under
+    ``settings.json.lock`` and written via a temp file and ``os.replace``.
+    A crash never leaves a half-written file, and keys another process
+    changed in the meantime are kept.
+
+    ``subscribe(key, callback)`` calls back with the new value whenever that
+    key's effective value changes, whether set here or picked up from disk.
+    """
+
+    def __init__(self, path: str | None = None, *, debounce: float = SAVE_DEBOUNCE_SECONDS):
+        self._path = path
+        self.debounce = debounce
+        self._lock = threading.RLock()
+        self._loaded_path: str | None = None
+        self._data: dict[str, Any] = {}
+        self._stamp: tuple[int, int] | None = None
+        self._checked_at = 0.0
+        self._pending: dict[str, Any] = {}
+        self._timer: threading.Timer | None = None
+        self._subscribers: dict[str, list[_Subscriber]] = {}
+        self._changes: list[tuple[str, Any]] = []
+
+    @property
+    def path(self) -> str:
+        return self._path or get_settings_path()
+
+    def _effective(self, key: str) -> Any:
+        for source in (self._pending, self._data, DEFAULT_SETTINGS):
+            if key in source:
+                return source[key]
+        return None
+
+    def _watched(self) -> dict[str, Any]:
+        return {key: self._effective(key) for key in self._subscribers}
+
+    def _record_changes(self, before: dict[str, Any]) -> None:
+        for key, old in before.items():
+            new = self._effective(key)
+            if new != old:
+                self._changes.append((key, new))
+
+    def _notify(self) -> None:
+        with self._lock:
+            changes, self._changes = self._changes, []
+            targets = {key: list(self._subscribers.get(key, ())) for key, _ in changes}
+        for key, value in changes:
+            for subscriber in targets[key]:
+                callback = subscriber()
+                if callback is None:
+                    continue
+                try:
+                    callback(copy.deepcopy(value))
+                except Exception as exc:
+                    logger.debug("Settings subscriber for %s failed: %s", key, exc)
+
+    def subscribe(self, key: str, callback: Callable[[Any], None]) -> Callable[[], None]:
+        """Call ``callback(value)`` when ``key`` changes; returns an unsubscribe function."""
+        subscriber = _Subscriber(callback)
+        with self._lock:
+            self._subscribers.setdefault(key, []).append(subscriber)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                subscribers = self._subscribers.get(key, [])
+                if subscriber in subscribers:
+                    subscribers.remove(subscriber)
+                if not subscribers:
+                    self._subscribers.pop(key, None)
+
+        return unsubscribe
+
+    def _refresh(self) -> None:
+        path = self.path
+        now = time.monotonic()
+        if path == self._loaded_path and now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return
+        if path != self._loaded_path and self._pending and self._loaded_path:
+            self._write(self._loaded_path)
+        stamp = _file_stamp(path)
+        if path != self._loaded_path or stamp != self._stamp:
+            before = self._watched()
+            self._data = _load(_read_file(path))
+            self._stamp = stamp
+            self._loaded_path = path
+            self._record_changes(before)
+        self._checked_at = now
+
+    def all(self) -> dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            merged = dict(DEFAULT_SETTINGS)
+            merged.update(self._data)
+            merged.update(self._pending)
+            merged = copy.deepcopy(merged)
+        self._notify()
         return merged
-    except (OSError, json.JSONDecodeError):
-        return dict(DEFAULT_SETTINGS)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            self._refresh()
+            found = any(key in source for source in (self._pending, self._data, DEFAULT_SETTINGS))
+            value = copy.deepcopy(self._effective(key)) if found else default
+        self._notify()
+        return value
+
+    def update(self, values: dict[str, Any], *, flush: bool = False) -> None:
+        """Validate and stage ``values``; raises ``ValidationError`` for bad values."""
+        values = validate_settings(values)
+        with self._lock:
+            self._refresh()
+            before = self._watched()
+            self._pending.update(copy.deepcopy(values))
+            self._record_changes(before)
+            if not flush:
+                self._schedule()
+        if flush:
+            self.flush()
+        self._notify()
+
+    def set(self, key: str, value: Any, *, flush: bool = False) -> None:
+        self.update({key: value}, flush=flush)
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.debounce, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending:
+                self._write(self.path)
+        self._notify()
+
+    def _write(self, path: str) -> None:
+        before = self._watched()
+        pending, self._pending = self._pending, {}
+        try:
+            with locked(f"{path}.lock", LOCK_TIMEOUT_SECONDS):
+                current = _read_file(path)
+                current.update(pending)
+                # Any save also upgrades the file to the current schema.
+                current = migrate_settings(current)
+                _write_file(path, current)
+                stamp = _file_stamp(path)
+        except OSError as exc:
+            logger.warning("Could not save settings to %s: %s", path, exc)
+            self._pending = {**pending, **self._pending}
+            return
+        if path == self.path:
+            self._data, self._stamp, self._loaded_path = _load(current), stamp, path
+            self._record_changes(before)
+            self._checked_at = time.monotonic()
+
+
+_STORE: SettingsStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_settings_store() -> SettingsStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = SettingsStore()
+            atexit.register(_STORE.flush)
+        return _STORE
+
+
+def peek_setting(key: str, default: Any = None) -> Any:
+    """Raw value from settings.json, unvalidated; for bootstrap code that runs before pydantic may load."""
+    return _read_file(get_settings_path()).get(key, DEFAULT_SETTINGS.get(key, default))
+
+
+def load_settings() -> dict[str, Any]:
+    return get_settings_store().all()
 
 
 def save_settings(settings: dict[str, Any]) -> None:
-    path = get_settings_path()
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(settings, f, indent=2)
+    get_settings_store().update(settings, flush=True)
 
 
 def get_setting(key: str, default: Any = None) -> Any:
-    return load_settings().get(key, default)
+    return get_settings_store().get(key, default)
 
 
 def set_setting(key: str, value: Any) -> None:
-    settings = load_settings()
-    settings[key] = value
-    save_settings(settings)
+    get_settings_store().set(key, value, flush=True)
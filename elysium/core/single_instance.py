@@ -0,0 +1,226 @@
+"""Single-instance lock with request hand-off to the running launcher.
+
+The first process takes an OS lock on ``instance.lock`` and listens on a
+local named pipe (Windows) or Unix socket. Later launches find the lock
+held, send their request ("show", "launch <app>") to that listener and
+exit instead of starting Qt. The lock dies with its process, so a crash
+never leaves a stale claim behind.
+
+Standard library only: ELYSIUM.py hands off before the repo sync and
+before third-party packages are checked.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import secrets
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable
+
+from elysium.core.filelock import try_lock, unlock
+from elysium.core.paths import get_base_dir
+
+logger = logging.getLogger("Elysium.SingleInstance")
+
+LOCK_NAME = "instance.lock"
+INFO_NAME = "instance.json"
+HAND_OFF_TIMEOUT_SECONDS = 3.0
+_STOP = {"action": "__stop__"}
+
+Message = dict[str, Any]
+
+
+def request_from_argv(argv: list[str]) -> Message:
+    """``--launch <app_id>`` asks for that app; anything else just shows the window."""
+    if "--launch" in argv:
+        index = argv.index("--launch")
+        if index + 1 < len(argv):
+            return {"action": "launch", "app_id": argv[index + 1]}
+    return {"action": "show"}
+
+
+def _new_address(directory: str) -> tuple[str, str]:
+    tag = hashlib.sha1(os.path.abspath(directory).encode()).hexdigest()[:12]
+    suffix = secrets.token_hex(4)
+    if os.name == "nt":
+        return rf"\\.\pipe\elysium-{tag}-{suffix}", "AF_PIPE"
+    # Unix socket paths are limited to ~100 bytes, so keep them in the temp dir.
+    return os.path.join(tempfile.gettempdir(), f"elysium-{tag}-{suffix}.sock"), "AF_UNIX"
+
+
+class SingleInstance:
+    def __init__(self, directory: str | None = None):
+        self.directory = directory or get_base_dir()
+        self.lock_path = os.path.join(self.directory, LOCK_NAME)
+        self.info_path = os.path.join(self.directory, INFO_NAME)
+        self.primary = False
+        self._lock_handle = None
+        self._listener: Listener | None = None
+        self._thread: threading.Thread | None = None
+        self._address: str | None = None
+        self._family: str | None = None
+        self._authkey: bytes | None = None
+
+    def acquire(self, wait: float = 0.0) -> bool:
+        """Take the lock, retrying for up to ``wait`` seconds. True when this process is primary."""
+        if self.primary:
+            return True
+        os.makedirs(self.directory, exist_ok=True)
+        deadline = time.monotonic() + wait
+        while True:
+            handle = open(self.lock_path, "a+")
+            if try_lock(handle):
+                self._lock_handle = handle
+                self.primary = True
+                return True
+            handle.close()
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    def serve(self, on_message: Callable[[Message], None]) -> None:
+        """
+        Accept requests from later launches on a daemon thread.
+        ``on_message`` runs on that thread; UI code must marshal it over.
+        """
+        if not self.primary or self._listener is not None:
+            return
+        self._address, self._family = _new_address(self.directory)
+        self._authkey = secrets.token_bytes(32)
+        self._listener = Listener(self._address, self._family, authkey=self._authkey)
+        info = {
+            "pid": os.getpid(),
+            "address": self._address,
+            "family": self._family,
+            "authkey": self._authkey.hex(),
+        }
+        tmp = f"{self.info_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        os.replace(tmp, self.info_path)
+        self._thread = threading.Thread(
+            target=self._accept_loop, args=(self._listener, on_message), name="single-instance", daemon=True
+        )
+        self._thread.start()
+
+    def _accept_loop(self, listener: Listener, on_message: Callable[[Message], None]) -> None:
+        while True:
+            try:
+                conn = listener.accept()
+            except OSError:
+                return  # listener closed
+            except Exception as exc:  # bad authkey or garbage from a stray client
+                logger.debug("Rejected instance connection: %s", exc)
+                continue
+            with conn:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError) as exc:
+                    logger.debug("Instance request dropped: %s", exc)
+                    continue
+                if message == _STOP:
+                    conn.send({"ok": True})
+                    return
+                try:
+                    on_message(message)
+                    conn.send({"ok": True})
+                except Exception as exc:
+                    logger.warning("Instance request %s failed: %s", message, exc)
+                    try:
+                        conn.send({"ok": False, "error": str(exc)})
+                    except OSError:
+                        pass
+
+    def send(self, message: Message, timeout: float = HAND_OFF_TIMEOUT_SECONDS) -> dict | None:
+        """Deliver ``message`` to the primary; returns its reply, or None if unreachable."""
+        deadline = time.monotonic() + timeout
+        while True:
+            reply = self._send_once(message, max(deadline - time.monotonic(), 0.1))
+            if reply is not None or time.monotonic() >= deadline:
+                return reply
+            # The primary may hold the lock but not be listening yet.
+            time.sleep(0.1)
+
+    def _send_once(self, message: Message, timeout: float) -> dict | None:
+        try:
+            with open(self.info_path, encoding="utf-8") as f:
+                info = json.load(f)
+            address, family, authkey = info["address"], info["family"], bytes.fromhex(info["authkey"])
+        except (OSError, ValueError, KeyError):
+            return None
+        try:
+            with Client(address, family, authkey=authkey) as conn:
+                conn.send(message)
+                if conn.poll(timeout):
+                    return conn.recv()
+        except (OSError, EOFError, ValueError) as exc:
+            logger.debug("Could not reach running instance at %s: %s", address, exc)
+        except Exception as exc:  # multiprocessing.AuthenticationError from a stale info file
+            logger.debug("Running instance rejected hand-off: %s", exc)
+        return None
+
+    def release(self) -> None:
+        if self._listener is not None:
+            self._send_once(_STOP, 1.0)
+            if self._thread is not None:
+                self._thread.join(timeout=2)
+            try:
+                self._listener.close()
+            except OSError:
+                pass
+            self._listener = None
+            try:
+                os.remove(self.info_path)
+            except OSError:
+                pass
+        if self._lock_handle is not None:
+            unlock(self._lock_handle)
+            self._lock_handle.close()
+            self._lock_handle = None
+        self.primary = False
+
+
+def hand_off(message: Message, directory: str | None = None, timeout: float = HAND_OFF_TIMEOUT_SECONDS) -> bool:
+    """True when a running instance accepted ``message`` (the caller should exit)."""
+    probe = SingleInstance(directory)
+    if probe.acquire():
+        probe.release()
+        return False
+    reply = probe.send(message, timeout=timeout)
+    return bool(reply and reply.get("ok"))
+
+
+def claim_single_instance(
+    message: Message,
+    *,
+    directory: str | None = None,
+    on_conflict: Callable[[], Any] | None = None,
+    timeout: float = HAND_OFF_TIMEOUT_SECONDS,
+) -> SingleInstance | None:
+    """
+    Become the primary instance, or hand ``message`` to the one that is.
+
+    Returns None after a successful hand-off. If the lock holder does not
+    answer (hung, or an older build without a listener), ``on_conflict``
+    runs (typically force-closing it) and the lock is retried; the returned
+    instance may still not be primary if that fails, and startup continues.
+    """
+    instance = SingleInstance(directory)
+    if instance.acquire():
+        return instance
+    reply = instance.send(message, timeout=timeout)
+    if reply and reply.get("ok"):
+        logger.info("Handed %s to the running instance", message)
+        return None
+    logger.warning("Running instance did not answer; taking over")
+    if on_conflict is not None:
+        on_conflict()
+    if not instance.acquire(wait=2.0):
+        logger.warning("Could not take the single-instance lock; continuing without it")
+    return instance
@@ -0,0 +1,142 @@
+"""Per-launch startup phase timings, persisted as JSON under logs/timelines."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Iterator
+
+from elysium import __version__
+from elysium.core.paths import get_timelines_dir
+
+logger = logging.getLogger("Elysium.Timeline")
+
+KEEP_TIMELINES = 50
+_PREFIX = "timeline_"
+
+
+@dataclass
+class Phase:
+    name: str
+    start_ms: float
+    duration_ms: float
+    thread: str
+
+
+class PhaseTimer:
+    """
+    Records named phases against a single monotonic origin.
+
+    ``origin`` defaults to now; entry points that start timing before
+    ``elysium`` is importable can pass the ``time.monotonic()`` they
+    captured first. Safe to use from worker threads.
+    """
+
+    def __init__(self, label: str = "startup", origin: float | None = None, directory: str | None = None):
+        self.label = label
+        self.origin = time.monotonic() if origin is None else origin
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._directory = directory
+        self._path: str | None = None
+        self._phases: list[Phase] = []
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start: float, end: float | None = None) -> None:
+        """Add a phase from ``time.monotonic()`` readings taken by the caller."""
+        end = time.monotonic() if end is None else end
+        phase = Phase(
+            name=name,
+            start_ms=round((start - self.origin) * 1000, 2),
+            duration_ms=round((end - start) * 1000, 2),
+            thread=threading.current_thread().name,
+        )
+        with self._lock:
+            self._phases.append(phase)
+
+    def mark(self, name: str) -> None:
+        """Record an instant (zero-length phase), e.g. "window shown"."""
+        now = time.monotonic()
+        self.record(name, now, now)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    @property
+    def phases(self) -> list[Phase]:
+        with self._lock:
+            return list(self._phases)
+
+    def to_dict(self) -> dict:
+        phases = self.phases
+        total = max((p.start_ms + p.duration_ms for p in phases), default=0.0)
+        return {
+            "label": self.label,
+            "started_at": self.started_at,
+            "pid": os.getpid(),
+            "version": __version__,
+            "total_ms": round(total, 2),
+            "phases": [asdict(p) for p in phases],
+        }
+
+    def save(self) -> str | None:
+        """
+        Write the timeline; later calls overwrite the same file so phases
+        that finish after the first save (e.g. the update pass) are kept.
+        """
+        try:
+            if self._path is None:
+                directory = self._directory or get_timelines_dir()
+                stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                self._path = os.path.join(directory, f"{_PREFIX}{stamp}_{os.getpid()}.json")
+                prune_timelines(directory)
+            tmp = f"{self._path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2)
+            os.replace(tmp, self._path)
+        except OSError as exc:
+            logger.debug("Could not write startup timeline: %s", exc)
+            return None
+        return self._path
+
+
+def recent_timelines(limit: int = 10, directory: str | None = None) -> list[str]:
+    """Newest-first paths of saved timelines."""
+    directory = directory or get_timelines_dir()
+    try:
+        names = [n for n in os.listdir(directory) if n.startswith(_PREFIX) and n.endswith(".json")]
+    except OSError:
+        return []
+    # Names start with the launch timestamp, so they sort chronologically.
+    return [os.path.join(directory, n) for n in sorted(names, reverse=True)[:limit]]
+
+
+def prune_timelines(directory: str | None = None, keep: int = KEEP_TIMELINES) -> None:
+    for path in recent_timelines(limit=10**6, directory=directory)[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_STARTUP_TIMER: PhaseTimer | None = None
+_STARTUP_LOCK = threading.Lock()
+
+
+def get_startup_timer(origin: float | None = None) -> PhaseTimer:
+    """Process-wide startup timer; ``origin`` only applies on first call."""
+    global _STARTUP_TIMER
+    with _STARTUP_LOCK:
+        if _STARTUP_TIMER is None:
+            _STARTUP_TIMER = PhaseTimer("startup", origin=origin)
+        return _STARTUP_TIMER
@@ -15,6 +15,7 @@ if _REPO_ROOT not in sys.path:
 import elysium.ui.qt_bootstrap  # noqa: F401
 from elysium.app import run_qml_app
 from elysium.core.paths import get_base_dir
+from elysium.core.single_instance import claim_single_instance, request_from_argv
 
 
 def _run_legacy_fallback() -> int:
@@ -28,12 +29,25 @@ def _run_legacy_fallback() -> int:
     return subprocess.call([sys.executable, elysium_py], env=env)
 
 
+def _close_other_instances() -> None:
+    from elysium.services.process_service import close_other_elysium_instances
+
+    close_other_elysium_instances()
+
+
 def main() -> int:
+    instance = claim_single_instance(request_from_argv(sys.argv[1:]), on_conflict=_close_other_instances)
+    if instance is None:
+        return 0
     try:
-        return run_qml_app()
+        return run_qml_app(instance)
     except RuntimeError as exc:
         print(str(exc), file=sys.stderr)
+        # The classic UI takes the lock itself.
+        instance.release()
         return _run_legacy_fallback()
+    finally:
+        instance.release()
 
 
 if __name__ == "__main__":
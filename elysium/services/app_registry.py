@@ -2,52 +2,241 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
+import logging
 import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass, field
 from typing import Any
 
+import pydantic
 import yaml
 
 from elysium.core.models import AppDefinition, AppLaunchType
-from elysium.core.paths import get_base_dir, get_manifest_path, resolve_app_dir
+from elysium.core.paths import get_base_dir, get_cache_dir, resolve_app_dir
+from elysium.services.manifest_sources import resolve_manifest_path
+
+logger = logging.getLogger("Elysium.AppRegistry")
+
+# How often a registry re-stats its manifest; lookups in between are pure dict hits.
+RELOAD_CHECK_SECONDS = 1.0
+# Bump when the pickled layout changes; model schema changes are picked up automatically.
+MANIFEST_CACHE_VERSION = 1
+_MAX_COMPILED_MANIFESTS = 8
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@dataclass
+class ManifestSnapshot:
+    """One parse of a manifest, with lookup indexes. Shared between registries; do not mutate."""
+
+    stamp: tuple[int, int]
+    apps: tuple[AppDefinition, ...] = ()
+    by_id: dict[str, AppDefinition] = field(default_factory=dict)
+    by_name: dict[str, AppDefinition] = field(default_factory=dict)
+    by_tag: dict[str, tuple[AppDefinition, ...]] = field(default_factory=dict)
+    raw: dict[str, dict] = field(default_factory=dict)
+
+
+@dataclass
+class _CachedManifest:
+    snapshot: ManifestSnapshot
+    checked_at: float
+
+
+_CACHE: dict[str, _CachedManifest] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _stamp(path: str) -> tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+@functools.lru_cache(maxsize=1)
+def _schema_fingerprint() -> bytes:
+    schema = json.dumps(AppDefinition.model_json_schema(), sort_keys=True)
+    return f"{MANIFEST_CACHE_VERSION}:{pydantic.VERSION}:{schema}".encode()
+
+
+def compiled_cache_dir() -> str:
+    return os.path.join(get_cache_dir(), "manifests")
+
+
+def _compiled_path(content: bytes) -> str | None:
+    digest = hashlib.sha256(_schema_fingerprint() + b"\0" + content).hexdigest()
+    try:
+        directory = compiled_cache_dir()
+    except OSError as exc:
+        logger.debug("No cache dir for compiled manifests: %s", exc)
+        return None
+    return os.path.join(directory, f"{digest[:32]}.pickle")
+
+
+def _load_compiled(cache_path: str) -> tuple[list, list[AppDefinition]] | None:
+    try:
+        with open(cache_path, "rb") as f:
+            items, apps = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.debug("Ignoring unreadable compiled manifest %s: %s", cache_path, exc)
+        return None
+    if len(items) != len(apps) or not all(isinstance(app, AppDefinition) for app in apps):
+        return None
+    return items, apps
+
+
+def _store_compiled(cache_path: str, items: list, apps: list[AppDefinition]) -> None:
+    directory = os.path.dirname(cache_path)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump((items, apps), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        # Keys are content hashes, so every manifest edit leaves an old file behind.
+        compiled = sorted(
+            (entry for entry in os.scandir(directory) if entry.name.endswith(".pickle")),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in compiled[_MAX_COMPILED_MANIFESTS:]:
+            os.remove(entry.path)
+    except OSError as exc:
+        logger.debug("Could not write compiled manifest %s: %s", cache_path, exc)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _parse(path: str, stamp: tuple[int, int], previous: ManifestSnapshot | None) -> ManifestSnapshot:
+    with open(path, "rb") as f:
+        content = f.read()
+    # A compiled snapshot keyed on the content hash skips YAML and validation entirely.
+    cache_path = _compiled_path(content)
+    compiled = _load_compiled(cache_path) if cache_path else None
+    if compiled is not None:
+        items, apps = compiled
+    else:
+        data = yaml.load(content, Loader=_SafeLoader) or {}
+        items = list(data.get("apps", []))
+        apps = [None] * len(items)
+
+    snapshot = ManifestSnapshot(stamp)
+    tags: dict[str, list[AppDefinition]] = {}
+    reused = 0
+    for index, item in enumerate(items):
+        app_id = item.get("id") if isinstance(item, dict) else None
+        # Entries unchanged since the last parse keep their model object.
+        if previous is not None and app_id in previous.raw and previous.raw[app_id] == item:
+            apps[index] = previous.by_id[app_id]
+            reused += 1
+        elif apps[index] is None:
+            apps[index] = AppDefinition.model_validate(item)
+        app = apps[index]
+        if app.id not in snapshot.by_id:
+            snapshot.by_id[app.id] = app
+            snapshot.raw[app.id] = item
+        snapshot.by_name.setdefault(app.name, app)
+        for tag in app.tags:
+            tags.setdefault(tag, []).append(app)
+    snapshot.apps = tuple(apps)
+    snapshot.by_tag = {tag: tuple(found) for tag, found in tags.items()}
+    if compiled is None and cache_path:
+        _store_compiled(cache_path, items, apps)
+    if previous is not None:
+        logger.info("Reloaded %s: %d apps (%d unchanged)", path, len(apps), reused)
+    return snapshot
+
+
+def load_manifest(manifest_path: str, *, force: bool = False) -> ManifestSnapshot:
+    """
+    Process-wide manifest cache keyed on path. The file is re-stat'ed at most
+    every ``RELOAD_CHECK_SECONDS`` and re-parsed only when its mtime or size
+    changed; entries that did not change are not re-validated.
+    """
+    path = os.path.abspath(manifest_path)
+    cached = _CACHE.get(path)
+    if cached and not force and time.monotonic() - cached.checked_at < RELOAD_CHECK_SECONDS:
+        return cached.snapshot
+    with _CACHE_LOCK:
+        cached = _CACHE.get(path)
+        now = time.monotonic()
+        if cached and not force and now - cached.checked_at < RELOAD_CHECK_SECONDS:
+            return cached.snapshot
+        try:
+            stamp = _stamp(path)
+        except OSError:
+            if cached is None:
+                raise FileNotFoundError(f"App manifest not found: {manifest_path}") from None
+            logger.warning("App manifest %s disappeared; keeping the last loaded copy", path)
+            cached.checked_at = now
+            return cached.snapshot
+        if cached and cached.snapshot.stamp == stamp:
+            cached.checked_at = now
+            return cached.snapshot
+        snapshot = _parse(path, stamp, cached.snapshot if cached else None)
+        _CACHE[path] = _CachedManifest(snapshot, now)
+        return snapshot
+
+
+def clear_manifest_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
 
 
 class AppRegistry:
+    """
+    Cheap to construct: all registries for the same manifest share one
+    parsed snapshot, which is swapped when the file changes on disk. Without
+    an explicit ``manifest_path`` the registry follows the merged manifest
+    sources (see ``manifest_sources``).
+    """
+
     def __init__(self, manifest_path: str | None = None, install_root: str | None = None):
-        self.manifest_path = manifest_path or get_manifest_path()
+        self._follow_sources = manifest_path is None
+        self.manifest_path = manifest_path or resolve_manifest_path()
         self.install_root = install_root or os.path.dirname(os.path.abspath(__file__))
         repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         if os.path.isfile(os.path.join(repo_root, "ELYSIUM.py")):
             self.install_root = repo_root
-        self._apps: list[AppDefinition] = []
-        self._load()
+        self._snapshot = load_manifest(self.manifest_path)
 
-    def _load(self) -> None:
-        if not os.path.isfile(self.manifest_path):
-            raise FileNotFoundError(f"App manifest not found: {self.manifest_path}")
-        with open(self.manifest_path, encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-        self._apps = [AppDefinition.model_validate(item) for item in data.get("apps", [])]
+    def _current(self) -> ManifestSnapshot:
+        if self._follow_sources:
+            self.manifest_path = resolve_manifest_path()
+        self._snapshot = load_manifest(self.manifest_path)
+        return self._snapshot
+
+    def reload(self) -> None:
+        """Re-stat the manifest now instead of waiting for the next check."""
+        if self._follow_sources:
+            self.manifest_path = resolve_manifest_path()
+        self._snapshot = load_manifest(self.manifest_path, force=True)
 
     @property
     def apps(self) -> list[AppDefinition]:
-        return list(self._apps)
+        return list(self._current().apps)
 
     def get(self, app_id: str) -> AppDefinition | None:
-        for app in self._apps:
-            if app.id == app_id:
-                return app
-        return None
+        return self._current().by_id.get(app_id)
 
     def get_by_name(self, name: str) -> AppDefinition | None:
-        for app in self._apps:
-            if app.name == name:
-                return app
-        return None
+        return self._current().by_name.get(name)
+
+    def get_by_tag(self, tag: str) -> list[AppDefinition]:
+        return list(self._current().by_tag.get(tag, ()))
 
     def legacy_programs_dict(self) -> dict[str, dict[str, Any]]:
         """Map display name -> legacy program info dict for ProgramUpdater."""
         programs: dict[str, dict[str, Any]] = {}
-        for app in self._apps:
+        for app in self._current().apps:
             programs[app.name] = app.to_legacy_program_dict(self.install_root)
         return programs
 
@@ -0,0 +1,104 @@
+"""Background stale-state cleanup run alongside startup."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Callable
+
+from elysium.core.paths import resolve_app_dir
+from elysium.core.timeline import get_startup_timer
+from elysium.services.app_registry import AppRegistry
+from elysium.services.process_service import patch_flow_launcher, stop_flow_server
+
+logger = logging.getLogger("Elysium.CleanupService")
+
+
+@dataclass
+class CleanupStep:
+    name: str
+    run: Callable[[], None]
+
+
+def default_steps(registry: AppRegistry | None = None) -> list[CleanupStep]:
+    def registry_() -> AppRegistry:
+        nonlocal registry
+        if registry is None:
+            registry = AppRegistry()
+        return registry
+
+    def patch_flow() -> None:
+        flow = registry_().get("flow")
+        if flow:
+            patch_flow_launcher(resolve_app_dir(flow.id, flow.folder_name()))
+
+    return [
+        CleanupStep("stop_flow_server", lambda: stop_flow_server(registry_())),
+        CleanupStep("patch_flow_launcher", patch_flow),
+    ]
+
+
+class StartupCleanup:
+    """
+    Runs cleanup steps in order on a daemon thread.
+
+    A failing step is logged and the rest still run. The UI does not wait
+    on this; only work that conflicts with it (launching Flow) should check
+    ``done()`` or register ``add_done_callback``.
+    """
+
+    def __init__(self, steps: list[CleanupStep] | None = None):
+        self._steps = steps
+        self._future: Future = Future()
+        self._lock = threading.Lock()
+        self._started = False
+        self.errors: dict[str, str] = {}
+
+    def start(self) -> Future:
+        with self._lock:
+            if not self._started:
+                self._started = True
+                threading.Thread(target=self._run, name="startup-cleanup", daemon=True).start()
+        return self._future
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        try:
+            self._future.result(timeout=timeout)
+        except FutureTimeoutError:
+            return False
+        return True
+
+    def add_done_callback(self, callback: Callable[[], None]) -> None:
+        """``callback`` runs on the cleanup thread, or immediately if already done."""
+        self._future.add_done_callback(lambda _future: callback())
+
+    def _run(self) -> None:
+        timer = get_startup_timer()
+        steps = self._steps if self._steps is not None else default_steps()
+        for step in steps:
+            start = time.monotonic()
+            try:
+                step.run()
+            except Exception as exc:
+                logger.warning("Startup cleanup step %s failed: %s", step.name, exc)
+                self.errors[step.name] = str(exc)
+            timer.record(f"cleanup.{step.name}", start)
+        self._future.set_result(None)
+
+
+_CLEANUP: StartupCleanup | None = None
+_CLEANUP_LOCK = threading.Lock()
+
+
+def get_startup_cleanup() -> StartupCleanup:
+    global _CLEANUP
+    with _CLEANUP_LOCK:
+        if _CLEANUP is None:
+            _CLEANUP = StartupCleanup()
+        return _CLEANUP
@@ -0,0 +1,270 @@
+"""Requirement checks for app dependencies."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import site
+import sqlite3
+import sys
+import threading
+from dataclasses import dataclass, field
+from importlib import metadata
+
+from packaging.markers import UndefinedComparison, UndefinedEnvironmentName
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion
+
+from elysium.services.state_store import StateStore, get_state_store
+
+logger = logging.getLogger("Elysium.DependencyService")
+
+
+def default_site_dirs() -> list[str]:
+    dirs = list(site.getsitepackages())
+    user_site = site.getusersitepackages()
+    if user_site:
+        dirs.append(user_site)
+    return dirs
+
+
+def site_packages_marker(site_dirs: list[str] | None = None) -> str:
+    """
+    Cheap "did anything get installed?" marker.
+
+    pip adds or removes a ``*.dist-info`` directory for every install,
+    upgrade and uninstall, which bumps the parent directory's mtime.
+    """
+    parts = []
+    for path in site_dirs if site_dirs is not None else default_site_dirs():
+        try:
+            parts.append(f"{os.path.normcase(path)}:{os.stat(path).st_mtime_ns}")
+        except OSError:
+            parts.append(f"{os.path.normcase(path)}:-")
+    return "|".join(parts)
+
+
+def requirements_fingerprint(
+    requirements_file: str,
+    python_exe: str | None = None,
+    site_dirs: list[str] | None = None,
+) -> str | None:
+    """Hash of requirements content, interpreter path and site-packages state."""
+    try:
+        with open(requirements_file, "rb") as f:
+            content = f.read()
+    except OSError:
+        return None
+    digest = hashlib.sha256(content)
+    digest.update(b"\0")
+    digest.update(os.path.normcase(os.path.abspath(python_exe or sys.executable)).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(site_packages_marker(site_dirs).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def is_fingerprint_satisfied(
+    app_id: str,
+    fingerprint: str | None,
+    store: StateStore | None = None,
+) -> bool:
+    if not fingerprint:
+        return False
+    try:
+        record = (store or get_state_store()).get(app_id)
+    except sqlite3.Error as exc:
+        logger.debug("Dependency cache lookup failed for %s: %s", app_id, exc)
+        return False
+    return bool(record and record.deps_hash == fingerprint)
+
+
+def record_satisfied(
+    app_id: str,
+    fingerprint: str | None,
+    store: StateStore | None = None,
+) -> None:
+    if not fingerprint:
+        return
+    try:
+        (store or get_state_store()).update(app_id, deps_hash=fingerprint)
+    except sqlite3.Error as exc:
+        logger.debug("Could not record dependency check for %s: %s", app_id, exc)
+
+
+@dataclass
+class RequirementIssue:
+    requirement: str
+    name: str
+    installed_version: str | None
+    reason: str
+
+    def __str__(self) -> str:
+        return f"{self.requirement} ({self.reason})"
+
+
+@dataclass
+class DependencyCheckResult:
+    satisfied: list[str] = field(default_factory=list)
+    missing: list[RequirementIssue] = field(default_factory=list)
+    conflicting: list[RequirementIssue] = field(default_factory=list)
+    invalid: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.conflicting
+
+    def to_install(self) -> list[str]:
+        """Requirement strings that pip still needs to act on."""
+        return [issue.requirement for issue in self.missing + self.conflicting]
+
+
+class DistributionIndex:
+    """Canonical name -> installed distribution, built from one metadata scan."""
+
+    def __init__(self, paths: list[str] | None = None):
+        self.paths = paths
+        self._dists: dict[str, metadata.Distribution] = {}
+        found = metadata.distributions(path=paths) if paths is not None else metadata.distributions()
+        for dist in found:
+            name = dist.metadata["Name"]
+            if not name:
+                continue
+            # First hit wins, matching import precedence along sys.path.
+            self._dists.setdefault(canonicalize_name(name), dist)
+
+    def __len__(self) -> int:
+        return len(self._dists)
+
+    def version(self, name: str) -> str | None:
+        dist = self._dists.get(canonicalize_name(name))
+        return dist.version if dist is not None else None
+
+    def extra_requirements(self, name: str, extra: str) -> list[Requirement]:
+        dist = self._dists.get(canonicalize_name(name))
+        if dist is None:
+            return []
+        extra_reqs = []
+        for line in dist.requires or []:
+            try:
+                req = Requirement(line)
+            except InvalidRequirement:
+                continue
+            if req.marker is None:
+                continue
+            try:
+                wanted = req.marker.evaluate({"extra": extra})
+                always = req.marker.evaluate({"extra": ""})
+            except (UndefinedComparison, UndefinedEnvironmentName):
+                continue
+            if wanted and not always:
+                extra_reqs.append(req)
+        return extra_reqs
+
+
+_INDEX_LOCK = threading.Lock()
+_INDEX_CACHE: dict[tuple[str, ...] | None, tuple[str, DistributionIndex]] = {}
+
+
+def get_distribution_index(paths: list[str] | None = None) -> DistributionIndex:
+    """
+    Shared index per search path, rebuilt only when site-packages changes.
+    ``paths=None`` means the running interpreter's ``sys.path``.
+    """
+    key = tuple(paths) if paths is not None else None
+    marker = site_packages_marker(paths if paths is not None else None)
+    with _INDEX_LOCK:
+        cached = _INDEX_CACHE.get(key)
+        if cached and cached[0] == marker:
+            return cached[1]
+        index = DistributionIndex(paths)
+        _INDEX_CACHE[key] = (marker, index)
+        return index
+
+
+def invalidate_distribution_index() -> None:
+    with _INDEX_LOCK:
+        _INDEX_CACHE.clear()
+
+
+def read_requirements(requirements_file: str) -> list[str]:
+    """Requirement lines with comments, blanks and pip options stripped."""
+    lines: list[str] = []
+    base_dir = os.path.dirname(os.path.abspath(requirements_file))
+    with open(requirements_file, encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if line.startswith("#"):
+                continue
+            line = line.split(" #", 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith(("-r ", "--requirement ")):
+                nested = line.split(None, 1)[1].strip()
+                lines.extend(read_requirements(os.path.join(base_dir, nested)))
+                continue
+            if line.startswith("-"):
+                logger.debug("Ignoring pip option in %s: %s", requirements_file, line)
+                continue
+            lines.append(line)
+    return lines
+
+
+def _check_one(req: Requirement, line: str, index: DistributionIndex, result: DependencyCheckResult) -> bool:
+    version = index.version(req.name)
+    if version is None:
+        result.missing.append(RequirementIssue(line, req.name, None, "not installed"))
+        return False
+    if req.specifier:
+        try:
+            matches = req.specifier.contains(version, prereleases=True)
+        except InvalidVersion:
+            matches = False
+        if not matches:
+            result.conflicting.append(
+                RequirementIssue(line, req.name, version, f"installed {version}, need {req.specifier}")
+            )
+            return False
+    return True
+
+
+def check_requirements(
+    requirements: list[str],
+    index: DistributionIndex | None = None,
+) -> DependencyCheckResult:
+    """
+    Evaluate requirement specifiers, markers and extras against ``index``.
+
+    Only the listed requirements (plus the dependencies their extras pull in)
+    are checked; unlike ``pkg_resources.require`` the full transitive graph is
+    not walked.
+    """
+    index = index or get_distribution_index()
+    result = DependencyCheckResult()
+    for line in requirements:
+        try:
+            req = Requirement(line)
+        except InvalidRequirement:
+            result.invalid.append(line)
+            continue
+        if req.marker is not None and not req.marker.evaluate():
+            continue
+        if not _check_one(req, line, index, result):
+            continue
+        extras_ok = True
+        for extra in sorted(req.extras):
+            for extra_req in index.extra_requirements(req.name, extra):
+                extra_line = str(extra_req).split(";", 1)[0].strip()
+                if not _check_one(extra_req, extra_line, index, result):
+                    extras_ok = False
+        if extras_ok:
+            result.satisfied.append(line)
+    return result
+
+
+def check_requirements_file(
+    requirements_file: str,
+    paths: list[str] | None = None,
+) -> DependencyCheckResult:
+    return check_requirements(read_requirements(requirements_file), get_distribution_index(paths))
@@ -16,15 +16,19 @@ from elysium.core.paths import (
     get_base_dir,
     get_legacy_base_dir,
     get_logs_dir,
-    get_manifest_path,
     get_settings_path,
+    get_timelines_dir,
     uses_legacy_layout,
 )
 from elysium.core.settings import load_settings
+from elysium.core.timeline import recent_timelines
 from elysium.services.app_registry import AppRegistry
+from elysium.services.manifest_sources import manifest_sources_info, resolve_manifest_path
 
 logger = logging.getLogger("Elysium.DiagnosticsService")
 
+DIAGNOSTIC_TIMELINES = 10
+
 
 def collect_system_info() -> dict:
     return {
@@ -51,7 +55,7 @@ def collect_app_states(registry: AppRegistry | None = None) -> dict:
     return states
 
 
-def export_diagnostics(output_dir: str | None = None) -> str:
+def export_diagnostics(output_dir: str | None = None, timelines: int = DIAGNOSTIC_TIMELINES) -> str:
     logs_dir = get_logs_dir()
     if output_dir is None:
         output_dir = logs_dir
@@ -61,7 +65,7 @@ def export_diagnostics(output_dir: str | None = None) -> str:
     zip_path = os.path.join(output_dir, f"Elysium_Diagnostics_{timestamp}.zip")
 
     registry = AppRegistry()
-    manifest_path = get_manifest_path()
+    manifest_path = resolve_manifest_path()
     settings_path = get_settings_path()
 
     with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
@@ -69,11 +73,19 @@ def export_diagnostics(output_dir: str | None = None) -> str:
             zf.write(settings_path, "settings.json")
         if os.path.isfile(manifest_path):
             zf.write(manifest_path, "manifests/apps.yaml")
+        zf.writestr("manifests/sources.json", json.dumps(manifest_sources_info(), indent=2))
 
         zf.writestr("system_info.json", json.dumps(collect_system_info(), indent=2))
         zf.writestr("installed_versions.json", json.dumps(collect_app_states(registry), indent=2))
 
+        # Only the most recent startup timelines; older ones are history noise.
+        timelines_dir = os.path.normcase(get_timelines_dir())
+        for path in recent_timelines(timelines):
+            zf.write(path, os.path.join("timelines", os.path.basename(path)))
+
         for root, _dirs, files in os.walk(logs_dir):
+            if os.path.normcase(root).startswith(timelines_dir):
+                continue
             for name in files:
                 full = os.path.join(root, name)
                 arc = os.path.relpath(full, logs_dir)
@@ -0,0 +1,156 @@
+"""Background preparation of isolated app environments."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Callable
+
+from elysium.core.cancel import CancelToken, use_token
+from elysium.core.models import AppDefinition, AppLaunchType
+from elysium.services.app_registry import AppRegistry
+from elysium.services.environment_service import prepare_env, should_use_isolated_env
+
+logger = logging.getLogger("Elysium.EnvPrepService")
+
+
+class EnvState(str, Enum):
+    UNKNOWN = ""
+    PREPARING = "preparing"
+    READY = "ready"
+    FAILED = "failed"
+
+
+def needs_isolated_env(app: AppDefinition) -> bool:
+    return app.launch.type != AppLaunchType.SCRIPT and should_use_isolated_env(app.id)
+
+
+class EnvPrepQueue:
+    """
+    Builds or refreshes app venvs on a background worker.
+
+    Submitting an app that is already queued or preparing is a no-op, so
+    callers can submit freely after every update. ``on_state`` is called
+    from the worker thread with ``(app_id, EnvState)``. A cancelled build
+    goes back to ``UNKNOWN`` so the next submit starts it again.
+    """
+
+    def __init__(
+        self,
+        registry: AppRegistry | None = None,
+        *,
+        prepare: Callable[[str, str], bool] | None = None,
+        on_state: Callable[[str, EnvState], None] | None = None,
+        max_workers: int = 1,
+    ):
+        self._registry = registry
+        self._prepare = prepare or prepare_env
+        self.on_state = on_state
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="env-prep")
+        self._lock = threading.Lock()
+        self._states: dict[str, EnvState] = {}
+        self._errors: dict[str, str] = {}
+        self._pending: dict[str, Future] = {}
+        self._tokens: dict[str, CancelToken] = {}
+
+    @property
+    def registry(self) -> AppRegistry:
+        if self._registry is None:
+            self._registry = AppRegistry()
+        return self._registry
+
+    def state(self, app_id: str) -> EnvState:
+        with self._lock:
+            return self._states.get(app_id, EnvState.UNKNOWN)
+
+    def error(self, app_id: str) -> str | None:
+        with self._lock:
+            return self._errors.get(app_id)
+
+    def submit(self, app: AppDefinition) -> Future | None:
+        if not needs_isolated_env(app):
+            return None
+        with self._lock:
+            pending = self._pending.get(app.id)
+            if pending is not None and not pending.done():
+                return pending
+            self._states[app.id] = EnvState.PREPARING
+            self._errors.pop(app.id, None)
+            token = self._tokens[app.id] = CancelToken()
+            future = self._executor.submit(self._run, app, token)
+            self._pending[app.id] = future
+        self._notify(app.id, EnvState.PREPARING)
+        return future
+
+    def submit_all(self, apps: list[AppDefinition]) -> None:
+        for app in apps:
+            self.submit(app)
+
+    def cancel(self, app_id: str) -> bool:
+        """Kill a running build or drop a queued one; False when nothing was pending."""
+        with self._lock:
+            future = self._pending.get(app_id)
+            token = self._tokens.get(app_id)
+            if future is None or future.done() or token is None:
+                return False
+            token.cancel()
+            dropped = future.cancel()
+            if dropped:
+                self._states[app_id] = EnvState.UNKNOWN
+        if dropped:
+            self._notify(app_id, EnvState.UNKNOWN)
+        return True
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            app_ids = list(self._pending)
+        for app_id in app_ids:
+            self.cancel(app_id)
+
+    def shutdown(self, wait: bool = False) -> None:
+        self.cancel_all()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, app: AppDefinition, token: CancelToken) -> EnvState:
+        app_dir = self.registry.app_install_dir(app)
+        try:
+            with use_token(token):
+                ok = self._prepare(app.id, app_dir)
+            error = None if ok else "dependency install failed"
+        except Exception as exc:
+            if not token.cancelled:
+                logger.error("Environment preparation failed for %s: %s", app.id, exc, exc_info=True)
+            ok, error = False, str(exc)
+        if token.cancelled:
+            state, error = EnvState.UNKNOWN, None
+        else:
+            state = EnvState.READY if ok else EnvState.FAILED
+        with self._lock:
+            self._states[app.id] = state
+            if error:
+                self._errors[app.id] = error
+        logger.info("Environment for %s: %s", app.id, state.value or "cancelled")
+        self._notify(app.id, state)
+        return state
+
+    def _notify(self, app_id: str, state: EnvState) -> None:
+        if self.on_state is None:
+            return
+        try:
+            self.on_state(app_id, state)
+        except Exception as exc:
+            logger.debug("Env state callback failed for %s: %s", app_id, exc)
+
+
+_QUEUE: EnvPrepQueue | None = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_env_prep_queue() -> EnvPrepQueue:
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            _QUEUE = EnvPrepQueue()
+        return _QUEUE
@@ -2,18 +2,30 @@
 
 from __future__ import annotations
 
+import glob
+import json
 import logging
 import os
-import subprocess
 import sys
-import venv
 
+from elysium.core import proc
+from elysium.core.exceptions import EnvironmentNotReadyError
 from elysium.core.paths import resolve_app_env_dir
 from elysium.core.settings import get_setting
-from elysium.windows.process_flags import no_window_flags
+from elysium.services.dependency_service import (
+    check_requirements,
+    get_distribution_index,
+    read_requirements,
+    requirements_fingerprint,
+)
+from elysium.services.package_store import PackageStore
+from elysium.services.pip_installer import PipInstaller
+from elysium.services.wheelhouse import Wheelhouse
 
 logger = logging.getLogger("Elysium.EnvironmentService")
 
+VENV_TIMEOUT_SECONDS = 600
+
 
 def should_use_isolated_env(app_id: str) -> bool:
     if not get_setting("use_isolated_envs", False):
@@ -31,6 +43,31 @@ def get_venv_python(app_id: str) -> str:
     return python_exe
 
 
+def get_venv_site_packages(app_id: str) -> str | None:
+    env_dir = resolve_app_env_dir(app_id)
+    if os.name == "nt":
+        candidates = [os.path.join(env_dir, "Lib", "site-packages")]
+    else:
+        candidates = sorted(glob.glob(os.path.join(env_dir, "lib", "python*", "site-packages")))
+    for path in candidates:
+        if os.path.isdir(path):
+            return path
+    return None
+
+
+def share_env_packages(app_id: str) -> None:
+    """Hardlink the env's site-packages files into the shared package store."""
+    if not get_setting("share_env_packages", True):
+        return
+    site_dir = get_venv_site_packages(app_id)
+    if not site_dir:
+        return
+    try:
+        PackageStore().link_tree(site_dir)
+    except OSError as exc:
+        logger.warning("Could not share packages for %s: %s", app_id, exc)
+
+
 def ensure_venv(app_id: str) -> str:
     python_exe = get_venv_python(app_id)
     if os.path.isfile(python_exe):
@@ -38,34 +75,135 @@ def ensure_venv(app_id: str) -> str:
 
     env_dir = resolve_app_env_dir(app_id)
     logger.info("Creating virtual environment for %s at %s", app_id, env_dir)
-    venv.create(env_dir, with_pip=True)
-    if not os.path.isfile(python_exe):
-        raise RuntimeError(f"Failed to create virtual environment for {app_id}")
+    # A child process (not venv.create) so ensurepip is bounded by a timeout.
+    result = proc.run(
+        [sys.executable, "-m", "venv", env_dir],
+        merge_stderr=True,
+        timeout=VENV_TIMEOUT_SECONDS,
+        on_stdout=lambda line: logger.info("venv %s: %s", app_id, line),
+    )
+    if not result.ok or not os.path.isfile(python_exe):
+        raise RuntimeError(f"Failed to create virtual environment for {app_id} ({result.describe()})")
+    share_env_packages(app_id)
     return python_exe
 
 
+REQUIREMENTS_STAMP = ".elysium-requirements.json"
+
+
+def requirements_stamp_path(app_id: str) -> str:
+    return os.path.join(resolve_app_env_dir(app_id), REQUIREMENTS_STAMP)
+
+
+def _read_stamp(app_id: str) -> dict:
+    try:
+        with open(requirements_stamp_path(app_id), encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_stamp(app_id: str, fingerprint: str | None, requirements: list[str]) -> None:
+    if not fingerprint:
+        return
+    path = requirements_stamp_path(app_id)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "requirements": requirements}, f, indent=2)
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.debug("Could not write requirements stamp for %s: %s", app_id, exc)
+
+
+def _has_pip_options(requirements_file: str) -> bool:
+    """Index URLs, constraints etc. only make sense to pip with the whole file."""
+    with open(requirements_file, encoding="utf-8") as f:
+        return any(line.strip().startswith("-") for line in f)
+
+
 def install_requirements(app_id: str, requirements_file: str) -> bool:
+    """
+    Bring the env in line with ``requirements_file``, installing only the
+    requirements the env does not already satisfy.
+
+    The applied requirements are stamped in the env dir together with a
+    fingerprint of the file, interpreter and site-packages state, so an
+    unchanged env is recognised without importing anything or running pip.
+    """
     if not os.path.isfile(requirements_file):
         return True
     python_exe = ensure_venv(app_id)
-    cmd = [python_exe, "-m", "pip", "install", "-r", requirements_file]
-    logger.info("Installing requirements for %s: %s", app_id, requirements_file)
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        creationflags=no_window_flags(),
-    )
-    if result.returncode != 0:
-        logger.error("pip install failed for %s: %s", app_id, result.stderr)
+    site_dir = get_venv_site_packages(app_id)
+    site_dirs = [site_dir] if site_dir else None
+    fingerprint = requirements_fingerprint(requirements_file, python_exe, site_dirs) if site_dirs else None
+    if fingerprint and _read_stamp(app_id).get("fingerprint") == fingerprint:
+        logger.debug("Requirements unchanged for %s env", app_id)
+        return True
+
+    requirements = read_requirements(requirements_file)
+    packages: list[str] | None = None
+    if site_dir:
+        check = check_requirements(requirements, get_distribution_index(site_dirs))
+        if check.ok:
+            logger.info("Requirements already satisfied in %s env; skipping pip", app_id)
+            _write_stamp(app_id, fingerprint, requirements)
+            return True
+        logger.info(
+            "%s env needs: %s", app_id, ", ".join(str(issue) for issue in check.missing + check.conflicting)
+        )
+        if not _has_pip_options(requirements_file):
+            packages = check.to_install()
+
+    logger.info("Installing requirements for %s: %s", app_id, ", ".join(packages) if packages else requirements_file)
+    result = Wheelhouse().install(requirements_file, python_exe, packages=packages)
+    if not result.ok:
+        logger.info("Wheelhouse install failed for %s; installing from the index", app_id)
+        installer = PipInstaller(python_exe)
+        result = installer.install(packages) if packages else installer.install_file(requirements_file)
+    if not result.ok:
+        logger.error("pip install failed for %s (%s): %s", app_id, result.failure.value, result.output)
         return False
+    share_env_packages(app_id)
+    site_dir = get_venv_site_packages(app_id)
+    if site_dir:
+        _write_stamp(app_id, requirements_fingerprint(requirements_file, python_exe, [site_dir]), requirements)
     return True
 
 
-def resolve_python_for_app(app_id: str, app_dir: str) -> str:
+def prepare_env(app_id: str, app_dir: str) -> bool:
+    """Create the venv and install the app's requirements (slow; run off the UI thread)."""
+    ensure_venv(app_id)
+    return install_requirements(app_id, os.path.join(app_dir, "requirements.txt"))
+
+
+def requirements_satisfied(app_id: str, app_dir: str) -> bool:
+    """Whether the env's requirements stamp matches ``app_dir``'s requirements (stat-only, no pip)."""
+    requirements_file = os.path.join(app_dir, "requirements.txt")
+    if not os.path.isfile(requirements_file):
+        return True
+    site_dir = get_venv_site_packages(app_id)
+    if not site_dir:
+        return False
+    fingerprint = _read_stamp(app_id).get("fingerprint")
+    return bool(fingerprint) and fingerprint == requirements_fingerprint(
+        requirements_file, get_venv_python(app_id), [site_dir]
+    )
+
+
+def resolve_python_for_app(app_id: str, app_dir: str, *, ready: bool = False) -> str:
+    """
+    Interpreter to launch ``app_id`` with. Never builds anything: isolated
+    envs are prepared in the background by ``env_prep_service``, and their
+    interpreter is only returned once that reported ``ready`` or the
+    requirements stamp still matches.
+    """
     if should_use_isolated_env(app_id):
-        python_exe = ensure_venv(app_id)
-        req = os.path.join(app_dir, "requirements.txt")
-        install_requirements(app_id, req)
+        python_exe = get_venv_python(app_id)
+        if not os.path.isfile(python_exe):
+            raise EnvironmentNotReadyError(app_id)
+        if not ready and not requirements_satisfied(app_id, app_dir):
+            raise EnvironmentNotReadyError(app_id)
         return python_exe
     return sys.executable
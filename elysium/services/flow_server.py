@@ -0,0 +1,196 @@
+"""Flow dev server lifecycle: native shutdown and warm reuse."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+import urllib.error
+import urllib.request
+import webbrowser
+from dataclasses import dataclass, field
+
+from elysium.bootstrap.repo_sync import read_head_sha
+from elysium.core.polling import wait_until
+from elysium.services.process_backend import ProcessBackend, ProcessInfo, get_process_backend, process_tree
+from elysium.services.socket_table import SocketTable, default_socket_table, port_in_use
+
+logger = logging.getLogger("Elysium.FlowServer")
+
+FLOW_SERVER_PORT = 3000
+STOP_DEADLINE_SECONDS = 3.0
+HEALTH_TIMEOUT_SECONDS = 1.0
+_LAUNCH_STAMP = "elysium-launch.json"
+_FLOW_HOST_NAMES = {"node.exe", "cmd.exe", "node"}
+_FLOW_SCRIPTS = ("launch-flow.ps1", "launch-flow.vbs")
+
+
+@dataclass
+class StopResult:
+    killed: list[int] = field(default_factory=list)
+    survivors: list[int] = field(default_factory=list)
+    port_free: bool = True
+    elapsed: float = 0.0
+
+
+class FlowServerController:
+    """
+    Finds the Flow server from the owner of the listening port and leftover
+    node/launcher processes started from the Flow folder, then kills those
+    process trees and waits for them to exit. ``launcher/logs/server.pid``
+    is not trusted on its own: after a reboot its PID may belong to an
+    unrelated process.
+    """
+
+    def __init__(
+        self,
+        flow_dir: str,
+        *,
+        port: int = FLOW_SERVER_PORT,
+        backend: ProcessBackend | None = None,
+        sockets: SocketTable | None = None,
+    ):
+        self.flow_dir = flow_dir
+        self.port = port
+        self.backend = backend or get_process_backend()
+        self.sockets = sockets if sockets is not None else default_socket_table()
+        self.logs_dir = os.path.join(flow_dir, "launcher", "logs")
+        self.pid_file = os.path.join(self.logs_dir, "server.pid")
+        self.server_log = os.path.join(self.logs_dir, "server.log")
+
+    def read_pid_file(self) -> int | None:
+        try:
+            with open(self.pid_file, encoding="utf-8-sig") as f:
+                value = f.read().strip()
+        except OSError:
+            return None
+        return int(value) if value.isdigit() else None
+
+    def is_flow_process(self, proc: ProcessInfo) -> bool:
+        cmdline = proc.cmdline.lower()
+        if not cmdline:
+            return False
+        if any(script in cmdline for script in _FLOW_SCRIPTS):
+            return True
+        return proc.name.lower() in _FLOW_HOST_NAMES and os.path.normcase(self.flow_dir).lower() in cmdline
+
+    def find_roots(self, processes: list[ProcessInfo]) -> set[int]:
+        live = {proc.pid: proc for proc in processes}
+        port_owners: set[int] = set()
+        if self.sockets is not None:
+            try:
+                port_owners = self.sockets.listening_pids(self.port) & live.keys()
+            except Exception as exc:
+                logger.debug("Socket table lookup failed: %s", exc)
+        roots = set(port_owners)
+        roots |= {proc.pid for proc in processes if self.is_flow_process(proc)}
+        pid = self.read_pid_file()
+        if pid is not None and pid in live and pid not in roots:
+            logger.info("Ignoring server.pid %d: not a Flow process (%s)", pid, live[pid].name)
+        roots.discard(os.getpid())
+        return roots
+
+    def stop(self, timeout: float = STOP_DEADLINE_SECONDS) -> StopResult:
+        started = time.monotonic()
+        result = StopResult()
+        if self.backend is None:
+            logger.warning("No process backend; cannot stop the Flow server")
+            return result
+        processes = self.backend.processes()
+        roots = self.find_roots(processes)
+        if roots:
+            tree = [pid for pid in process_tree(processes, roots) if pid != os.getpid()]
+            logger.info("Stopping Flow server processes %s", tree)
+            result.killed = self.backend.terminate(tree)
+            if not self.backend.wait_for_exit(result.killed, timeout):
+                result.survivors = [pid for pid in result.killed if self.backend.is_running(pid)]
+                logger.warning("Flow processes still running after %.1fs: %s", timeout, result.survivors)
+        result.port_free = wait_until(lambda: not port_in_use(self.port), timeout)
+        self._remove(self.pid_file, timeout=0)
+        self._remove(os.path.join(self.logs_dir, _LAUNCH_STAMP), timeout=0)
+        # server.log stays locked on Windows until the node process is fully gone.
+        self._remove(self.server_log, timeout=timeout)
+        result.elapsed = time.monotonic() - started
+        return result
+
+    @staticmethod
+    def _remove(path: str, timeout: float) -> bool:
+        def removed() -> bool:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                return True
+            except OSError:
+                return False
+            return True
+
+        return wait_until(removed, timeout)
+
+
+def probe_health(url: str, timeout: float = HEALTH_TIMEOUT_SECONDS) -> bool:
+    """True when the server answers ``url`` without a 5xx error."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status < 500
+    except urllib.error.HTTPError as exc:
+        return exc.code < 500
+    except (OSError, ValueError):
+        return False
+
+
+class FlowLifecycle:
+    """
+    Decides whether a running Flow server can be reused.
+
+    The commit the server was started from is stamped into the Flow log
+    folder at launch. A server is reused only when it answers its health
+    URL and that stamp matches the checkout's current HEAD; anything else
+    (no stamp, new commit, unhealthy, nothing listening) means restart.
+    """
+
+    def __init__(
+        self,
+        flow_dir: str,
+        *,
+        port: int = FLOW_SERVER_PORT,
+        health_path: str = "/",
+        host: str = "127.0.0.1",
+    ):
+        self.flow_dir = flow_dir
+        self.port = port
+        self.host = host
+        self.client_url = f"http://localhost:{port}/"
+        self.health_url = f"http://{host}:{port}{health_path}"
+        self.stamp_path = os.path.join(flow_dir, "launcher", "logs", _LAUNCH_STAMP)
+
+    def current_commit(self) -> str:
+        return read_head_sha(self.flow_dir)
+
+    def launched_commit(self) -> str:
+        try:
+            with open(self.stamp_path, encoding="utf-8") as f:
+                return str(json.load(f).get("commit", ""))
+        except (OSError, ValueError, AttributeError):
+            return ""
+
+    def reusable(self) -> bool:
+        if not port_in_use(self.port, self.host):
+            return False
+        commit = self.current_commit()
+        if not commit or commit != self.launched_commit():
+            logger.info("Flow server is from another checkout commit; restarting it")
+            return False
+        if not probe_health(self.health_url):
+            logger.info("Flow server on port %d is unhealthy; restarting it", self.port)
+            return False
+        return True
+
+    def record_launch(self) -> None:
+        os.makedirs(os.path.dirname(self.stamp_path), exist_ok=True)
+        with open(self.stamp_path, "w", encoding="utf-8") as f:
+            json.dump({"commit": self.current_commit(), "launched_at": time.time()}, f)
+
+    def open_client(self) -> None:
+        logger.info("Reusing running Flow server at %s", self.client_url)
+        webbrowser.open(self.client_url)
@@ -4,20 +4,16 @@ from __future__ import annotations
 
 import os
 import shutil
-import winreg
 
+try:
+    import winreg
+except ImportError:  # non-Windows (tests, CI)
+    winreg = None  # type: ignore[assignment]
 
-def resolve_git_executable() -> str | None:
-    git_in_path = shutil.which("git")
-    if git_in_path:
-        return git_in_path
 
-    candidate_paths = [
-        r"C:\Program Files\Git\cmd\git.exe",
-        r"C:\Program Files\Git\bin\git.exe",
-        r"C:\Program Files (x86)\Git\cmd\git.exe",
-        r"C:\Program Files (x86)\Git\bin\git.exe",
-    ]
+def _add_registry_candidates(candidate_paths: list[str]) -> None:
+    if winreg is None:
+        return
 
     try:
         with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\GitForWindows") as key:
@@ -54,6 +50,21 @@ def resolve_git_executable() -> str | None:
     except (OSError, FileNotFoundError):
         pass
 
+
+def resolve_git_executable() -> str | None:
+    git_in_path = shutil.which("git")
+    if git_in_path:
+        return git_in_path
+
+    candidate_paths = [
+        r"C:\Program Files\Git\cmd\git.exe",
+        r"C:\Program Files\Git\bin\git.exe",
+        r"C:\Program Files (x86)\Git\cmd\git.exe",
+        r"C:\Program Files (x86)\Git\bin\git.exe",
+    ]
+
+    _add_registry_candidates(candidate_paths)
+
     for git_exe in candidate_paths:
         if os.path.isfile(git_exe):
             git_dir = os.path.dirname(git_exe)
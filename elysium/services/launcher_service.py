@@ -7,8 +7,10 @@ import os
 import subprocess
 from dataclasses import dataclass
 
+from elysium.core.exceptions import EnvironmentNotReadyError
 from elysium.core.models import AppDefinition, AppLaunchType
 from elysium.services.app_registry import AppRegistry
+from elysium.services.env_prep_service import EnvState, get_env_prep_queue
 from elysium.services.environment_service import resolve_python_for_app
 from elysium.windows.process_flags import no_window_flags
 
@@ -56,7 +58,15 @@ class LauncherService:
             else:
                 command = ["powershell", "-ExecutionPolicy", "Bypass", "-File", entry_path]
         else:
-            python_exe = resolve_python_for_app(app.id, app_dir)
+            queue = get_env_prep_queue()
+            state = queue.state(app.id)
+            if state == EnvState.PREPARING:
+                raise EnvironmentNotReadyError(app.id)
+            try:
+                python_exe = resolve_python_for_app(app.id, app_dir, ready=state == EnvState.READY)
+            except EnvironmentNotReadyError:
+                queue.submit(app)
+                raise
             command = [python_exe, entry_path]
 
         return LaunchPlan(
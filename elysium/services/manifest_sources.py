@@ -0,0 +1,312 @@
+"""
+Merge the app manifest from several sources.
+
+Sources are applied in order, later ones winning per app id at the top-level
+key level: the local manifest (``get_manifest_path``: the bundled one, or
+the base-dir copy when nothing is bundled), an optional team manifest URL
+(``manifest_url`` setting) and a local ``overrides.yaml`` in the base dir's
+``manifests`` folder. An entry with ``remove: true`` drops that app. An entry that would leave its
+app invalid is dropped with a warning, so one bad team push or override
+cannot break the registry.
+
+Remote manifests are fetched with conditional requests (ETag /
+If-Modified-Since) into the cache dir and served from there when unchanged,
+inside ``manifest_ttl_seconds`` or offline. Network access only happens on
+``path(fetch=True)``, which startup runs off the UI thread. The merge
+result is written to a cache file that is only rewritten when its content
+changes, so the registry's mtime and content-hash caches keep hitting.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from typing import Any
+
+import pydantic
+import yaml
+
+from elysium.core.models import AppDefinition
+from elysium.core.paths import get_base_dir, get_cache_dir, get_manifest_path
+from elysium.core.settings import get_settings_store, load_settings
+
+logger = logging.getLogger("Elysium.ManifestSources")
+
+REMOTE_TIMEOUT_SECONDS = 10
+CHECK_INTERVAL_SECONDS = 1.0
+OVERRIDES_FILE_NAME = "overrides.yaml"
+MERGED_FILE_NAME = "merged-apps.yaml"
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@dataclass
+class ManifestSource:
+    name: str
+    location: str
+
+    @property
+    def remote(self) -> bool:
+        return self.location.startswith(("http://", "https://"))
+
+
+@dataclass
+class FetchResult:
+    path: str | None
+    status: str  # "fetched", "not_modified", "cached" or "offline"
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _load_document(data: bytes) -> dict[str, Any]:
+    document = yaml.load(data, Loader=_SafeLoader) or {}
+    if not isinstance(document, dict) or not isinstance(document.get("apps", []), list):
+        raise ValueError("manifest must be a mapping with an 'apps' list")
+    return document
+
+
+class RemoteManifestCache:
+    """Conditional-GET cache for remote manifests, one body + metadata file per URL."""
+
+    def __init__(self, cache_dir: str, *, ttl: float = 0, timeout: float = REMOTE_TIMEOUT_SECONDS):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.timeout = timeout
+
+    def _paths(self, url: str) -> tuple[str, str]:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{key}.yaml"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_meta(self, meta_path: str) -> dict[str, Any]:
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            return meta if isinstance(meta, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, meta_path: str, meta: dict[str, Any]) -> None:
+        try:
+            _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        except OSError as exc:
+            logger.debug("Could not write manifest cache metadata: %s", exc)
+
+    def cached_path(self, url: str) -> str | None:
+        body_path, _ = self._paths(url)
+        return body_path if os.path.isfile(body_path) else None
+
+    def fetch(self, url: str, *, force: bool = False) -> FetchResult:
+        body_path, meta_path = self._paths(url)
+        cached = body_path if os.path.isfile(body_path) else None
+        meta = self._read_meta(meta_path) if cached else {}
+        if cached and not force and time.time() - float(meta.get("checked_at", 0)) < self.ttl:
+            return FetchResult(cached, "cached")
+
+        headers = {"User-Agent": "Elysium"}
+        if cached and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if cached and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+            _load_document(body)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304 and cached:
+                meta["checked_at"] = time.time()
+                self._write_meta(meta_path, meta)
+                return FetchResult(cached, "not_modified")
+            logger.warning("Manifest %s returned HTTP %s; using cached copy", url, exc.code)
+            return FetchResult(cached, "offline")
+        except (OSError, ValueError, yaml.YAMLError) as exc:
+            logger.warning("Could not fetch manifest %s (%s); using cached copy", url, exc)
+            return FetchResult(cached, "offline")
+
+        try:
+            _atomic_write(body_path, body)
+        except OSError as exc:
+            logger.warning("Could not cache manifest %s: %s", url, exc)
+            return FetchResult(cached, "offline")
+        self._write_meta(
+            meta_path,
+            {"url": url, "etag": etag, "last_modified": last_modified, "checked_at": time.time()},
+        )
+        return FetchResult(body_path, "fetched")
+
+
+def merge_manifests(documents: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Later documents win per app id; keys they do not mention are kept. An
+    entry whose merged result fails ``AppDefinition`` validation is skipped
+    and the app keeps its previous definition, if any.
+    """
+    merged: dict[str, dict[str, Any]] = {}
+    for document in documents:
+        for item in document.get("apps") or []:
+            if not isinstance(item, dict) or not item.get("id"):
+                logger.warning("Skipping manifest entry without an id: %r", item)
+                continue
+            app_id = item["id"]
+            if item.get("remove"):
+                merged.pop(app_id, None)
+                continue
+            candidate = {**merged.get(app_id, {}), **item}
+            try:
+                AppDefinition.model_validate(candidate)
+            except pydantic.ValidationError as exc:
+                logger.warning("Skipping invalid manifest entry for %s: %s", app_id, exc)
+                continue
+            merged[app_id] = candidate
+    return {"apps": list(merged.values())}
+
+
+class ManifestMerger:
+    """
+    Resolves the effective manifest path for a list of sources. With a single
+    local source that path is returned as-is; otherwise the sources are merged
+    into ``output_path``, redone only when a source file changes.
+    """
+
+    def __init__(self, sources: list[ManifestSource], *, output_path: str, remote: RemoteManifestCache):
+        self.sources = sources
+        self.output_path = output_path
+        self.remote = remote
+        self._lock = threading.Lock()
+        self._key: tuple | None = None
+        self._path: str | None = None
+        self._checked_at = 0.0
+        self.used: list[tuple[ManifestSource, str]] = []
+
+    def _resolve(self, source: ManifestSource, fetch: bool) -> str | None:
+        if source.remote:
+            return self.remote.fetch(source.location).path if fetch else self.remote.cached_path(source.location)
+        return source.location if os.path.isfile(source.location) else None
+
+    def path(self, *, fetch: bool = False) -> str:
+        if self._path and not fetch and time.monotonic() - self._checked_at < CHECK_INTERVAL_SECONDS:
+            return self._path
+        with self._lock:
+            now = time.monotonic()
+            if self._path and not fetch and now - self._checked_at < CHECK_INTERVAL_SECONDS:
+                return self._path
+            self._checked_at = now
+            resolved = [(source, self._resolve(source, fetch)) for source in self.sources]
+            resolved = [(source, path) for source, path in resolved if path]
+            key = tuple((path, _file_stamp(path)) for _, path in resolved)
+            if key == self._key and self._path:
+                return self._path
+            self._path = self._merge(resolved)
+            self._key = key
+            self.used = resolved
+            return self._path
+
+    def _merge(self, resolved: list[tuple[ManifestSource, str]]) -> str:
+        if not resolved:
+            raise FileNotFoundError(f"No app manifest found in {[s.location for s in self.sources]}")
+        if len(resolved) == 1 and not resolved[0][0].remote:
+            return resolved[0][1]
+        documents = []
+        for source, path in resolved:
+            try:
+                with open(path, "rb") as f:
+                    documents.append(_load_document(f.read()))
+            except (OSError, ValueError, yaml.YAMLError) as exc:
+                logger.warning("Ignoring %s manifest %s: %s", source.name, path, exc)
+        data = yaml.safe_dump(merge_manifests(documents), sort_keys=False, allow_unicode=True).encode("utf-8")
+        try:
+            with open(self.output_path, "rb") as f:
+                unchanged = f.read() == data
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            _atomic_write(self.output_path, data)
+            logger.info("Merged app manifest from %s", ", ".join(source.name for source, _ in resolved))
+        return self.output_path
+
+
+def _file_stamp(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def default_sources(settings: dict[str, Any] | None = None) -> list[ManifestSource]:
+    settings = settings if settings is not None else load_settings()
+    # Never layer the base-dir copy under the bundled manifest: it may be
+    # older and still list apps the bundled one has since dropped.
+    sources = [ManifestSource("local", get_manifest_path())]
+    url = (settings.get("manifest_url") or "").strip()
+    if url:
+        sources.append(ManifestSource("team", url))
+    sources.append(ManifestSource("overrides", os.path.join(get_base_dir(), "manifests", OVERRIDES_FILE_NAME)))
+    return sources
+
+
+_MERGER: ManifestMerger | None = None
+_MERGER_LOCK = threading.Lock()
+_MERGER_SETTINGS = ("manifest_url", "manifest_ttl_seconds")
+_subscribed_store: Any = None
+
+
+def _reset_merger(_value: Any = None) -> None:
+    # Called from settings notifications, possibly inside get_manifest_merger(),
+    # so this must not take _MERGER_LOCK.
+    global _MERGER
+    _MERGER = None
+
+
+def get_manifest_merger() -> ManifestMerger:
+    global _MERGER, _subscribed_store
+    with _MERGER_LOCK:
+        store = get_settings_store()
+        if store is not _subscribed_store:
+            for key in _MERGER_SETTINGS:
+                store.subscribe(key, _reset_merger)
+            _subscribed_store = store
+        merger = _MERGER
+        if merger is None:
+            settings = load_settings()
+            cache_dir = os.path.join(get_cache_dir(), "manifests")
+            merger = ManifestMerger(
+                default_sources(settings),
+                output_path=os.path.join(cache_dir, MERGED_FILE_NAME),
+                remote=RemoteManifestCache(
+                    os.path.join(cache_dir, "remote"),
+                    ttl=float(settings.get("manifest_ttl_seconds", 300)),
+                ),
+            )
+            _MERGER = merger
+        return merger
+
+
+def resolve_manifest_path(*, fetch: bool = False) -> str:
+    """Effective manifest path; ``fetch`` refreshes remote sources (blocking, keep off the UI thread)."""
+    return get_manifest_merger().path(fetch=fetch)
+
+
+def manifest_sources_info() -> list[dict[str, Any]]:
+    """The configured sources and the file each resolved to in the last merge, for diagnostics."""
+    merger = get_manifest_merger()
+    merger.path()
+    used = {id(source): path for source, path in merger.used}
+    return [
+        {"name": source.name, "location": source.location, "path": used.get(id(source))}
+        for source in merger.sources
+    ]
@@ -0,0 +1,218 @@
+"""Content-addressed file store shared by isolated app environments.
+
+Usage: python -m elysium.services.package_store {report,dedupe,gc}
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import os
+import sys
+import uuid
+from dataclasses import dataclass
+
+from elysium.core.paths import get_cache_dir, get_envs_dir
+
+logger = logging.getLogger("Elysium.PackageStore")
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _iter_files(root: str):
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if not os.path.islink(path):
+                yield path
+
+
+@dataclass
+class LinkStats:
+    files: int = 0
+    linked: int = 0
+    new_objects: int = 0
+    bytes_linked: int = 0
+    skipped: int = 0
+
+
+@dataclass
+class UsageReport:
+    root: str
+    files: int = 0
+    logical_bytes: int = 0
+    physical_bytes: int = 0
+
+    @property
+    def deduplicated_bytes(self) -> int:
+        return self.logical_bytes - self.physical_bytes
+
+
+class PackageStore:
+    """
+    Files keyed by SHA-256 under ``cache/store/objects``, hardlinked into envs.
+
+    pip never edits installed files in place (upgrades delete and rewrite),
+    so sharing one inode between environments is safe. Files that already
+    have more than one link are assumed to be shared and are not rehashed,
+    which keeps repeat passes cheap. An existing object is re-hashed once
+    per pass before it is linked again, in case a linked file was edited by
+    hand; a mismatching object is replaced.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(get_cache_dir(), "store")
+        self.objects_dir = os.path.join(self.path, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def link_tree(self, root: str) -> LinkStats:
+        """Replace every regular file under ``root`` with a link to its store object."""
+        stats = LinkStats()
+        verified: set[str] = set()
+        for path in _iter_files(root):
+            stats.files += 1
+            try:
+                self._link_file(path, stats, verified)
+            except OSError as exc:
+                # Locked (loaded .pyd), cross-device or no hardlink support.
+                stats.skipped += 1
+                logger.debug("Not sharing %s: %s", path, exc)
+        if stats.linked or stats.new_objects:
+            logger.info(
+                "Linked %d of %d files under %s (%d new objects, %.1f MB shared)",
+                stats.linked, stats.files, root, stats.new_objects, stats.bytes_linked / (1024 * 1024),
+            )
+        return stats
+
+    def _link_file(self, path: str, stats: LinkStats, verified: set[str]) -> None:
+        st = os.stat(path)
+        if st.st_nlink > 1:
+            return
+        digest = _file_digest(path)
+        obj = self.object_path(digest)
+        try:
+            obj_stat = os.stat(obj)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            os.link(path, obj)
+            stats.new_objects += 1
+            return
+        if obj_stat.st_ino == st.st_ino and obj_stat.st_dev == st.st_dev:
+            return
+        if obj not in verified:
+            # A file edited in place inside some env changes the object too;
+            # never hand that content out under the original digest.
+            if obj_stat.st_size != st.st_size or _file_digest(obj) != digest:
+                logger.warning("Store object %s no longer matches its digest; replacing it", obj)
+                self._replace(path, obj)
+                stats.new_objects += 1
+                verified.add(obj)
+                return
+            verified.add(obj)
+        self._replace(obj, path)
+        stats.linked += 1
+        stats.bytes_linked += st.st_size
+
+    @staticmethod
+    def _replace(source: str, target: str) -> None:
+        """Atomically make ``target`` a hardlink to ``source``."""
+        tmp = f"{target}.{uuid.uuid4().hex}.tmp"
+        os.link(source, tmp)
+        try:
+            os.replace(tmp, target)
+        except OSError:
+            os.remove(tmp)
+            raise
+
+    def gc(self) -> int:
+        """Remove objects no environment links to any more; returns bytes freed."""
+        freed = 0
+        for path in list(_iter_files(self.objects_dir)):
+            try:
+                st = os.stat(path)
+                if st.st_nlink == 1:
+                    os.remove(path)
+                    freed += st.st_size
+            except OSError as exc:
+                logger.debug("Could not collect %s: %s", path, exc)
+        return freed
+
+
+def usage_report(root: str, seen: set[tuple[int, int]] | None = None) -> UsageReport:
+    """
+    Logical vs on-disk bytes under ``root``. Passing a shared ``seen`` set
+    across calls counts an inode only for the first tree that contains it.
+    """
+    seen = set() if seen is None else seen
+    report = UsageReport(root)
+    for path in _iter_files(root):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        report.files += 1
+        report.logical_bytes += st.st_size
+        key = (st.st_dev, st.st_ino)
+        if key not in seen:
+            seen.add(key)
+            report.physical_bytes += st.st_size
+    return report
+
+
+def _env_dirs(envs_dir: str) -> list[str]:
+    return sorted(
+        os.path.join(envs_dir, name)
+        for name in os.listdir(envs_dir)
+        if os.path.isdir(os.path.join(envs_dir, name))
+    )
+
+
+def _mb(value: int) -> str:
+    return f"{value / (1024 * 1024):.1f} MB"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m elysium.services.package_store")
+    parser.add_argument("command", choices=["report", "dedupe", "gc"])
+    args = parser.parse_args(argv)
+
+    store = PackageStore()
+    envs = _env_dirs(get_envs_dir())
+    if args.command == "dedupe":
+        for env in envs:
+            stats = store.link_tree(env)
+            print(f"{os.path.basename(env)}: {stats.linked} linked, {stats.new_objects} new objects, {stats.skipped} skipped")
+    elif args.command == "gc":
+        print(f"freed {_mb(store.gc())}")
+
+    seen: set[tuple[int, int]] = set()
+    total_logical = total_physical = 0
+    for env in envs:
+        report = usage_report(env, seen)
+        total_logical += report.logical_bytes
+        total_physical += report.physical_bytes
+        print(
+            f"{os.path.basename(env):<20} {report.files:>7} files  {_mb(report.logical_bytes):>10} "
+            f"logical  {_mb(report.physical_bytes):>10} unique"
+        )
+    print(
+        f"{'total':<20} {'':>13}  {_mb(total_logical):>10} logical  {_mb(total_physical):>10} unique  "
+        f"({_mb(total_logical - total_physical)} deduplicated)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
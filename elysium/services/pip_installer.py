@@ -0,0 +1,231 @@
+"""Batched pip installs with failure classification and targeted retries."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable
+
+from elysium.core import proc
+from elysium.core.cancel import cancelled
+
+logger = logging.getLogger("Elysium.PipInstaller")
+
+INSTALL_TIMEOUT_SECONDS = 1800
+
+
+class FailureKind(str, Enum):
+    NETWORK = "network"
+    SSL = "ssl"
+    BUILD = "build"
+    PERMISSION = "permission"
+    NOT_FOUND = "not found"
+    CANCELLED = "cancelled"
+    UNKNOWN = "unknown"
+
+
+# Checked in order; the first kind with a matching pattern wins. SSL comes
+# before NETWORK because certificate errors are usually wrapped in a retry
+# message that also looks like a connection problem.
+_FAILURE_PATTERNS: list[tuple[FailureKind, re.Pattern[str]]] = [
+    (FailureKind.SSL, re.compile(r"SSLError|CERTIFICATE_VERIFY_FAILED|certificate verify failed|SSL:", re.I)),
+    (
+        FailureKind.PERMISSION,
+        re.compile(r"PermissionError|Permission denied|Access is denied|\[WinError 5\]|EnvironmentError: \[Errno 13\]", re.I),
+    ),
+    (
+        FailureKind.NETWORK,
+        re.compile(
+            r"NewConnectionError|ConnectTimeout|ReadTimeout|Read timed out|ConnectionError|"
+            r"Temporary failure in name resolution|getaddrinfo failed|Network is unreachable|ProxyError",
+            re.I,
+        ),
+    ),
+    (
+        FailureKind.BUILD,
+        re.compile(
+            r"Failed building wheel|Failed to build|error: subprocess-exited-with-error|"
+            r"Microsoft Visual C\+\+|metadata-generation-failed|legacy-install-failure",
+            re.I,
+        ),
+    ),
+    (
+        FailureKind.NOT_FOUND,
+        re.compile(r"No matching distribution found|Could not find a version that satisfies", re.I),
+    ),
+]
+
+# One retry per failure kind; kinds without an entry are not retried because
+# repeating the same request cannot change the result.
+RETRY_STRATEGIES: dict[FailureKind, list[str]] = {
+    FailureKind.NETWORK: ["--retries", "10", "--timeout", "60"],
+    FailureKind.SSL: ["--trusted-host", "pypi.org", "--trusted-host", "files.pythonhosted.org"],
+    FailureKind.PERMISSION: ["--user"],
+    FailureKind.BUILD: ["--prefer-binary", "--no-cache-dir"],
+}
+
+
+def is_venv_python(python_exe: str) -> bool:
+    """True for a venv interpreter (``<venv>/bin/python`` or ``<venv>\\Scripts\\python.exe``)."""
+    return os.path.isfile(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(python_exe))), "pyvenv.cfg"))
+
+
+def classify_failure(output: str) -> FailureKind:
+    for kind, pattern in _FAILURE_PATTERNS:
+        if pattern.search(output):
+            return kind
+    return FailureKind.UNKNOWN
+
+
+def _canonical(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _requirement_name(requirement: str) -> str:
+    match = re.match(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)", requirement)
+    return _canonical(match.group(1)) if match else requirement.strip()
+
+
+@dataclass
+class InstallResult:
+    requested: list[str]
+    ok: bool = False
+    installed: dict[str, str] = field(default_factory=dict)
+    failure: FailureKind | None = None
+    attempts: list[list[str]] = field(default_factory=list)
+    output: str = ""
+
+    @property
+    def failed(self) -> list[str]:
+        return [] if self.ok else list(self.requested)
+
+    @property
+    def already_satisfied(self) -> list[str]:
+        """Requested packages pip did not need to touch (only known on success)."""
+        if not self.ok:
+            return []
+        return [req for req in self.requested if _requirement_name(req) not in self.installed]
+
+
+class PipInstaller:
+    """
+    Installs a batch of requirements with one pip process per attempt.
+
+    A failed attempt is classified from pip's output and retried at most
+    once per failure kind, always with every requested package in a single
+    call. Per-package results come from pip's ``--report`` JSON.
+    """
+
+    def __init__(
+        self,
+        python_exe: str | None = None,
+        *,
+        extra_args: list[str] | None = None,
+        on_output: Callable[[str], None] | None = None,
+    ):
+        self.python_exe = python_exe or sys.executable
+        self.extra_args = list(extra_args or [])
+        self.on_output = on_output
+        self._report_supported = True
+
+    def install(self, requirements: list[str]) -> InstallResult:
+        return self._install(list(requirements), list(requirements))
+
+    def install_file(self, requirements_file: str) -> InstallResult:
+        return self._install(["-r", requirements_file], [requirements_file])
+
+    def _install(self, target_args: list[str], requested: list[str]) -> InstallResult:
+        result = InstallResult(requested=requested)
+        if not target_args:
+            result.ok = True
+            return result
+
+        strategy: list[str] = []
+        tried: set[FailureKind] = set()
+        while True:
+            args = self.extra_args + strategy
+            result.attempts.append(args)
+            returncode, output, report = self._run(target_args, args)
+            result.output = output
+            if returncode == 0:
+                result.ok = True
+                result.failure = None
+                result.installed = _installed_from_report(report)
+                return result
+
+            kind = FailureKind.CANCELLED if cancelled() else classify_failure(output)
+            result.failure = kind
+            retry = self._retry_args(kind)
+            if retry is None or kind in tried:
+                logger.error("pip install failed (%s): %s", kind.value, " ".join(requested))
+                return result
+            tried.add(kind)
+            logger.warning("pip install failed (%s); retrying with %s", kind.value, " ".join(retry))
+            self._emit(f"Install failed ({kind.value}); retrying with {' '.join(retry)}...")
+            strategy = strategy + retry
+
+    def _retry_args(self, kind: FailureKind) -> list[str] | None:
+        if kind == FailureKind.PERMISSION and not self._user_install_allowed():
+            return None
+        return RETRY_STRATEGIES.get(kind)
+
+    def _user_install_allowed(self) -> bool:
+        # pip refuses --user inside a venv, and it conflicts with an explicit install location.
+        if any(arg.split("=", 1)[0] in ("--target", "-t", "--prefix") for arg in self.extra_args):
+            return False
+        return not is_venv_python(self.python_exe)
+
+    def _run(self, target_args: list[str], args: list[str]) -> tuple[int, str, dict | None]:
+        with tempfile.TemporaryDirectory(prefix="elysium-pip-") as tmp:
+            report_path = os.path.join(tmp, "report.json")
+            cmd = [self.python_exe, "-m", "pip", "install", "--disable-pip-version-check"]
+            if self._report_supported:
+                cmd += ["--report", report_path]
+            cmd += args + target_args
+            logger.info("Running command: %s", " ".join(cmd))
+            returncode, output = self._stream(cmd)
+
+            if returncode != 0 and self._report_supported and "no such option: --report" in output:
+                # pip < 22.2; fall back to plain installs without per-package detail.
+                self._report_supported = False
+                return self._run(target_args, args)
+
+            report = None
+            if os.path.isfile(report_path):
+                try:
+                    with open(report_path, encoding="utf-8") as f:
+                        report = json.load(f)
+                except (OSError, ValueError) as exc:
+                    logger.debug("Could not read pip report: %s", exc)
+            return returncode, output, report
+
+    def _stream(self, cmd: list[str]) -> tuple[int, str]:
+        result = proc.run(cmd, merge_stderr=True, timeout=INSTALL_TIMEOUT_SECONDS, on_stdout=self._emit)
+        if result.error:
+            return 1, result.error
+        output = "\n".join(line.rstrip() for line in result.stdout.splitlines() if line.strip())
+        if output:
+            logger.info("pip output:\n%s", output)
+        if result.timed_out or result.cancelled:
+            return 1, f"{output}\npip {result.describe()}".strip()
+        return result.returncode, output
+
+    def _emit(self, message: str) -> None:
+        if self.on_output is not None:
+            self.on_output(message)
+
+
+def _installed_from_report(report: dict | None) -> dict[str, str]:
+    installed: dict[str, str] = {}
+    for item in (report or {}).get("install", []):
+        meta = item.get("metadata") or {}
+        name, version = meta.get("name"), meta.get("version")
+        if name and version:
+            installed[_canonical(name)] = version
+    return installed
@@ -0,0 +1,345 @@
+"""Process enumeration and termination backends.
+
+psutil does the work in-process when it is installed; on Linux /proc is
+read directly. PowerShell (Get-CimInstance) is kept only as the Windows
+fallback because its cold start costs seconds.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import signal
+import sys
+import threading
+from dataclasses import dataclass, field
+
+from elysium.core.polling import wait_until
+from elysium.windows.powershell import run_ps_script
+
+logger = logging.getLogger("Elysium.ProcessBackend")
+
+try:
+    import psutil
+except ImportError:  # optional; see get_process_backend
+    psutil = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    pid: int
+    name: str = ""
+    cmdline: str = ""
+    ppid: int | None = None
+
+
+@dataclass(frozen=True)
+class ProcessMatch:
+    """Case-insensitive substring match on the command line, exact match on the image name."""
+
+    cmdline_contains: tuple[str, ...] = ()
+    names: tuple[str, ...] = ()
+
+    def matches(self, proc: ProcessInfo) -> bool:
+        cmdline = proc.cmdline.lower()
+        if cmdline and any(needle.lower() in cmdline for needle in self.cmdline_contains):
+            return True
+        return proc.name.lower() in {name.lower() for name in self.names}
+
+
+def process_tree(processes: list[ProcessInfo], roots: set[int]) -> list[int]:
+    """``roots`` plus all their descendants, deepest first so parents cannot respawn children."""
+    children: dict[int, list[int]] = {}
+    for proc in processes:
+        if proc.ppid is not None and proc.ppid != proc.pid:
+            children.setdefault(proc.ppid, []).append(proc.pid)
+    ordered: list[int] = []
+    seen: set[int] = set()
+
+    def visit(pid: int) -> None:
+        if pid in seen:
+            return
+        seen.add(pid)
+        for child in children.get(pid, []):
+            visit(child)
+        ordered.append(pid)
+
+    for root in sorted(roots):
+        visit(root)
+    return ordered
+
+
+ELYSIUM_PROCESSES = ProcessMatch(
+    cmdline_contains=("ELYSIUM.py", "elysium_launcher.py", "ElysiumLauncher.exe"),
+    names=("ElysiumLauncher.exe", "ELYSIUM.exe"),
+)
+
+
+class ProcessBackend:
+    name = "base"
+
+    def processes(self) -> list[ProcessInfo]:
+        raise NotImplementedError
+
+    def terminate(self, pids: list[int]) -> list[int]:
+        """Force-stop ``pids``; returns the ones that were signalled."""
+        raise NotImplementedError
+
+    def is_running(self, pid: int) -> bool:
+        return any(proc.pid == pid for proc in self.processes())
+
+    def wait_for_exit(self, pids: list[int], timeout: float) -> bool:
+        """Poll until every pid is gone; False if some outlived ``timeout``."""
+        remaining = set(pids)
+
+        def all_gone() -> bool:
+            remaining.difference_update([pid for pid in list(remaining) if not self.is_running(pid)])
+            return not remaining
+
+        return wait_until(all_gone, timeout)
+
+    def find(self, match: ProcessMatch, *, exclude: set[int] | None = None) -> list[ProcessInfo]:
+        exclude = exclude or set()
+        return [proc for proc in self.processes() if proc.pid not in exclude and match.matches(proc)]
+
+    def kill_matching(self, match: ProcessMatch, *, exclude: set[int] | None = None) -> list[ProcessInfo]:
+        victims = self.find(match, exclude=exclude)
+        if not victims:
+            return []
+        killed = set(self.terminate([proc.pid for proc in victims]))
+        return [proc for proc in victims if proc.pid in killed]
+
+
+class PsutilBackend(ProcessBackend):
+    name = "psutil"
+
+    def processes(self) -> list[ProcessInfo]:
+        found = []
+        for proc in psutil.process_iter(["pid", "ppid", "name", "cmdline"]):
+            info = proc.info
+            found.append(
+                ProcessInfo(
+                    pid=info["pid"],
+                    name=info.get("name") or "",
+                    cmdline=" ".join(info.get("cmdline") or []),
+                    ppid=info.get("ppid"),
+                )
+            )
+        return found
+
+    def is_running(self, pid: int) -> bool:
+        try:
+            return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+
+    def terminate(self, pids: list[int]) -> list[int]:
+        killed = []
+        for pid in pids:
+            try:
+                psutil.Process(pid).kill()
+                killed.append(pid)
+            except psutil.Error as exc:
+                logger.debug("Could not kill %s: %s", pid, exc)
+        return killed
+
+
+class ProcFsBackend(ProcessBackend):
+    """Linux /proc reader; used off Windows and in tests."""
+
+    name = "procfs"
+
+    def __init__(self, root: str = "/proc"):
+        self.root = root
+
+    def processes(self) -> list[ProcessInfo]:
+        found = []
+        try:
+            entries = os.listdir(self.root)
+        except OSError:
+            return found
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            proc = self._read(int(entry))
+            if proc is not None:
+                found.append(proc)
+        return found
+
+    def _read(self, pid: int) -> ProcessInfo | None:
+        base = os.path.join(self.root, str(pid))
+        try:
+            with open(os.path.join(base, "cmdline"), "rb") as f:
+                cmdline = f.read().replace(b"\0", b" ").decode(errors="replace").strip()
+            with open(os.path.join(base, "stat"), encoding="utf-8", errors="replace") as f:
+                stat = f.read()
+        except OSError:
+            return None  # exited or not ours to read
+        # "pid (comm) state ppid ..." where comm may itself contain spaces or parens.
+        name = stat[stat.find("(") + 1 : stat.rfind(")")]
+        fields = stat[stat.rfind(")") + 2 :].split()
+        ppid = int(fields[1]) if len(fields) > 1 and fields[1].isdigit() else None
+        return ProcessInfo(pid=pid, name=name, cmdline=cmdline, ppid=ppid)
+
+    def is_running(self, pid: int) -> bool:
+        try:
+            with open(os.path.join(self.root, str(pid), "stat"), encoding="utf-8", errors="replace") as f:
+                stat = f.read()
+        except OSError:
+            return False
+        # A killed child stays a zombie until its parent reaps it.
+        return stat[stat.rfind(")") + 2 :].split(" ", 1)[0] != "Z"
+
+    def terminate(self, pids: list[int]) -> list[int]:
+        killed = []
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGKILL)
+                killed.append(pid)
+            except OSError as exc:
+                logger.debug("Could not kill %s: %s", pid, exc)
+        return killed
+
+
+def _ps_quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+class PowerShellBackend(ProcessBackend):
+    """Get-CimInstance fallback for Windows machines without psutil."""
+
+    name = "powershell"
+
+    def __init__(self, timeout: int = 30):
+        self.timeout = timeout
+
+    def processes(self) -> list[ProcessInfo]:
+        result = run_ps_script(
+            "Get-CimInstance Win32_Process | "
+            "Select-Object ProcessId,ParentProcessId,Name,CommandLine | ConvertTo-Json -Compress",
+            timeout=self.timeout,
+        )
+        try:
+            rows = json.loads(result.stdout or "[]")
+        except json.JSONDecodeError:
+            logger.warning("Unexpected Get-CimInstance output: %s", (result.stderr or result.stdout)[:200])
+            return []
+        if isinstance(rows, dict):
+            rows = [rows]
+        return [
+            ProcessInfo(
+                pid=int(row["ProcessId"]),
+                name=row.get("Name") or "",
+                cmdline=row.get("CommandLine") or "",
+                ppid=row.get("ParentProcessId"),
+            )
+            for row in rows
+        ]
+
+    def terminate(self, pids: list[int]) -> list[int]:
+        if not pids:
+            return []
+        ids = ",".join(str(int(pid)) for pid in pids)
+        run_ps_script(f"Stop-Process -Id {ids} -Force -ErrorAction SilentlyContinue", timeout=self.timeout)
+        return list(pids)
+
+    def is_running(self, pid: int) -> bool:
+        return bool(self._running([pid]))
+
+    def wait_for_exit(self, pids: list[int], timeout: float) -> bool:
+        # One Wait-Process call instead of a full process scan per poll.
+        if not pids:
+            return True
+        seconds = math.ceil(timeout)
+        return not self._running(pids, wait_seconds=seconds if seconds > 0 else None)
+
+    def _running(self, pids: list[int], wait_seconds: int | None = None) -> set[int]:
+        """The pids of ``pids`` still alive, after waiting up to ``wait_seconds`` for them to exit."""
+        ids = ",".join(str(int(pid)) for pid in pids)
+        script = f"$ids = @({ids}); "
+        if wait_seconds:
+            script += f"Wait-Process -Id $ids -Timeout {wait_seconds} -ErrorAction SilentlyContinue; "
+        script += "Get-Process -Id $ids -ErrorAction SilentlyContinue | ForEach-Object { $_.Id }"
+        result = run_ps_script(script, timeout=self.timeout + (wait_seconds or 0))
+        if result.error or result.timed_out:
+            logger.debug("Could not check processes %s: %s", ids, result.describe())
+            return set(pids)
+        return {int(line) for line in (result.stdout or "").split() if line.isdigit()}
+
+    def kill_matching(self, match: ProcessMatch, *, exclude: set[int] | None = None) -> list[ProcessInfo]:
+        # One PowerShell start instead of two: filter and stop in the same script.
+        result = run_ps_script(self.kill_script(match, exclude or set()), timeout=self.timeout)
+        killed = []
+        for line in (result.stdout or "").splitlines():
+            pid, _, name = line.strip().partition("|")
+            if pid.isdigit():
+                killed.append(ProcessInfo(pid=int(pid), name=name))
+        return killed
+
+    @staticmethod
+    def kill_script(match: ProcessMatch, exclude: set[int]) -> str:
+        excluded = ",".join(str(int(pid)) for pid in sorted(exclude)) or "-1"
+        conditions = [f"$_.CommandLine -like {_ps_quote('*' + needle + '*')}" for needle in match.cmdline_contains]
+        cmdline_clause = f"($_.CommandLine -and ({' -or '.join(conditions)}))" if conditions else "$false"
+        names = ", ".join(_ps_quote(name) for name in match.names)
+        return (
+            f"$exclude = @({excluded}); "
+            "Get-CimInstance Win32_Process | Where-Object { "
+            f"$exclude -notcontains $_.ProcessId -and ({cmdline_clause} -or $_.Name -in @({names})) "
+            "} | ForEach-Object { "
+            "try { Stop-Process -Id $_.ProcessId -Force -ErrorAction Stop; "
+            "\"$($_.ProcessId)|$($_.Name)\" } catch {} "
+            "}"
+        )
+
+
+@dataclass
+class FakeBackend(ProcessBackend):
+    """In-memory process table for unit tests."""
+
+    table: list[ProcessInfo] = field(default_factory=list)
+    terminated: list[int] = field(default_factory=list)
+    name = "fake"
+
+    def processes(self) -> list[ProcessInfo]:
+        return list(self.table)
+
+    def terminate(self, pids: list[int]) -> list[int]:
+        live = {proc.pid for proc in self.table}
+        killed = [pid for pid in pids if pid in live]
+        self.terminated.extend(killed)
+        self.table = [proc for proc in self.table if proc.pid not in killed]
+        return killed
+
+
+def default_process_backend() -> ProcessBackend | None:
+    if psutil is not None:
+        return PsutilBackend()
+    if sys.platform != "win32" and os.path.isdir("/proc/self"):
+        return ProcFsBackend()
+    if sys.platform == "win32":
+        return PowerShellBackend()
+    return None
+
+
+_BACKEND: ProcessBackend | None = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def get_process_backend() -> ProcessBackend | None:
+    global _BACKEND
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            _BACKEND = default_process_backend()
+            if _BACKEND is not None:
+                logger.debug("Process backend: %s", _BACKEND.name)
+        return _BACKEND
+
+
+def set_process_backend(backend: ProcessBackend | None) -> None:
+    """Override the process-wide backend (tests, or to force the PowerShell path)."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        _BACKEND = backend
@@ -4,45 +4,52 @@ from __future__ import annotations
 
 import logging
 import os
-import time
 
 from elysium.core.paths import get_stop_flow_script_path, resolve_app_dir
+from elysium.core.polling import wait_until
 from elysium.services.app_registry import AppRegistry
+from elysium.services.flow_server import FLOW_SERVER_PORT, FlowLifecycle, FlowServerController
+from elysium.services.process_backend import (
+    ELYSIUM_PROCESSES,
+    PowerShellBackend,
+    ProcessBackend,
+    ProcessInfo,
+    get_process_backend,
+)
+from elysium.services.socket_table import port_in_use
 from elysium.windows.powershell import run_ps_file, run_ps_script
 from elysium.windows.process_flags import no_window_flags
 
 logger = logging.getLogger("Elysium.ProcessService")
 
+EXIT_DEADLINE_SECONDS = 3.0
+PORT_RELEASE_DEADLINE_SECONDS = 5.0
 
-def close_other_elysium_instances(current_pid: int | None = None) -> None:
-    import os as _os
 
-    pid = current_pid if current_pid is not None else _os.getpid()
-    ps_script = (
-        f"$current = {pid}; "
-        "Get-CimInstance Win32_Process | Where-Object { "
-        "$_.ProcessId -ne $current -and ("
-        "($_.CommandLine -and ("
-        "$_.CommandLine -like '*ELYSIUM.py*' -or "
-        "$_.CommandLine -like '*elysium_launcher.py*' -or "
-        "$_.CommandLine -like '*ElysiumLauncher.exe*'"
-        ")) -or $_.Name -in @('ElysiumLauncher.exe', 'ELYSIUM.exe')"
-        ") } | ForEach-Object { "
-        "try { Stop-Process -Id $_.ProcessId -Force -ErrorAction Stop } catch {} "
-        "}"
-    )
+def close_other_elysium_instances(
+    current_pid: int | None = None,
+    backend: ProcessBackend | None = None,
+) -> list[ProcessInfo]:
+    """Force-stop other launcher/ELYSIUM processes; returns the ones stopped."""
+    pid = current_pid if current_pid is not None else os.getpid()
+    backend = backend or get_process_backend()
+    if backend is None:
+        return []
     try:
-        result = run_ps_script(ps_script, timeout=30)
-        if result.stdout:
-            for line in result.stdout.strip().splitlines():
-                if line.strip():
-                    logger.info(line.strip())
+        killed = backend.kill_matching(ELYSIUM_PROCESSES, exclude={pid})
     except Exception as exc:
         logger.warning("Could not close other ELYSIUM instances: %s", exc)
-    time.sleep(0.5)
+        return []
+    for proc in killed:
+        logger.info("Stopped previous ELYSIUM process %s (%s)", proc.pid, proc.name or "?")
+    # File handles held by the old instance are released once it has exited.
+    if killed and not backend.wait_for_exit([proc.pid for proc in killed], EXIT_DEADLINE_SECONDS):
+        logger.warning("Previous ELYSIUM processes still running after %.0fs", EXIT_DEADLINE_SECONDS)
+    return killed
 
 
-def stop_flow_server(registry: AppRegistry | None = None) -> None:
+def stop_flow_server(registry: AppRegistry | None = None, *, keep_reusable: bool = True) -> None:
+    """Stop a stale Flow server; a healthy one from the current commit is kept unless told otherwise."""
     registry = registry or AppRegistry()
     flow = registry.get("flow")
     if not flow:
@@ -50,7 +57,26 @@ def stop_flow_server(registry: AppRegistry | None = None) -> None:
     flow_dir = resolve_app_dir(flow.id, flow.folder_name())
     if not os.path.isdir(os.path.join(flow_dir, "launcher")):
         return
+    if keep_reusable and FlowLifecycle(flow_dir).reusable():
+        logger.info("Keeping the running Flow server for reuse")
+        return
+
+    backend = get_process_backend()
+    if backend is not None and not isinstance(backend, PowerShellBackend):
+        logger.info("Stopping any stale Flow server processes")
+        try:
+            result = FlowServerController(flow_dir, backend=backend).stop(PORT_RELEASE_DEADLINE_SECONDS)
+        except Exception as exc:
+            logger.warning("Could not stop Flow server: %s", exc)
+            return
+        if not result.port_free:
+            logger.warning("Port %d still in use after stopping the Flow server", FLOW_SERVER_PORT)
+        return
+    _stop_flow_server_powershell(flow_dir)
 
+
+def _stop_flow_server_powershell(flow_dir: str) -> None:
+    """Fallback when only the PowerShell process backend is available."""
     stop_script = get_stop_flow_script_path()
     logger.info("Stopping any stale Flow server processes")
     try:
@@ -58,6 +84,8 @@ def stop_flow_server(registry: AppRegistry | None = None) -> None:
             result = run_ps_file(stop_script, ["-FlowDir", flow_dir], timeout=60)
             if result.stdout:
                 logger.info(result.stdout.strip())
+            if not result.ok:
+                logger.warning("stop-flow.ps1 failed: %s", result.describe())
         else:
             flow_escaped = flow_dir.replace("'", "''")
             ps_script = (
@@ -69,17 +97,18 @@ def stop_flow_server(registry: AppRegistry | None = None) -> None:
                 "$p = Get-Content $PidFile -EA SilentlyContinue; "
                 "if ($p) { Stop-Process -Id $p -Force -EA SilentlyContinue }; "
                 "Remove-Item $PidFile -Force -EA SilentlyContinue }; "
-                "1..4 | ForEach-Object { "
+                "1..30 | ForEach-Object { "
                 "$c = Get-NetTCPConnection -LocalPort $Port -State Listen -EA SilentlyContinue | Select -First 1; "
                 "if (-not $c) { return }; "
                 "Stop-Process -Id $c.OwningProcess -Force -EA SilentlyContinue; "
-                "Start-Sleep -Milliseconds 500 }; "
+                "Start-Sleep -Milliseconds 100 }; "
                 "if (Test-Path $ServerLog) { Remove-Item $ServerLog -Force -EA SilentlyContinue }"
             )
             run_ps_script(ps_script, timeout=60)
     except Exception as exc:
         logger.warning("Could not stop Flow server: %s", exc)
-    time.sleep(0.5)
+    if not wait_until(lambda: not port_in_use(FLOW_SERVER_PORT), PORT_RELEASE_DEADLINE_SECONDS):
+        logger.warning("Port %d still in use after stopping the Flow server", FLOW_SERVER_PORT)
 
 
 def patch_flow_launcher(flow_dir: str) -> None:
@@ -117,14 +146,3 @@ def patch_flow_launcher(flow_dir: str) -> None:
     except OSError as exc:
         logger.warning("Could not patch Flow launcher: %s", exc)
 
-
-def close_stale_application_state(current_pid: int | None = None) -> None:
-    close_other_elysium_instances(current_pid)
-    try:
-        registry = AppRegistry()
-        stop_flow_server(registry)
-        flow = registry.get("flow")
-        if flow:
-            patch_flow_launcher(resolve_app_dir(flow.id, flow.folder_name()))
-    except Exception as exc:
-        logger.warning("Deferred startup cleanup failed: %s", exc)
@@ -0,0 +1,140 @@
+"""Which process is listening on a TCP port.
+
+psutil is used when installed; Linux reads /proc/net/tcp directly and
+Windows without psutil parses ``netstat -ano`` (far cheaper than a
+PowerShell Get-NetTCPConnection start).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import sys
+from dataclasses import dataclass, field
+
+from elysium.core import proc
+
+logger = logging.getLogger("Elysium.SocketTable")
+
+try:
+    import psutil
+except ImportError:  # optional; see default_socket_table
+    psutil = None  # type: ignore[assignment]
+
+_TCP_LISTEN = "0A"
+
+
+def port_in_use(port: int, host: str = "127.0.0.1") -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.2)
+        return sock.connect_ex((host, port)) == 0
+
+
+class SocketTable:
+    name = "base"
+
+    def listening_pids(self, port: int) -> set[int]:
+        raise NotImplementedError
+
+
+class PsutilSocketTable(SocketTable):
+    name = "psutil"
+
+    def listening_pids(self, port: int) -> set[int]:
+        return {
+            conn.pid
+            for conn in psutil.net_connections(kind="tcp")
+            if conn.status == psutil.CONN_LISTEN and conn.laddr and conn.laddr.port == port and conn.pid
+        }
+
+
+def parse_proc_net_tcp(text: str, port: int) -> set[int]:
+    """Socket inodes listening on ``port`` in a /proc/net/tcp{,6} dump."""
+    inodes = set()
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 10 or fields[3] != _TCP_LISTEN:
+            continue
+        _address, _, port_hex = fields[1].rpartition(":")
+        if int(port_hex, 16) == port:
+            inodes.add(int(fields[9]))
+    return inodes
+
+
+class ProcNetSocketTable(SocketTable):
+    name = "procfs"
+
+    def __init__(self, root: str = "/proc"):
+        self.root = root
+
+    def listening_pids(self, port: int) -> set[int]:
+        inodes: set[int] = set()
+        for table in ("tcp", "tcp6"):
+            try:
+                with open(os.path.join(self.root, "net", table), encoding="ascii") as f:
+                    inodes |= parse_proc_net_tcp(f.read(), port)
+            except OSError:
+                continue
+        if not inodes:
+            return set()
+        targets = {f"socket:[{inode}]" for inode in inodes}
+        pids = set()
+        for entry in os.listdir(self.root):
+            if not entry.isdigit():
+                continue
+            fd_dir = os.path.join(self.root, entry, "fd")
+            try:
+                fds = os.listdir(fd_dir)
+            except OSError:
+                continue  # gone, or another user's process
+            for fd in fds:
+                try:
+                    if os.readlink(os.path.join(fd_dir, fd)) in targets:
+                        pids.add(int(entry))
+                        break
+                except OSError:
+                    continue
+        return pids
+
+
+def parse_netstat(text: str, port: int) -> set[int]:
+    """PIDs from ``netstat -ano -p TCP`` rows in LISTENING state on ``port``."""
+    pids = set()
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) < 5 or fields[0].upper() != "TCP" or fields[3].upper() != "LISTENING":
+            continue
+        _address, _, local_port = fields[1].rpartition(":")
+        if local_port.isdigit() and int(local_port) == port and fields[4].isdigit():
+            pids.add(int(fields[4]))
+    return pids
+
+
+class NetstatSocketTable(SocketTable):
+    name = "netstat"
+
+    def listening_pids(self, port: int) -> set[int]:
+        result = proc.run(["netstat", "-ano", "-p", "TCP"], timeout=10)
+        if not result.ok:
+            raise OSError(f"netstat failed: {result.describe()}")
+        return parse_netstat(result.stdout, port)
+
+
+@dataclass
+class FakeSocketTable(SocketTable):
+    listeners: dict[int, set[int]] = field(default_factory=dict)
+    name = "fake"
+
+    def listening_pids(self, port: int) -> set[int]:
+        return set(self.listeners.get(port, set()))
+
+
+def default_socket_table() -> SocketTable | None:
+    if psutil is not None:
+        return PsutilSocketTable()
+    if sys.platform != "win32" and os.path.isdir("/proc/net"):
+        return ProcNetSocketTable()
+    if sys.platform == "win32":
+        return NetstatSocketTable()
+    return None
@@ -0,0 +1,170 @@
+"""Persistent per-app update/launch state (SQLite under the cache dir)."""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass, fields
+
+from elysium.core.paths import get_cache_dir
+
+logger = logging.getLogger("Elysium.StateStore")
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS app_state (
+    app_id TEXT PRIMARY KEY,
+    commit_sha TEXT,
+    updated_at REAL,
+    remote_sha TEXT,
+    remote_checked_at REAL,
+    deps_hash TEXT,
+    installed INTEGER,
+    entry_mtime REAL,
+    last_launch_ok INTEGER,
+    last_launch_at REAL
+)
+"""
+
+
+@dataclass
+class AppStateRecord:
+    app_id: str
+    commit_sha: str | None = None
+    updated_at: float | None = None
+    remote_sha: str | None = None
+    remote_checked_at: float | None = None
+    deps_hash: str | None = None
+    installed: bool | None = None
+    entry_mtime: float | None = None
+    last_launch_ok: bool | None = None
+    last_launch_at: float | None = None
+
+    def remote_is_fresh(self, ttl: float, now: float | None = None) -> bool:
+        if not self.remote_sha or self.remote_checked_at is None:
+            return False
+        return (now if now is not None else time.time()) - self.remote_checked_at <= ttl
+
+
+_COLUMNS = [f.name for f in fields(AppStateRecord)]
+_BOOL_COLUMNS = {"installed", "last_launch_ok"}
+
+
+def _row_to_record(row: sqlite3.Row) -> AppStateRecord:
+    values = {}
+    for name in _COLUMNS:
+        value = row[name]
+        if name in _BOOL_COLUMNS and value is not None:
+            value = bool(value)
+        values[name] = value
+    return AppStateRecord(**values)
+
+
+class StateStore:
+    """
+    Small typed wrapper over a WAL-mode SQLite database.
+
+    Every write is a single transaction, so a crash mid-update leaves the
+    previous snapshot intact. A fresh connection is opened per call, which
+    keeps the store safe to use from update worker threads.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(get_cache_dir(), "state.db")
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _ensure_schema(self) -> None:
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            try:
+                self._create_schema()
+            except sqlite3.DatabaseError as exc:
+                logger.warning("State store %s is unreadable (%s); starting fresh", self.path, exc)
+                self._discard_corrupt_db()
+                self._create_schema()
+            self._initialized = True
+
+    def _create_schema(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _discard_corrupt_db(self) -> None:
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.replace(self.path + suffix, f"{self.path}{suffix}.corrupt")
+            except OSError:
+                pass
+
+    def get(self, app_id: str) -> AppStateRecord | None:
+        self._ensure_schema()
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM app_state WHERE app_id = ?", (app_id,)).fetchone()
+        return _row_to_record(row) if row else None
+
+    def all(self) -> dict[str, AppStateRecord]:
+        self._ensure_schema()
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT * FROM app_state").fetchall()
+        return {row["app_id"]: _row_to_record(row) for row in rows}
+
+    def update(self, app_id: str, **values) -> None:
+        """Upsert the given columns for ``app_id``, leaving the rest untouched."""
+        unknown = set(values) - set(_COLUMNS[1:])
+        if unknown:
+            raise ValueError(f"Unknown state fields: {', '.join(sorted(unknown))}")
+        if not values:
+            return
+        self._ensure_schema()
+        columns = list(values)
+        params = [app_id] + [
+            int(v) if k in _BOOL_COLUMNS and v is not None else v for k, v in values.items()
+        ]
+        sql = (
+            f"INSERT INTO app_state (app_id, {', '.join(columns)}) "
+            f"VALUES (?{', ?' * len(columns)}) "
+            f"ON CONFLICT(app_id) DO UPDATE SET "
+            + ", ".join(f"{c} = excluded.{c}" for c in columns)
+        )
+        with closing(self._connect()) as conn, conn:
+            conn.execute(sql, params)
+
+    def record_remote_head(self, app_id: str, sha: str) -> None:
+        self.update(app_id, remote_sha=sha, remote_checked_at=time.time())
+
+    def record_update(self, app_id: str, commit_sha: str | None) -> None:
+        self.update(app_id, commit_sha=commit_sha, updated_at=time.time())
+
+    def record_install_state(self, app_id: str, installed: bool, entry_mtime: float | None) -> None:
+        self.update(app_id, installed=installed, entry_mtime=entry_mtime)
+
+    def record_launch(self, app_id: str, ok: bool) -> None:
+        self.update(app_id, last_launch_ok=ok, last_launch_at=time.time())
+
+
+_STORE: StateStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_state_store() -> StateStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = StateStore()
+        return _STORE
@@ -1,75 +1,258 @@
-"""App and launcher update operations (service layer stub for Phase 2)."""
+"""
+App and launcher updates.
+
+``UpdateService.sync_app`` skips ``git pull`` when ``git ls-remote`` shows
+the checkout is current, caching remote HEADs in the state store for
+``remote_head_ttl_seconds``; ``update_apps`` syncs several apps in parallel
+with per-app cancellation and reports an ``UpdateOutcome`` for each.
+"""
 
 from __future__ import annotations
 
 import logging
 import os
-import subprocess
+import shutil
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from enum import Enum
 
+from elysium.core import proc
+from elysium.core.cancel import CancelScope, cancelled, use_token
 from elysium.core.models import AppDefinition
 from elysium.core.paths import get_repo_sync_dir
+from elysium.core.settings import get_setting
 from elysium.services.app_registry import AppRegistry
 from elysium.services.git_service import git_command, is_git_installed
-from elysium.windows.process_flags import no_window_flags
+from elysium.services.state_store import StateStore, get_state_store
 
 logger = logging.getLogger("Elysium.UpdateService")
 
+DEFAULT_MAX_PARALLEL_UPDATES = 4
+DEFAULT_UPDATE_TIMEOUT_SECONDS = 300
+DEFAULT_REMOTE_HEAD_TTL_SECONDS = 300
+PROBE_TIMEOUT_SECONDS = 30
+
+
+class UpdateOutcome(str, Enum):
+    CLONED = "cloned"
+    PULLED = "pulled"
+    UP_TO_DATE = "up to date"
+    UP_TO_DATE_CACHED = "up to date (cached)"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def ok(self) -> bool:
+        return self not in (UpdateOutcome.FAILED, UpdateOutcome.CANCELLED)
+
+
+def max_parallel_updates() -> int:
+    try:
+        return max(1, int(get_setting("max_parallel_updates", DEFAULT_MAX_PARALLEL_UPDATES)))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_PARALLEL_UPDATES
+
+
+def update_timeout_seconds() -> float | None:
+    value = get_setting("update_timeout_seconds", DEFAULT_UPDATE_TIMEOUT_SECONDS)
+    try:
+        timeout = float(value)
+    except (TypeError, ValueError):
+        return float(DEFAULT_UPDATE_TIMEOUT_SECONDS)
+    return timeout if timeout > 0 else None
+
+
+def remote_head_ttl_seconds() -> float:
+    try:
+        return max(0.0, float(get_setting("remote_head_ttl_seconds", DEFAULT_REMOTE_HEAD_TTL_SECONDS)))
+    except (TypeError, ValueError):
+        return float(DEFAULT_REMOTE_HEAD_TTL_SECONDS)
+
 
 class UpdateService:
-    def __init__(self, registry: AppRegistry | None = None):
+    def __init__(
+        self,
+        registry: AppRegistry | None = None,
+        state_store: StateStore | None = None,
+        *,
+        head_ttl: float | None = None,
+    ):
         self.registry = registry or AppRegistry()
+        self._state_store = state_store
+        self._head_ttl = head_ttl
+
+    @property
+    def state_store(self) -> StateStore:
+        if self._state_store is None:
+            self._state_store = get_state_store()
+        return self._state_store
+
+    @property
+    def head_ttl(self) -> float:
+        return remote_head_ttl_seconds() if self._head_ttl is None else self._head_ttl
 
     def pull_launcher_repo(self) -> bool:
         if not is_git_installed():
             return False
         base = get_repo_sync_dir()
         git_dir = os.path.join(base, ".git")
+        timeout = update_timeout_seconds()
         try:
             if os.path.isdir(git_dir):
-                result = subprocess.run(
-                    git_command("-C", base, "pull", "--ff-only"),
-                    capture_output=True,
-                    text=True,
-                    creationflags=no_window_flags(),
-                )
+                result = proc.run(git_command("-C", base, "pull", "--ff-only"), timeout=timeout)
             else:
                 parent = os.path.dirname(base)
                 folder = os.path.basename(base)
-                result = subprocess.run(
+                result = proc.run(
                     git_command("clone", "https://github.com/Protechas/Elysium.git", folder),
                     cwd=parent,
-                    capture_output=True,
-                    text=True,
-                    creationflags=no_window_flags(),
+                    timeout=timeout,
                 )
-            return result.returncode == 0
         except Exception as exc:
             logger.error("Launcher repo update failed: %s", exc)
             return False
+        if not result.ok:
+            logger.error("Launcher repo update failed: %s", result.describe())
+        return result.ok
 
-    def update_app(self, app: AppDefinition) -> bool:
+    def update_app(self, app: AppDefinition, *, timeout: float | None = None) -> bool:
         if not app.repo_url or not is_git_installed():
             return False
         app_dir = self.registry.app_install_dir(app)
+        cloning = not os.path.exists(app_dir) or not os.listdir(app_dir)
         try:
-            if not os.path.exists(app_dir) or not os.listdir(app_dir):
-                result = subprocess.run(
+            if cloning:
+                result = proc.run(
                     git_command(
                         "clone", "--depth", "1", "--single-branch",
                         app.repo_url, app_dir,
                     ),
-                    capture_output=True,
-                    text=True,
-                    creationflags=no_window_flags(),
+                    timeout=timeout,
                 )
             else:
-                result = subprocess.run(
+                result = proc.run(
                     git_command("-C", app_dir, "pull", "--depth", "1", "--no-tags"),
-                    capture_output=True,
-                    text=True,
-                    creationflags=no_window_flags(),
+                    timeout=timeout,
                 )
-            return result.returncode == 0
         except Exception as exc:
             logger.error("Update failed for %s: %s", app.name, exc)
             return False
+        if cloning and not result.ok:
+            # A killed clone leaves a half-written checkout that would be "pulled" next time.
+            shutil.rmtree(app_dir, ignore_errors=True)
+        if result.cancelled:
+            logger.info("Update cancelled for %s", app.name)
+        elif result.timed_out:
+            logger.error("Update timed out for %s after %ss", app.name, timeout)
+        elif not result.ok:
+            logger.error("Update failed for %s (%s): %s", app.name, result.describe(), result.stderr.strip()[-500:])
+        return result.ok
+
+    def _git_output(self, args: list[str], *, timeout: float | None) -> str | None:
+        try:
+            result = proc.run(git_command(*args), timeout=timeout)
+        except OSError as exc:
+            logger.debug("git %s failed: %s", " ".join(args), exc)
+            return None
+        if not result.ok:
+            logger.debug("git %s failed: %s", " ".join(args), result.describe())
+            return None
+        return result.stdout.strip()
+
+    def local_head(self, app_dir: str) -> str | None:
+        return self._git_output(["-C", app_dir, "rev-parse", "HEAD"], timeout=PROBE_TIMEOUT_SECONDS)
+
+    def remote_head(self, app_dir: str, *, timeout: float | None = PROBE_TIMEOUT_SECONDS) -> str | None:
+        output = self._git_output(["-C", app_dir, "ls-remote", "origin", "HEAD"], timeout=timeout)
+        if not output:
+            return None
+        return output.split()[0]
+
+    def sync_app(self, app: AppDefinition, *, timeout: float | None = None) -> UpdateOutcome:
+        """
+        Bring an app checkout up to date, skipping ``git pull`` when the
+        remote HEAD matches the local one. Remote HEADs are kept in the state
+        store for ``remote_head_ttl_seconds`` so relaunches inside that window
+        do no network work at all.
+        """
+        if not app.repo_url or not is_git_installed():
+            return UpdateOutcome.FAILED
+        app_dir = self.registry.app_install_dir(app)
+        if not os.path.exists(app_dir) or not os.listdir(app_dir):
+            if not self.update_app(app, timeout=timeout):
+                return UpdateOutcome.FAILED
+            self.state_store.record_update(app.id, self.local_head(app_dir))
+            return UpdateOutcome.CLONED
+
+        local = self.local_head(app_dir)
+        state = self.state_store.get(app.id)
+        if local and state and state.remote_sha == local and state.remote_is_fresh(self.head_ttl):
+            logger.info("%s is up to date (cached)", app.name)
+            return UpdateOutcome.UP_TO_DATE_CACHED
+
+        remote = self.remote_head(app_dir, timeout=min(timeout or PROBE_TIMEOUT_SECONDS, PROBE_TIMEOUT_SECONDS))
+        if remote:
+            self.state_store.record_remote_head(app.id, remote)
+        if remote and remote == local:
+            if not state or state.commit_sha != local:
+                self.state_store.record_update(app.id, local)
+            logger.info("%s is up to date", app.name)
+            return UpdateOutcome.UP_TO_DATE
+
+        if not self.update_app(app, timeout=timeout):
+            return UpdateOutcome.FAILED
+        self.state_store.record_update(app.id, self.local_head(app_dir) or remote)
+        logger.info("%s pulled", app.name)
+        return UpdateOutcome.PULLED
+
+    def update_apps(
+        self,
+        apps: list[AppDefinition],
+        *,
+        max_workers: int | None = None,
+        timeout: float | None = None,
+        cancel: CancelScope | None = None,
+        on_started: Callable[[AppDefinition], None] | None = None,
+        on_finished: Callable[[AppDefinition, UpdateOutcome], None] | None = None,
+    ) -> dict[str, UpdateOutcome]:
+        """
+        Update several apps concurrently with at most ``max_workers`` git
+        processes in flight. ``on_finished`` fires as each repo completes, so
+        total latency tracks the slowest pull rather than the sum of all pulls.
+
+        ``cancel`` holds a token per app id. Apps whose token is cancelled
+        before they start are skipped and left out of the returned mapping;
+        in-flight git processes are killed and report ``CANCELLED``.
+        """
+        if not apps:
+            return {}
+        workers = max(1, min(max_workers or max_parallel_updates(), len(apps)))
+
+        def run_one(app: AppDefinition) -> UpdateOutcome | None:
+            token = cancel.token(app.id) if cancel is not None else None
+            if token is not None and token.cancelled:
+                return None
+            if on_started:
+                on_started(app)
+            with use_token(token):
+                outcome = self.sync_app(app, timeout=timeout)
+                if outcome is UpdateOutcome.FAILED and cancelled():
+                    return UpdateOutcome.CANCELLED
+            return outcome
+
+        results: dict[str, UpdateOutcome] = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="elysium-update") as pool:
+            futures = {pool.submit(run_one, app): app for app in apps}
+            for future in as_completed(futures):
+                app = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as exc:
+                    logger.error("Update worker crashed for %s: %s", app.name, exc)
+                    outcome = UpdateOutcome.FAILED
+                if outcome is None:
+                    continue
+                results[app.id] = outcome
+                if on_finished:
+                    on_finished(app, outcome)
+        return results
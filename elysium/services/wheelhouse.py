@@ -0,0 +1,207 @@
+"""Shared local wheel cache for app environments.
+
+Usage: python -m elysium.services.wheelhouse {info,prune} [--max-mb N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from elysium.core import proc
+from elysium.core.paths import get_wheelhouse_dir
+from elysium.core.settings import get_setting
+from elysium.services.pip_installer import InstallResult, PipInstaller
+
+logger = logging.getLogger("Elysium.Wheelhouse")
+
+DEFAULT_MAX_MB = 2048
+POPULATE_TIMEOUT_SECONDS = 1800
+
+
+def wheelhouse_max_bytes() -> int:
+    try:
+        max_mb = float(get_setting("wheelhouse_max_mb", DEFAULT_MAX_MB))
+    except (TypeError, ValueError):
+        max_mb = DEFAULT_MAX_MB
+    return int(max(max_mb, 0) * 1024 * 1024)
+
+
+def _wheel_prefix(name: str, version: str) -> str:
+    # Wheel filenames escape runs of -_. in the project name to a single "_".
+    return f"{re.sub(r'[-_.]+', '_', name).lower()}-{version}-"
+
+
+@dataclass
+class WheelFile:
+    path: str
+    size: int
+    last_used: float
+
+
+class Wheelhouse:
+    """
+    Directory of built wheels consulted before the network.
+
+    LRU order is tracked with each wheel's mtime, which is bumped whenever an
+    install resolves to it (file atime is disabled on most Windows volumes).
+    """
+
+    def __init__(self, path: str | None = None, max_bytes: int | None = None):
+        self.path = path or get_wheelhouse_dir()
+        self.max_bytes = wheelhouse_max_bytes() if max_bytes is None else max_bytes
+        os.makedirs(self.path, exist_ok=True)
+
+    def offline_args(self) -> list[str]:
+        return ["--no-index", "--find-links", self.path]
+
+    def wheels(self) -> list[WheelFile]:
+        found = []
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".whl") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                found.append(WheelFile(entry.path, stat.st_size, stat.st_mtime))
+        return found
+
+    def total_bytes(self) -> int:
+        return sum(wheel.size for wheel in self.wheels())
+
+    def touch(self, installed: dict[str, str]) -> None:
+        """Mark the wheels for ``{name: version}`` as recently used."""
+        if not installed:
+            return
+        prefixes = tuple(_wheel_prefix(name, version) for name, version in installed.items())
+        now = time.time()
+        for wheel in self.wheels():
+            if os.path.basename(wheel.path).lower().startswith(prefixes):
+                try:
+                    os.utime(wheel.path, (now, now))
+                except OSError:
+                    pass
+
+    def populate(
+        self,
+        requirements_file: str,
+        python_exe: str | None = None,
+        *,
+        packages: list[str] | None = None,
+        source_args: list[str] | None = None,
+        on_output: Callable[[str], None] | None = None,
+    ) -> bool:
+        """Build or download wheels for ``requirements_file`` (or just ``packages``) into the cache."""
+        cmd = [
+            python_exe or sys.executable,
+            "-m",
+            "pip",
+            "wheel",
+            "--disable-pip-version-check",
+            "--wheel-dir",
+            self.path,
+            "--find-links",
+            self.path,
+            *(source_args or []),
+            *(packages or ["-r", requirements_file]),
+        ]
+        logger.info("Populating wheelhouse: %s", " ".join(cmd))
+        result = proc.run(cmd, timeout=POPULATE_TIMEOUT_SECONDS, on_stdout=on_output)
+        if result.error or result.timed_out:
+            logger.warning("pip wheel failed to run: %s", result.describe())
+            return False
+        if result.returncode != 0:
+            logger.warning("pip wheel failed: %s", result.stderr or result.stdout)
+            return False
+        return True
+
+    def install(
+        self,
+        requirements_file: str,
+        python_exe: str | None = None,
+        *,
+        packages: list[str] | None = None,
+        install_args: list[str] | None = None,
+        source_args: list[str] | None = None,
+        on_output: Callable[[str], None] | None = None,
+    ) -> InstallResult:
+        """
+        Install offline from the wheelhouse, filling it first if anything
+        is missing. ``packages`` restricts the install to those requirement
+        strings. A failed result means the caller should fall back to a
+        normal online install.
+        """
+        installer = PipInstaller(
+            python_exe,
+            extra_args=self.offline_args() + list(install_args or []),
+            on_output=on_output,
+        )
+
+        def attempt() -> InstallResult:
+            return installer.install(packages) if packages else installer.install_file(requirements_file)
+
+        result = attempt()
+        populated_since = None
+        if not result.ok:
+            logger.info("Wheelhouse is missing packages for %s; populating", requirements_file)
+            started = time.time()
+            if self.populate(
+                requirements_file, python_exe, packages=packages, source_args=source_args, on_output=on_output
+            ):
+                populated_since = started
+                result = attempt()
+        if result.ok:
+            self.touch(result.installed)
+        if populated_since is not None:
+            # Evict only once the installs are done, and never the wheels just built.
+            self.prune(keep={wheel.path for wheel in self.wheels() if wheel.last_used >= populated_since})
+        return result
+
+    def prune(self, max_bytes: int | None = None, *, keep: set[str] | None = None) -> list[str]:
+        """Delete least recently used wheels, except those in ``keep``, until the cache fits ``max_bytes``."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        wheels = sorted(self.wheels(), key=lambda wheel: wheel.last_used)
+        total = sum(wheel.size for wheel in wheels)
+        removed = []
+        for wheel in wheels:
+            if total <= limit:
+                break
+            if keep and wheel.path in keep:
+                continue
+            try:
+                os.remove(wheel.path)
+            except OSError as exc:
+                logger.debug("Could not evict %s: %s", wheel.path, exc)
+                continue
+            total -= wheel.size
+            removed.append(wheel.path)
+        if removed:
+            logger.info("Evicted %d wheels from %s", len(removed), self.path)
+        return removed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m elysium.services.wheelhouse")
+    parser.add_argument("command", choices=["info", "prune"])
+    parser.add_argument("--max-mb", type=float, default=None, help="size limit for prune (default: settings)")
+    args = parser.parse_args(argv)
+
+    wheelhouse = Wheelhouse()
+    if args.command == "prune":
+        max_bytes = None if args.max_mb is None else int(args.max_mb * 1024 * 1024)
+        removed = wheelhouse.prune(max_bytes)
+        for path in removed:
+            print(f"removed {os.path.basename(path)}")
+    wheels = wheelhouse.wheels()
+    size_mb = sum(wheel.size for wheel in wheels) / (1024 * 1024)
+    print(f"{wheelhouse.path}: {len(wheels)} wheels, {size_mb:.1f} MB (limit {wheelhouse.max_bytes / (1024 * 1024):.0f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,21 +4,31 @@ from __future__ import annotations
 
 import logging
 import os
+import sqlite3
+import time
 import webbrowser
 
 from PySide6.QtCore import QObject, Property, QThread, Signal, Slot, Qt
 
 from elysium import __version__
+from elysium.core.cancel import CancelScope
+from elysium.core.exceptions import EnvironmentNotReadyError
 from elysium.core.node_utils import ensure_nodejs_path, find_nodejs_bin_dir
 from elysium.core.paths import get_logs_dir, resolve_app_dir
-from elysium.core.settings import load_settings, save_settings, set_setting
+from elysium.core.settings import get_settings_store
+from elysium.core.timeline import get_startup_timer
 from elysium.services.app_registry import AppRegistry
 from elysium.services.diagnostics_service import export_diagnostics
+from elysium.services.env_prep_service import EnvState, get_env_prep_queue
 from elysium.services.environment_service import should_use_isolated_env
+from elysium.services.flow_server import FlowLifecycle
 from elysium.services.git_service import is_git_installed
 from elysium.services.launcher_service import LauncherService
-from elysium.services.process_service import close_stale_application_state, patch_flow_launcher, stop_flow_server
-from elysium.services.update_service import UpdateService
+from elysium.services.manifest_sources import resolve_manifest_path
+from elysium.services.cleanup_service import get_startup_cleanup
+from elysium.services.process_service import patch_flow_launcher, stop_flow_server
+from elysium.services.state_store import AppStateRecord, get_state_store
+from elysium.services.update_service import UpdateOutcome, UpdateService, update_timeout_seconds
 from elysium.ui.icon_utils import download_icon, resolve_icon_path, to_icon_url
 from elysium.ui.models import AppListModel
 from elysium.windows.titlebar import apply_native_title_bar_theme
@@ -39,10 +49,13 @@ class InitWorker(QThread):
 
     def run(self):
         try:
-            self.progress.emit("Closing previous sessions...", 15)
-            close_stale_application_state()
+            # Stale-state cleanup runs separately (StartupCleanup) so it never
+            # holds up the Home page.
             self.progress.emit("Preparing workspace...", 55)
-            AppRegistry()
+            with get_startup_timer().phase("manifest_sources"):
+                resolve_manifest_path(fetch=True)
+            with get_startup_timer().phase("app_registry_load"):
+                AppRegistry()
             self.progress.emit("Finishing setup...", 85)
         except Exception as exc:
             logger.warning("Init worker issue: %s", exc)
@@ -51,6 +64,7 @@ class InitWorker(QThread):
 
 class UpdateWorker(QThread):
     app_status = Signal(str, str)
+    app_outcome = Signal(str, str)
     all_finished = Signal()
 
     def __init__(self, app_ids: list[str] | None = None, parent=None):
@@ -58,6 +72,14 @@ class UpdateWorker(QThread):
         self.app_ids = app_ids
         self._registry = AppRegistry()
         self._updates = UpdateService(self._registry)
+        self._cancel = CancelScope()
+
+    def cancel(self) -> None:
+        """Skip apps not started yet and kill in-flight git processes."""
+        self._cancel.cancel_all()
+
+    def cancel_app(self, app_id: str) -> None:
+        self._cancel.cancel(app_id)
 
     def run(self):
         apps = self._registry.apps
@@ -66,12 +88,32 @@ class UpdateWorker(QThread):
         else:
             apps = [a for a in apps if a.repo_url]
 
-        for app in apps:
-            self.app_status.emit(app.id, "Updating")
-            ok = self._updates.update_app(app)
-            self.app_status.emit(app.id, status_after_git_update(self._registry, app, ok))
+        self._updates.update_apps(
+            apps,
+            timeout=update_timeout_seconds(),
+            cancel=self._cancel,
+            on_started=lambda app: self.app_status.emit(app.id, "Updating"),
+            on_finished=self._report_outcome,
+        )
         self.all_finished.emit()
 
+    def _report_outcome(self, app, outcome: UpdateOutcome) -> None:
+        self.app_outcome.emit(app.id, outcome.value)
+        if outcome is UpdateOutcome.CANCELLED:
+            status = "Ready" if self._registry.is_installed(app) else "Not installed"
+        else:
+            status = status_after_git_update(self._registry, app, outcome.ok)
+        self.app_status.emit(app.id, status)
+
+
+def summarize_update_outcomes(outcomes: dict[str, str]) -> str:
+    """Short "2 pulled, 6 up to date (cached)" summary for the status bar."""
+    counts: dict[str, int] = {}
+    for outcome in outcomes.values():
+        counts[outcome] = counts.get(outcome, 0) + 1
+    order = [o.value for o in UpdateOutcome]
+    return ", ".join(f"{counts[o]} {o}" for o in order if o in counts)
+
 
 class IconWorker(QThread):
     icon_ready = Signal(str, str)
@@ -93,7 +135,9 @@ class ElysiumBridge(QObject):
     initProgress = Signal(str, int)
     initFinished = Signal()
     darkModeChanged = Signal()
-    settingsChanged = Signal()
+    checkUpdatesOnStartupChanged = Signal()
+    useIsolatedEnvsChanged = Signal()
+    useQmlUiChanged = Signal()
     appStatusChanged = Signal(str, str)
     pageChanged = Signal(str)
     statusMessageChanged = Signal()
@@ -102,6 +146,11 @@ class ElysiumBridge(QObject):
     appViewModeChanged = Signal()
     bubbleModeChanged = Signal()
     bubbleMinimizeRequested = Signal()
+    envStateChanged = Signal(str, str)
+    cleanupFinished = Signal()
+    activateRequested = Signal()
+    instanceRequested = Signal(object)
+    settingReceived = Signal(str, object)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -110,7 +159,8 @@ class ElysiumBridge(QObject):
         self._updates = UpdateService(self._registry)
         self._apps_model = AppListModel(self)
         self._user_name = self._resolve_user_name()
-        settings = load_settings()
+        self._settings = get_settings_store()
+        settings = self._settings.all()
         self._dark_mode = settings.get("theme", "Dark") == "Dark"
         self._status_message = ""
         self._is_loading = True
@@ -126,9 +176,35 @@ class ElysiumBridge(QObject):
         self._window_height = int(settings.get("window_height", 680))
         self._window_x = settings.get("window_x")
         self._window_y = settings.get("window_y")
+        # Each property re-emits only for its own key, including edits made
+        # by another process and picked up from disk. Store callbacks run on
+        # whichever thread touched the store, so they only forward the change
+        # to the UI thread.
+        self.settingReceived.connect(self._apply_setting, Qt.QueuedConnection)
+        self._settings.subscribe("theme", self._on_theme_setting)
+        self._settings.subscribe("check_updates_on_startup", self._on_check_updates_setting)
+        self._settings.subscribe("use_isolated_envs", self._on_use_isolated_setting)
+        self._settings.subscribe("use_qml_ui", self._on_use_qml_ui_setting)
+        self._settings.subscribe("app_view_mode", self._on_app_view_mode_setting)
         self._icon_threads: list[IconWorker] = []
         self._init_thread: InitWorker | None = None
         self._update_thread: UpdateWorker | None = None
+        self._update_outcomes: dict[str, str] = {}
+        self._startup_timer = get_startup_timer()
+        self._first_update_started: float | None = None
+        self._first_update_timed = False
+        self._state = get_state_store()
+        self._snapshot: dict[str, AppStateRecord] = {}
+        self._env_queue = get_env_prep_queue()
+        # Called from the prep worker thread; the queued connection hops to the UI thread.
+        self._env_queue.on_state = lambda app_id, state: self.envStateChanged.emit(app_id, state.value)
+        self.envStateChanged.connect(self._on_env_state, Qt.QueuedConnection)
+        self._pending_requests: list[dict] = []
+        self._cleanup = get_startup_cleanup()
+        self._launch_after_cleanup: list[str] = []
+        self.cleanupFinished.connect(self._on_cleanup_finished, Qt.QueuedConnection)
+        self._cleanup.add_done_callback(self.cleanupFinished.emit)
+        self.instanceRequested.connect(self._on_instance_request, Qt.QueuedConnection)
 
     @Property(QObject, constant=True)
     def appsModel(self):
@@ -162,15 +238,15 @@ class ElysiumBridge(QObject):
     def searchText(self):
         return self._search_text
 
-    @Property(bool, notify=settingsChanged)
+    @Property(bool, notify=checkUpdatesOnStartupChanged)
     def checkUpdatesOnStartup(self):
         return self._check_updates
 
-    @Property(bool, notify=settingsChanged)
+    @Property(bool, notify=useIsolatedEnvsChanged)
     def useIsolatedEnvs(self):
         return self._use_isolated
 
-    @Property(bool, notify=settingsChanged)
+    @Property(bool, notify=useQmlUiChanged)
     def useQmlUi(self):
         return self._use_qml_ui
 
@@ -240,12 +316,53 @@ class ElysiumBridge(QObject):
             return "Not installed"
         return "Ready"
 
+    def _snapshot_status(self, app) -> str:
+        """Last known status from the state store, without touching the install dir."""
+        record = self._snapshot.get(app.id)
+        if record is None or record.installed is None:
+            return "Loading"
+        if app.requirements and app.requirements.node and not find_nodejs_bin_dir():
+            return "Needs Node"
+        return "Ready" if record.installed else "Not installed"
+
+    def _remember_install_state(self, app, status: str) -> None:
+        installed = status != "Not installed"
+        entry_mtime = None
+        if installed:
+            try:
+                entry_path = os.path.join(self._registry.app_install_dir(app), app.launch.entry)
+                entry_mtime = os.stat(entry_path).st_mtime
+            except OSError:
+                pass
+        record = self._snapshot.get(app.id)
+        if record and record.installed == installed and record.entry_mtime == entry_mtime:
+            return
+        try:
+            self._state.record_install_state(app.id, installed, entry_mtime)
+        except sqlite3.Error as exc:
+            logger.debug("Could not persist install state for %s: %s", app.id, exc)
+            return
+        if record is None:
+            record = self._snapshot[app.id] = AppStateRecord(app_id=app.id)
+        record.installed = installed
+        record.entry_mtime = entry_mtime
+
+    def _record_launch(self, app_id: str, ok: bool) -> None:
+        try:
+            self._state.record_launch(app_id, ok)
+        except sqlite3.Error as exc:
+            logger.debug("Could not persist launch outcome for %s: %s", app_id, exc)
+
     def _build_app_items(self) -> list[dict]:
         items = []
         for app in self._registry.apps:
             icon = resolve_icon_path(app, self._registry.install_root)
-            status = "Loading" if self._is_loading else self._app_status(app)
-            items.append(AppListModel.item_from_app(app, icon_path=icon, status=status))
+            status = self._snapshot_status(app) if self._is_loading else self._app_status(app)
+            items.append(
+                AppListModel.item_from_app(
+                    app, icon_path=icon, status=status, env_state=self._env_queue.state(app.id).value
+                )
+            )
         return items
 
     @Slot()
@@ -253,6 +370,15 @@ class ElysiumBridge(QObject):
         self._is_loading = True
         self._current_page = "loading"
         self.pageChanged.emit(self._current_page)
+        try:
+            self._snapshot = self._state.all()
+        except sqlite3.Error as exc:
+            logger.warning("State snapshot unavailable: %s", exc)
+            self._snapshot = {}
+        if self._snapshot:
+            self._apps_model.set_items(self._build_app_items())
+            self._emit_stats()
+        self._cleanup.start()
         self._init_thread = InitWorker(self)
         self._init_thread.progress.connect(self.initProgress.emit)
         self._init_thread.finished_ok.connect(self._on_init_complete)
@@ -267,8 +393,34 @@ class ElysiumBridge(QObject):
         self.pageChanged.emit(self._current_page)
         self.initFinished.emit()
         self._emit_stats()
+        self._startup_timer.mark("ui_ready")
+        self._startup_timer.save()
+        pending, self._pending_requests = self._pending_requests, []
+        for message in pending:
+            self._on_instance_request(message)
         if self._check_updates:
             self.updateAllApps()
+        else:
+            for app in self._registry.apps:
+                self._prepare_env(app)
+
+    def _on_cleanup_finished(self):
+        pending, self._launch_after_cleanup = self._launch_after_cleanup, []
+        for app_id in pending:
+            self.launchApp(app_id)
+
+    def post_instance_request(self, message: dict) -> None:
+        """Thread-safe entry for requests handed over by a second launch."""
+        self.instanceRequested.emit(message)
+
+    def _on_instance_request(self, message: dict):
+        self.activateRequested.emit()
+        if message.get("action") != "launch":
+            return
+        if self._is_loading:
+            self._pending_requests.append(message)
+            return
+        self.launchApp(message.get("app_id", ""))
 
     def _start_icon_downloads(self):
         for app in self._registry.apps:
@@ -291,6 +443,8 @@ class ElysiumBridge(QObject):
     def _refresh_statuses(self):
         for app in self._registry.apps:
             status = self._app_status(app)
+            if status != "Needs Node":
+                self._remember_install_state(app, status)
             self._apps_model.update_status(app.id, status)
             self.appStatusChanged.emit(app.id, status)
         self._emit_stats()
@@ -315,22 +469,41 @@ class ElysiumBridge(QObject):
             )
             return
 
+        if app.id == "flow" and not self._cleanup.done():
+            # Flow's server port and log file are what the startup cleanup frees.
+            self._cleanup.start()
+            if app_id not in self._launch_after_cleanup:
+                self._launch_after_cleanup.append(app_id)
+            self._set_status(f"{app.name} will launch once startup cleanup finishes")
+            return
+
         try:
             if app.id == "flow":
                 flow_dir = resolve_app_dir(app.id, app.folder_name())
-                patch_flow_launcher(flow_dir)
-                stop_flow_server(self._registry)
-                env = os.environ.copy()
-                ensure_nodejs_path(env)
-                self._launcher.launch(app.name, extra_env=env)
+                lifecycle = FlowLifecycle(flow_dir)
+                if lifecycle.reusable():
+                    lifecycle.open_client()
+                else:
+                    patch_flow_launcher(flow_dir)
+                    stop_flow_server(self._registry, keep_reusable=False)
+                    env = os.environ.copy()
+                    ensure_nodejs_path(env)
+                    self._launcher.launch(app.name, extra_env=env)
+                    lifecycle.record_launch()
             else:
                 self._launcher.launch(app.name)
 
             self._mark_app_status(app_id, "Ready")
+            self._record_launch(app_id, True)
             self.toastRequested.emit(f"Launching {app.name}...", "info")
             self._set_status(f"Launched {app.name}")
+        except EnvironmentNotReadyError as exc:
+            self._prepare_env(app)
+            self.toastRequested.emit(f"Preparing {app.name}'s environment...", "info")
+            self._set_status(exc.friendly_message)
         except Exception as exc:
             logger.error("Launch failed for %s: %s", app_id, exc, exc_info=True)
+            self._record_launch(app_id, False)
             self._mark_app_status(app_id, "Failed")
             self.errorOccurred.emit("Launch failed", str(exc))
 
@@ -349,11 +522,28 @@ class ElysiumBridge(QObject):
         self._set_status("Checking for updates...")
         self._run_update_worker(None)
 
+    @Slot(str)
+    def cancelUpdate(self, app_id: str):
+        if self._update_thread and self._update_thread.isRunning():
+            self._update_thread.cancel_app(app_id)
+        self._env_queue.cancel(app_id)
+
+    @Slot()
+    def cancelAll(self):
+        if self._update_thread and self._update_thread.isRunning():
+            self._update_thread.cancel()
+            self._set_status("Cancelling updates...")
+        self._env_queue.cancel_all()
+
     def _run_update_worker(self, app_ids: list[str] | None):
         if self._update_thread and self._update_thread.isRunning():
             return
+        self._update_outcomes = {}
+        if self._first_update_started is None:
+            self._first_update_started = time.monotonic()
         self._update_thread = UpdateWorker(app_ids, self)
         self._update_thread.app_status.connect(self._on_app_update_status)
+        self._update_thread.app_outcome.connect(self._on_app_update_outcome)
         self._update_thread.all_finished.connect(self._on_updates_finished)
         self._update_thread.start()
 
@@ -362,6 +552,29 @@ class ElysiumBridge(QObject):
         self.appStatusChanged.emit(app_id, status)
         self._emit_stats()
 
+    def _on_app_update_outcome(self, app_id: str, outcome: str):
+        self._update_outcomes[app_id] = outcome
+        app = self._registry.get(app_id)
+        if app is None:
+            return
+        if outcome == UpdateOutcome.CANCELLED.value:
+            return
+        changed = outcome in (UpdateOutcome.CLONED.value, UpdateOutcome.PULLED.value)
+        self._prepare_env(app, force=changed)
+
+    def _prepare_env(self, app, *, force: bool = False) -> None:
+        """Queue a background venv build unless the env is already known good."""
+        if not self._registry.is_installed(app):
+            return
+        if force or self._env_queue.state(app.id) != EnvState.READY:
+            self._env_queue.submit(app)
+
+    def _on_env_state(self, app_id: str, state: str):
+        self._apps_model.update_env_state(app_id, state)
+        if state == EnvState.FAILED.value:
+            error = self._env_queue.error(app_id) or "unknown error"
+            self._set_status(f"Environment setup failed for {app_id}: {error}")
+
     def _on_updates_finished(self):
         for app in self._registry.apps:
             if not app.repo_url:
@@ -369,8 +582,13 @@ class ElysiumBridge(QObject):
                 self._apps_model.update_status(app.id, status)
                 self.appStatusChanged.emit(app.id, status)
         self._emit_stats()
-        self._set_status("All updates completed!")
+        summary = summarize_update_outcomes(self._update_outcomes)
+        self._set_status(f"All updates completed! ({summary})" if summary else "All updates completed!")
         self.toastRequested.emit("Updates completed", "success")
+        if self._first_update_started is not None and not self._first_update_timed:
+            self._first_update_timed = True
+            self._startup_timer.record("first_update_pass", self._first_update_started)
+            self._startup_timer.save()
 
     @Slot(str)
     def openAppFolder(self, app_id: str):
@@ -403,36 +621,58 @@ class ElysiumBridge(QObject):
         self._settings_drawer_open = False
         self.settingsDrawerChanged.emit()
 
+    def _on_theme_setting(self, theme: str):
+        self.settingReceived.emit("theme", theme)
+
+    def _on_check_updates_setting(self, enabled: bool):
+        self.settingReceived.emit("check_updates_on_startup", enabled)
+
+    def _on_use_isolated_setting(self, enabled: bool):
+        self.settingReceived.emit("use_isolated_envs", enabled)
+
+    def _on_use_qml_ui_setting(self, enabled: bool):
+        self.settingReceived.emit("use_qml_ui", enabled)
+
+    def _on_app_view_mode_setting(self, mode: str):
+        self.settingReceived.emit("app_view_mode", mode)
+
+    def _apply_setting(self, key: str, value):
+        if key == "theme":
+            self._dark_mode = value == "Dark"
+            self.darkModeChanged.emit()
+        elif key == "check_updates_on_startup":
+            self._check_updates = value
+            self.checkUpdatesOnStartupChanged.emit()
+        elif key == "use_isolated_envs":
+            self._use_isolated = value
+            self.useIsolatedEnvsChanged.emit()
+        elif key == "use_qml_ui":
+            self._use_qml_ui = value
+            self.useQmlUiChanged.emit()
+        elif key == "app_view_mode":
+            self._app_view_mode = value
+            self.appViewModeChanged.emit()
+
     @Slot(str)
     def setAppViewMode(self, mode: str):
         mode = mode if mode in ("list", "grid") else "list"
-        self._app_view_mode = mode
-        set_setting("app_view_mode", mode)
-        self.appViewModeChanged.emit()
+        self._settings.set("app_view_mode", mode)
 
     @Slot(bool)
     def setTheme(self, dark: bool):
-        self._dark_mode = dark
-        set_setting("theme", "Dark" if dark else "Light")
-        self.darkModeChanged.emit()
+        self._settings.set("theme", "Dark" if dark else "Light")
 
     @Slot(bool)
     def setCheckUpdatesOnStartup(self, enabled: bool):
-        self._check_updates = enabled
-        set_setting("check_updates_on_startup", enabled)
-        self.settingsChanged.emit()
+        self._settings.set("check_updates_on_startup", enabled)
 
     @Slot(bool)
     def setUseIsolatedEnvs(self, enabled: bool):
-        self._use_isolated = enabled
-        set_setting("use_isolated_envs", enabled)
-        self.settingsChanged.emit()
+        self._settings.set("use_isolated_envs", enabled)
 
     @Slot(bool)
     def setUseQmlUi(self, enabled: bool):
-        self._use_qml_ui = enabled
-        set_setting("use_qml_ui", enabled)
-        self.settingsChanged.emit()
+        self._settings.set("use_qml_ui", enabled)
 
     @Slot()
     def updateElysium(self):
@@ -453,12 +693,8 @@ class ElysiumBridge(QObject):
 
     @Slot(int, int, int, int)
     def saveWindowGeometry(self, x: int, y: int, width: int, height: int):
-        settings = load_settings()
-        settings["window_x"] = x
-        settings["window_y"] = y
-        settings["window_width"] = width
-        settings["window_height"] = height
-        save_settings(settings)
+        # Called for every move/resize step; the store coalesces the writes.
+        self._settings.update({"window_x": x, "window_y": y, "window_width": width, "window_height": height})
 
     @Slot(QObject)
     def applyTitleBar(self, window: QObject):
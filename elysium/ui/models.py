@@ -18,6 +18,7 @@ class AppListModel(QAbstractListModel):
     TagsRole = Qt.UserRole + 6
     StatusBgRole = Qt.UserRole + 7
     StatusFgRole = Qt.UserRole + 8
+    EnvStateRole = Qt.UserRole + 9
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -34,6 +35,7 @@ class AppListModel(QAbstractListModel):
             self.TagsRole: b"tags",
             self.StatusBgRole: b"statusBg",
             self.StatusFgRole: b"statusFg",
+            self.EnvStateRole: b"envState",
         }
 
     def rowCount(self, parent=QModelIndex()):
@@ -61,6 +63,8 @@ class AppListModel(QAbstractListModel):
             return item["statusBg"]
         if role == self.StatusFgRole:
             return item["statusFg"]
+        if role == self.EnvStateRole:
+            return item["envState"]
         return None
 
     def _visible_items(self) -> list[dict]:
@@ -103,6 +107,14 @@ class AppListModel(QAbstractListModel):
                     self.dataChanged.emit(model_index, model_index, [role])
                 break
 
+    def update_env_state(self, app_id: str, env_state: str) -> None:
+        for idx, item in enumerate(self._items):
+            if item["id"] == app_id:
+                item["envState"] = env_state
+                model_index = self.index(idx)
+                self.dataChanged.emit(model_index, model_index, [self.EnvStateRole])
+                break
+
     def update_icon(self, app_id: str, icon_path: str) -> None:
         icon_url = to_icon_url(icon_path) if icon_path and not icon_path.startswith("file:") else icon_path
         for idx, item in enumerate(self._items):
@@ -124,6 +136,7 @@ class AppListModel(QAbstractListModel):
         *,
         icon_path: str,
         status: str,
+        env_state: str = "",
     ) -> dict:
         bg, fg = status_colors(status)
         return {
@@ -135,4 +148,5 @@ class AppListModel(QAbstractListModel):
             "tags": ", ".join(app.tags),
             "statusBg": bg,
             "statusFg": fg,
+            "envState": env_state,
         }
@@ -14,6 +14,7 @@ Item {
     property string statusText: "Ready"
     property color statusBg: "#1e293b"
     property color statusFg: "#94a3b8"
+    property string envState: ""
     property int cardIndex: 0
 
     implicitWidth: Theme.cardWidth
@@ -158,8 +159,10 @@ Item {
             anchors.fill: parent
             hoverEnabled: true
             acceptedButtons: Qt.LeftButton | Qt.RightButton
-            ToolTip.visible: root.visible && containsMouse && appDescription !== ""
-            ToolTip.text: appDescription
+            ToolTip.visible: root.visible && containsMouse && (appDescription !== "" || envState !== "")
+            ToolTip.text: envState === "preparing" ? "Preparing environment..."
+                : envState === "failed" ? "Environment setup failed"
+                : appDescription
             ToolTip.delay: 350
 
             onClicked: function(mouse) {
@@ -185,6 +188,11 @@ Item {
 
             MenuItem { text: "Launch"; onTriggered: Elysium.launchApp(appId) }
             MenuItem { text: "Update"; onTriggered: Elysium.updateApp(appId) }
+            MenuItem {
+                text: "Cancel update"
+                visible: statusText === "Updating"
+                onTriggered: Elysium.cancelUpdate(appId)
+            }
             MenuItem { text: "Open install folder"; onTriggered: Elysium.openAppFolder(appId) }
             MenuItem { text: "Export diagnostics"; onTriggered: Elysium.exportDiagnostics() }
             MenuSeparator {}
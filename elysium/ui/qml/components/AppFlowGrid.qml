@@ -45,6 +45,7 @@ ScrollView {
                 statusText: model.status
                 statusBg: model.statusBg
                 statusFg: model.statusFg
+                envState: model.envState
             }
         }
     }
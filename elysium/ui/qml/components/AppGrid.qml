@@ -31,6 +31,7 @@ Item {
                 statusText: model.status
                 statusBg: model.statusBg
                 statusFg: model.statusFg
+                envState: model.envState
             }
         }
     }
@@ -15,6 +15,7 @@ Item {
     property string statusText: "Ready"
     property color statusBg: "#1e293b"
     property color statusFg: "#94a3b8"
+    property string envState: ""
     property int rowIndex: 0
 
     implicitWidth: parent ? parent.width : 400
@@ -98,7 +99,9 @@ Item {
 
                 Text {
                     Layout.fillWidth: true
-                    text: appDescription || appTags
+                    text: envState === "preparing" ? "Preparing environment..."
+                        : envState === "failed" ? "Environment setup failed"
+                        : (appDescription || appTags)
                     font.family: Theme.fontFamily
                     font.pixelSize: 11
                     color: Theme.textMuted(darkMode)
@@ -168,6 +171,11 @@ Item {
             id: contextMenu
             MenuItem { text: "Launch"; onTriggered: Elysium.launchApp(appId) }
             MenuItem { text: "Update"; onTriggered: Elysium.updateApp(appId) }
+            MenuItem {
+                text: "Cancel update"
+                visible: statusText === "Updating"
+                onTriggered: Elysium.cancelUpdate(appId)
+            }
             MenuItem { text: "Open install folder"; onTriggered: Elysium.openAppFolder(appId) }
             MenuItem { text: "Export diagnostics"; onTriggered: Elysium.exportDiagnostics() }
             MenuSeparator {}
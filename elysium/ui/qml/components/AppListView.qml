@@ -34,5 +34,6 @@ ListView {
         statusText: model.status
         statusBg: model.statusBg
         statusFg: model.statusFg
+        envState: model.envState
     }
 }
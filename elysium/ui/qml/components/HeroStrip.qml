@@ -188,6 +188,40 @@ Item {
 
                     }
 
+
+
+                    Text {
+
+                        visible: Elysium.updatingAppCount > 0
+
+                        text: "Cancel"
+
+                        font.family: Theme.fontFamily
+
+                        font.pixelSize: 11
+
+                        font.underline: cancelArea.containsMouse
+
+                        color: Theme.textSecondary(darkMode)
+
+
+
+                        MouseArea {
+
+                            id: cancelArea
+
+                            anchors.fill: parent
+
+                            hoverEnabled: true
+
+                            cursorShape: Qt.PointingHandCursor
+
+                            onClicked: Elysium.cancelAll()
+
+                        }
+
+                    }
+
                 }
 
             }
@@ -107,6 +107,14 @@ ApplicationWindow {
         function onBubbleMinimizeRequested() {
             root.enterBubble()
         }
+        function onActivateRequested() {
+            if (root.bubbleMode)
+                root.exitBubble()
+            if (root.visibility === Window.Minimized)
+                root.showNormal()
+            root.raise()
+            root.requestActivate()
+        }
     }
 
     Shortcut {
@@ -2,22 +2,14 @@
 
 from __future__ import annotations
 
-import subprocess
+from elysium.core import proc
 
-from elysium.windows.process_flags import no_window_flags
 
+def run_ps_script(script: str, *, timeout: int = 60) -> proc.ProcResult:
+    return proc.run(["powershell", "-NoProfile", "-NonInteractive", "-Command", script], timeout=timeout)
 
-def run_ps_script(script: str, *, timeout: int = 60) -> subprocess.CompletedProcess[str]:
-    return subprocess.run(
-        ["powershell", "-NoProfile", "-NonInteractive", "-Command", script],
-        capture_output=True,
-        text=True,
-        timeout=timeout,
-        creationflags=no_window_flags(),
-    )
 
-
-def run_ps_file(script_path: str, args: list[str] | None = None, *, timeout: int = 60) -> subprocess.CompletedProcess[str]:
+def run_ps_file(script_path: str, args: list[str] | None = None, *, timeout: int = 60) -> proc.ProcResult:
     cmd = [
         "powershell",
         "-NoProfile",
@@ -29,10 +21,4 @@ def run_ps_file(script_path: str, args: list[str] | None = None, *, timeout: int
     ]
     if args:
         cmd.extend(args)
-    return subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        timeout=timeout,
-        creationflags=no_window_flags(),
-    )
+    return proc.run(cmd, timeout=timeout)
@@ -26,10 +26,11 @@ REQUIRED_PACKAGES = [
     "shiboken6==6.6.1",
     "requests",
     "openpyxl",
-    "setuptools",
+    "packaging",
     "platformdirs",
     "pydantic",
     "pyyaml",
+    "psutil",
 ]
 SPLASH_ICON_URL = (
     "https://raw.githubusercontent.com/Protechas/Elysium/main/ELYSIUM_icon.ico"
@@ -38,6 +39,7 @@ GIT_INSTALLER_URL = (
     "https://github.com/git-for-windows/git/releases/download/"
     "v2.42.0.windows.2/Git-2.42.0.2-64-bit.exe"
 )
+EXIT_DEADLINE_SECONDS = 3
 STORE_STUB = os.path.join(
     os.environ.get("LOCALAPPDATA", ""),
     "Microsoft",
@@ -169,11 +171,39 @@ def get_python_command():
     return find_python()
 
 
+def hand_off_to_running_instance():
+    """Ask an already-running ELYSIUM to show itself instead of restarting it."""
+    try:
+        repo_root = _get_repo_root()
+        if repo_root not in sys.path:
+            sys.path.insert(0, repo_root)
+        from elysium.core.single_instance import hand_off
+
+        return hand_off({"action": "show"})
+    except Exception:
+        return False
+
+
 def close_other_elysium_instances():
     current_pid = os.getpid()
+    try:
+        repo_root = _get_repo_root()
+        if repo_root not in sys.path:
+            sys.path.insert(0, repo_root)
+        from elysium.services.process_backend import ELYSIUM_PROCESSES, get_process_backend
+
+        backend = get_process_backend()
+        if backend is not None:
+            killed = backend.kill_matching(ELYSIUM_PROCESSES, exclude={current_pid})
+            if killed:
+                backend.wait_for_exit([proc.pid for proc in killed], EXIT_DEADLINE_SECONDS)
+            return
+    except Exception:
+        pass  # Package not synced yet, or the backend failed: use PowerShell directly.
+
     ps_script = (
         f"$current = {current_pid}; "
-        "Get-CimInstance Win32_Process | Where-Object { "
+        "$stopped = @(Get-CimInstance Win32_Process | Where-Object { "
         "$_.ProcessId -ne $current -and ("
         "($_.CommandLine -and ("
         "$_.CommandLine -like '*ELYSIUM.py*' -or "
@@ -181,8 +211,9 @@ def close_other_elysium_instances():
         "$_.CommandLine -like '*ElysiumLauncher.exe*'"
         ")) -or $_.Name -in @('ElysiumLauncher.exe', 'ELYSIUM.exe')"
         ") } | ForEach-Object { "
-        "Stop-Process -Id $_.ProcessId -Force -ErrorAction SilentlyContinue "
-        "}"
+        "Stop-Process -Id $_.ProcessId -Force -ErrorAction SilentlyContinue; $_.ProcessId "
+        "}); "
+        f"if ($stopped) {{ Wait-Process -Id $stopped -Timeout {EXIT_DEADLINE_SECONDS} -ErrorAction SilentlyContinue }}"
     )
     try:
         subprocess.run(
@@ -191,7 +222,6 @@ def close_other_elysium_instances():
             timeout=30,
             creationflags=no_window_flags(),
         )
-        time.sleep(0.5)
     except Exception:
         pass
 
@@ -199,6 +229,20 @@ def close_other_elysium_instances():
 def stop_flow_server():
     elysium_dir, _ = get_elysium_paths()
     flow_dir = os.path.join(elysium_dir, "Flow")
+    try:
+        repo_root = _get_repo_root()
+        if repo_root not in sys.path:
+            sys.path.insert(0, repo_root)
+        from elysium.services.flow_server import FlowServerController
+        from elysium.services.process_backend import PowerShellBackend, get_process_backend
+
+        backend = get_process_backend()
+        if backend is not None and not isinstance(backend, PowerShellBackend):
+            FlowServerController(flow_dir, backend=backend).stop()
+            return
+    except Exception:
+        pass  # Package not synced yet, or psutil missing: use stop-flow.ps1.
+
     stop_script = os.path.join(elysium_dir, "launcher", "stop-flow.ps1")
     if not os.path.isfile(stop_script):
         stop_script = resource_path(os.path.join("launcher", "stop-flow.ps1"))
@@ -488,7 +532,7 @@ def install_dependencies(python_cmd):
             "-c",
             "import importlib; "
             "[importlib.import_module(p) for p in "
-            "('PyQt5.QtCore','PySide6.QtCore','requests','openpyxl','pkg_resources','platformdirs','pydantic','yaml')]",
+            "('PyQt5.QtCore','PySide6.QtCore','requests','openpyxl','packaging','platformdirs','pydantic','yaml')]",
         ],
     )
     if check.returncode == 0:
@@ -529,6 +573,8 @@ def launch_elysium(python_cmd):
 
 def main():
     try:
+        if hand_off_to_running_instance():
+            return 0
         close_other_elysium_instances()
         show_starting_notice()
 
@@ -25,12 +25,14 @@ if (Test-Path $PidFile) {
     Remove-Item $PidFile -Force -ErrorAction SilentlyContinue
 }
 
-for ($i = 0; $i -lt 6; $i++) {
+# Poll until the port is free instead of sleeping a fixed amount.
+$deadline = (Get-Date).AddSeconds(3)
+while ((Get-Date) -lt $deadline) {
     $conn = Get-NetTCPConnection -LocalPort $Port -State Listen -ErrorAction SilentlyContinue |
         Select-Object -First 1
     if (-not $conn) { break }
     Stop-Process -Id $conn.OwningProcess -Force -ErrorAction SilentlyContinue
-    Start-Sleep -Milliseconds 500
+    Start-Sleep -Milliseconds 100
 }
 
 $flowPattern = [regex]::Escape($FlowDir)
@@ -46,10 +48,11 @@ Get-CimInstance Win32_Process |
         Stop-Process -Id $_.ProcessId -Force -ErrorAction SilentlyContinue
     }
 
-Start-Sleep -Milliseconds 500
-
-if (Test-Path $ServerLog) {
+# server.log stays locked until the killed node process has exited.
+$deadline = (Get-Date).AddSeconds(3)
+while ((Test-Path $ServerLog) -and ((Get-Date) -lt $deadline)) {
     Remove-Item $ServerLog -Force -ErrorAction SilentlyContinue
+    if (Test-Path $ServerLog) { Start-Sleep -Milliseconds 100 }
 }
 
 exit 0
@@ -0,0 +1,64 @@
+"""Compare requirement checks: pkg_resources.require loop vs the metadata index.
+
+Usage: python scripts/bench_dependency_check.py [requirements.txt] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _legacy_check(lines):
+    import pkg_resources
+    from pkg_resources import DistributionNotFound, VersionConflict
+
+    missing = []
+    for line in lines:
+        try:
+            pkg_resources.require(line)
+        except (DistributionNotFound, VersionConflict):
+            missing.append(line)
+    return missing
+
+
+def _index_check(lines):
+    from elysium.services.dependency_service import check_requirements
+
+    return check_requirements(lines).to_install()
+
+
+def _time(label, fn, repeat):
+    started = time.perf_counter()
+    result = fn()
+    first = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    warm = (time.perf_counter() - started) / max(repeat, 1)
+    print(f"{label:<22} first {first * 1000:8.1f} ms   warm {warm * 1000:8.2f} ms   unsatisfied={len(result)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("requirements", nargs="?", default="requirements.txt")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from elysium.services.dependency_service import read_requirements
+
+    lines = read_requirements(args.requirements)
+    print(f"{len(lines)} requirements from {args.requirements}")
+
+    # The metadata index runs first so it doesn't benefit from pkg_resources'
+    # own import-time scan having warmed the filesystem cache.
+    _time("importlib.metadata", lambda: _index_check(lines), args.repeat)
+    try:
+        _time("pkg_resources.require", lambda: _legacy_check(lines), args.repeat)
+    except ImportError:
+        print("pkg_resources not installed; skipping legacy comparison")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Time manifest loading and AppRegistry lookups on synthetic manifests.
+
+Usage: python scripts/bench_registry.py [--sizes 10,100,1000] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _write_manifest(path, count):
+    import yaml
+
+    apps = [
+        {
+            "id": f"app_{i}",
+            "name": f"App {i}",
+            "description": "Synthetic benchmark entry",
+            "repo_url": f"https://example.invalid/app_{i}.git",
+            "launch": {"type": "python", "entry": "main.py"},
+            "environment": {"type": "python", "requirements": "requirements.txt"},
+            "tags": [f"group_{i % 10}", "bench"],
+        }
+        for i in range(count)
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump({"apps": apps}, f)
+
+
+def _uncached_load(path, loader=None):
+    """What every AppRegistry() did before the shared cache."""
+    import yaml
+
+    from elysium.core.models import AppDefinition
+
+    with open(path, encoding="utf-8") as f:
+        data = yaml.load(f, Loader=loader or yaml.SafeLoader) or {}
+    return [AppDefinition.model_validate(item) for item in data.get("apps", [])]
+
+
+def _time(label, fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    each = (time.perf_counter() - started) / max(repeat, 1)
+    print(f"{label:<28} {each * 1e6:12.1f} us")
+
+
+def _bench_size(count, repeat):
+    import yaml
+
+    from elysium.services import app_registry
+    from elysium.services.app_registry import AppRegistry, clear_manifest_cache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        compiled_dir = os.path.join(tmp, "compiled")
+        app_registry.compiled_cache_dir = lambda: compiled_dir
+        path = os.path.join(tmp, "apps.yaml")
+        _write_manifest(path, count)
+        print(f"\n{count} apps in {os.path.getsize(path) / 1024:.0f} KiB manifest")
+
+        apps = _uncached_load(path)
+        last_id, last_name = apps[-1].id, apps[-1].name
+        slow = max(repeat // 4, 1)
+
+        _time("SafeLoader + validate", lambda: _uncached_load(path), slow)
+        if hasattr(yaml, "CSafeLoader"):
+            _time("CSafeLoader + validate", lambda: _uncached_load(path, yaml.CSafeLoader), slow)
+        else:
+            print("CSafeLoader unavailable (PyYAML built without libyaml)")
+
+        def compiled_miss():
+            clear_manifest_cache()
+            for name in os.listdir(compiled_dir) if os.path.isdir(compiled_dir) else ():
+                os.remove(os.path.join(compiled_dir, name))
+            AppRegistry(path)
+
+        def compiled_hit():
+            clear_manifest_cache()
+            AppRegistry(path)
+
+        _time("AppRegistry() compiled miss", compiled_miss, slow)
+        AppRegistry(path)
+        _time("AppRegistry() compiled hit", compiled_hit, repeat)
+        registry = AppRegistry(path)
+        _time("AppRegistry() warm", lambda: AppRegistry(path), repeat * 50)
+
+        lookups = repeat * 1000
+        _time("linear scan by id (last)", lambda: next(a for a in apps if a.id == last_id), repeat * 10)
+        _time("get(id)", lambda: registry.get(last_id), lookups)
+        _time("get_by_name(name)", lambda: registry.get_by_name(last_name), lookups)
+        _time("get_by_tag(tag)", lambda: registry.get_by_tag("group_3"), lookups)
+        clear_manifest_cache()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for count in (int(size) for size in args.sizes.split(",")):
+        _bench_size(count, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Time-to-splash benchmark for the legacy ELYSIUM.py entry point.
+
+Runs ELYSIUM.py under ``python -X importtime`` until the splash is shown,
+then checks that no heavy module was imported first and that total import
+time and wall time stay within the recorded baseline.
+
+Usage: python scripts/bench_startup.py [--runs N] [--update-baseline]
+Exit codes: 0 ok, 1 regression, 2 cannot run here (no PyQt5).
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY = os.path.join(REPO_ROOT, "ELYSIUM.py")
+BASELINE_PATH = os.path.join(REPO_ROOT, "scripts", "startup_baseline.json")
+SPLASH_MARKER = "ELYSIUM_SPLASH_SHOWN"
+
+# Modules that must not load before the splash is on screen.
+FORBIDDEN_BEFORE_SPLASH = (
+    "openpyxl",
+    "requests",
+    "pkg_resources",
+    "pydantic",
+    "yaml",
+    "elysium.services.",
+)
+# Allowed slack over the baseline before a run counts as a regression.
+TOLERANCE = 1.25
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> tuple[int, list[str]]:
+    """Return (top-level cumulative microseconds, imported module names)."""
+    total_us = 0
+    modules = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        _self_us, cumulative_us, indent, name = match.groups()
+        modules.append(name)
+        if len(indent) == 1:
+            total_us += int(cumulative_us)
+    return total_us, modules
+
+
+def forbidden_imports(modules: list[str]) -> list[str]:
+    return sorted(
+        {
+            name
+            for name in modules
+            for banned in FORBIDDEN_BEFORE_SPLASH
+            if name == banned or name.startswith(banned if banned.endswith(".") else banned + ".")
+        }
+    )
+
+
+def run_once() -> dict:
+    env = os.environ.copy()
+    env.update(
+        {
+            "ELYSIUM_DEV": "1",
+            "ELYSIUM_FORCE_LEGACY": "1",
+            "ELYSIUM_EXIT_AFTER_SPLASH": "1",
+        }
+    )
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", ENTRY],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    splash_ms = None
+    assert process.stdout is not None
+    for line in process.stdout:
+        if line.strip() == SPLASH_MARKER:
+            splash_ms = (time.perf_counter() - started) * 1000
+    stderr = process.stderr.read() if process.stderr else ""
+    process.wait()
+    if splash_ms is None:
+        raise RuntimeError(f"ELYSIUM.py exited ({process.returncode}) without showing the splash:\n{stderr[-2000:]}")
+    import_us, modules = parse_importtime(stderr)
+    return {"time_to_splash_ms": splash_ms, "import_us": import_us, "modules": modules}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    if importlib.util.find_spec("PyQt5") is None:
+        print("PyQt5 is not installed; the legacy splash cannot be measured here.")
+        return 2
+
+    runs = [run_once() for _ in range(max(args.runs, 1))]
+    result = {
+        "time_to_splash_ms": round(statistics.median(r["time_to_splash_ms"] for r in runs), 1),
+        "import_us": int(statistics.median(r["import_us"] for r in runs)),
+    }
+    print(f"time to splash {result['time_to_splash_ms']} ms, imports {result['import_us'] / 1000:.1f} ms")
+
+    failures = []
+    banned = forbidden_imports(runs[0]["modules"])
+    if banned:
+        failures.append(f"imported before the splash: {', '.join(banned)}")
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {BASELINE_PATH}")
+    elif os.path.isfile(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+        for key in ("time_to_splash_ms", "import_us"):
+            limit = baseline[key] * TOLERANCE
+            if result[key] > limit:
+                failures.append(f"{key} {result[key]} exceeds baseline {baseline[key]} (+{TOLERANCE - 1:.0%})")
+    else:
+        print("no baseline recorded; run with --update-baseline on a reference machine")
+
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""Helpers shared by several test modules."""
+
+from __future__ import annotations
+
+
+def install_dist(site_dir, name: str, version: str, requires: tuple[str, ...] = ()) -> None:
+    """Write a bare ``.dist-info`` so ``site_dir`` looks like it has ``name`` installed."""
+    dist_info = site_dir / f"{name}-{version}.dist-info"
+    dist_info.mkdir()
+    lines = ["Metadata-Version: 2.1", f"Name: {name}", f"Version: {version}"]
+    lines += [f"Requires-Dist: {req}" for req in requires]
+    (dist_info / "METADATA").write_text("\n".join(lines) + "\n", encoding="utf-8")
@@ -2,9 +2,24 @@
 
 from __future__ import annotations
 
+import os
+
+import pytest
+
+from elysium.core.models import AppDefinition
+from elysium.services import app_registry
 from elysium.services.app_registry import AppRegistry
 
 
+@pytest.fixture(autouse=True)
+def compiled_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "compiled"
+    monkeypatch.setattr(app_registry, "compiled_cache_dir", lambda: str(directory))
+    app_registry.clear_manifest_cache()
+    yield directory
+    app_registry.clear_manifest_cache()
+
+
 def test_registry_loads_all_apps():
     registry = AppRegistry()
     assert len(registry.apps) == 8
@@ -28,3 +43,82 @@ def test_flow_uses_script_launch():
     assert flow.launch.entry == "launcher/launch-flow.vbs"
     assert flow.requirements is not None
     assert flow.requirements.node is True
+
+
+def _write_manifest(path, apps, mtime_ns):
+    import yaml
+
+    path.write_text(yaml.safe_dump({"apps": apps}), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _entry(app_id, name, tags=()):
+    return {"id": app_id, "name": name, "launch": {"entry": f"{app_id}.py"}, "tags": list(tags)}
+
+
+def test_registries_share_one_parse_and_index_lookups(tmp_path, monkeypatch):
+    manifest = tmp_path / "apps.yaml"
+    _write_manifest(manifest, [_entry("a", "Alpha", ["x"]), _entry("b", "Beta", ["x", "y"])], 1_000_000_000)
+    parses = []
+    real_validate = AppDefinition.model_validate
+    monkeypatch.setattr(AppDefinition, "model_validate", lambda item: parses.append(item["id"]) or real_validate(item))
+
+    first = AppRegistry(str(manifest))
+    second = AppRegistry(str(manifest))
+
+    assert parses == ["a", "b"]
+    assert first.get("b") is second.get("b")
+    assert first.get_by_name("Alpha").id == "a"
+    assert [app.id for app in first.get_by_tag("x")] == ["a", "b"]
+    assert first.get("missing") is None and first.get_by_tag("missing") == []
+
+
+def test_changed_manifest_reloads_only_changed_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_registry, "RELOAD_CHECK_SECONDS", 0)
+    manifest = tmp_path / "apps.yaml"
+    _write_manifest(manifest, [_entry("a", "Alpha"), _entry("b", "Beta")], 1_000_000_000)
+    registry = AppRegistry(str(manifest))
+    alpha, beta = registry.get("a"), registry.get("b")
+
+    _write_manifest(manifest, [_entry("a", "Alpha"), _entry("b", "Beta 2"), _entry("c", "Gamma")], 2_000_000_000)
+
+    assert registry.get("a") is alpha
+    assert registry.get("b") is not beta and registry.get("b").name == "Beta 2"
+    assert registry.get_by_name("Beta") is None
+    assert [app.id for app in registry.apps] == ["a", "b", "c"]
+
+
+def test_missing_manifest_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        AppRegistry(str(tmp_path / "missing.yaml"))
+
+
+def test_compiled_snapshot_skips_yaml_and_validation(tmp_path, monkeypatch, compiled_dir):
+    manifest = tmp_path / "apps.yaml"
+    _write_manifest(manifest, [_entry("a", "Alpha", ["x"])], 1_000_000_000)
+    AppRegistry(str(manifest))
+    assert len(list(compiled_dir.glob("*.pickle"))) == 1
+
+    app_registry.clear_manifest_cache()
+    monkeypatch.setattr(app_registry.yaml, "load", lambda *a, **k: pytest.fail("YAML parsed on a cache hit"))
+    monkeypatch.setattr(AppDefinition, "model_validate", lambda item: pytest.fail("validated on a cache hit"))
+    registry = AppRegistry(str(manifest))
+    assert registry.get("a").name == "Alpha"
+    assert [app.id for app in registry.get_by_tag("x")] == ["a"]
+
+
+def test_corrupt_or_stale_compiled_snapshot_falls_back_to_yaml(tmp_path, monkeypatch, compiled_dir):
+    manifest = tmp_path / "apps.yaml"
+    _write_manifest(manifest, [_entry("a", "Alpha")], 1_000_000_000)
+    AppRegistry(str(manifest))
+    (compiled,) = compiled_dir.glob("*.pickle")
+    compiled.write_bytes(b"not a pickle")
+
+    app_registry.clear_manifest_cache()
+    assert AppRegistry(str(manifest)).get("a").name == "Alpha"
+
+    # A schema change keys a different snapshot.
+    monkeypatch.setattr(app_registry, "_schema_fingerprint", lambda: b"other-schema")
+    app_registry.clear_manifest_cache()
+    assert AppRegistry(str(manifest)).get("a").name == "Alpha"
+    assert len(list(compiled_dir.glob("*.pickle"))) == 2
@@ -166,3 +166,264 @@ def test_launch_success_clears_failed_status(qt_app, monkeypatch):
     bridge.launchApp("analyzer_plus")
 
     assert bridge._apps_model.data(bridge._apps_model.index(0), AppListModel.StatusRole) == "Ready"
+
+
+def test_summarize_update_outcomes(qt_app):
+    from elysium.ui.bridge import summarize_update_outcomes
+
+    summary = summarize_update_outcomes({
+        "dfr": "pulled",
+        "flow": "up to date (cached)",
+        "hyper": "up to date (cached)",
+    })
+    assert summary == "1 pulled, 2 up to date (cached)"
+    assert summarize_update_outcomes({}) == ""
+
+
+def test_start_init_renders_from_state_snapshot(qt_app, tmp_path, monkeypatch):
+    from elysium.services.state_store import StateStore
+    from elysium.ui.bridge import ElysiumBridge
+
+    bridge = ElysiumBridge()
+    store = StateStore(str(tmp_path / "state.db"))
+    store.record_install_state("dfr", True, 1.0)
+    store.record_install_state("hyper", False, None)
+    bridge._state = store
+    monkeypatch.setattr("elysium.ui.bridge.InitWorker.start", lambda self: None)
+
+    bridge.startInit()
+
+    statuses = {
+        bridge._apps_model.data(bridge._apps_model.index(row), AppListModel.IdRole):
+        bridge._apps_model.data(bridge._apps_model.index(row), AppListModel.StatusRole)
+        for row in range(bridge._apps_model.rowCount())
+    }
+    assert statuses["dfr"] == "Ready"
+    assert statuses["hyper"] == "Not installed"
+    assert statuses["combiner"] == "Loading"
+
+
+def test_update_env_state_refreshes_role_data(qt_app):
+    model = AppListModel()
+    model.set_items([
+        AppListModel.item_from_app(_sample_app("dfr", "DFR"), icon_path="", status="Ready"),
+    ])
+    assert model.data(model.index(0), AppListModel.EnvStateRole) == ""
+
+    model.update_env_state("dfr", "preparing")
+
+    assert model.data(model.index(0), AppListModel.EnvStateRole) == "preparing"
+    assert model.roleNames()[AppListModel.EnvStateRole] == b"envState"
+
+
+def test_launch_when_env_not_ready_queues_prep_instead_of_failing(qt_app, monkeypatch):
+    from elysium.core.exceptions import EnvironmentNotReadyError
+    from elysium.ui.bridge import ElysiumBridge
+
+    bridge = ElysiumBridge()
+    bridge._apps_model.set_items([
+        AppListModel.item_from_app(_sample_app("analyzer_plus", "Analyzer+"), icon_path="", status="Ready"),
+    ])
+
+    def not_ready(name, extra_env=None):
+        raise EnvironmentNotReadyError("analyzer_plus")
+
+    queued: list[str] = []
+    monkeypatch.setattr(bridge._launcher, "launch", not_ready)
+    monkeypatch.setattr(bridge, "_prepare_env", lambda app, force=False: queued.append(app.id))
+
+    bridge.launchApp("analyzer_plus")
+
+    assert queued == ["analyzer_plus"]
+    assert bridge._apps_model.data(bridge._apps_model.index(0), AppListModel.StatusRole) == "Ready"
+
+
+def test_instance_request_launches_after_init(qt_app, monkeypatch):
+    from elysium.ui.bridge import ElysiumBridge
+
+    bridge = ElysiumBridge()
+    launched = []
+    activations = []
+    monkeypatch.setattr(bridge, "launchApp", launched.append)
+    bridge.activateRequested.connect(lambda: activations.append(True))
+
+    bridge._is_loading = True
+    bridge._on_instance_request({"action": "launch", "app_id": "dfr"})
+    bridge._on_instance_request({"action": "show"})
+    assert launched == []
+    assert len(activations) == 2
+
+    bridge._is_loading = False
+    bridge._on_instance_request({"action": "launch", "app_id": "flow"})
+    assert launched == ["flow"]
+    assert bridge._pending_requests == [{"action": "launch", "app_id": "dfr"}]
+
+
+class _ColdFlow:
+    reuse = False
+    opened: list[str] = []
+    recorded: list[str] = []
+
+    def __init__(self, flow_dir):
+        self.flow_dir = flow_dir
+
+    def reusable(self):
+        return self.reuse
+
+    def open_client(self):
+        self.opened.append(self.flow_dir)
+
+    def record_launch(self):
+        self.recorded.append(self.flow_dir)
+
+
+def test_flow_launch_reuses_warm_server(qt_app, monkeypatch):
+    from elysium.services.cleanup_service import StartupCleanup
+    from elysium.ui.bridge import ElysiumBridge
+
+    class WarmFlow(_ColdFlow):
+        reuse = True
+        opened: list[str] = []
+        recorded: list[str] = []
+
+    bridge = ElysiumBridge()
+    flow = _sample_app("flow", "Flow")
+    monkeypatch.setattr(bridge._registry, "get", lambda app_id: flow if app_id == "flow" else None)
+    monkeypatch.setattr("elysium.ui.bridge.find_nodejs_bin_dir", lambda: "node")
+    monkeypatch.setattr("elysium.ui.bridge.FlowLifecycle", WarmFlow)
+    stopped = []
+    monkeypatch.setattr("elysium.ui.bridge.stop_flow_server", lambda registry, **kwargs: stopped.append(kwargs))
+    launched = []
+    monkeypatch.setattr(bridge._launcher, "launch", lambda name, extra_env=None: launched.append(name))
+    bridge._cleanup = StartupCleanup([])
+    bridge._cleanup.start()
+    assert bridge._cleanup.wait(timeout=5)
+
+    bridge.launchApp("flow")
+    assert len(WarmFlow.opened) == 1
+    assert launched == [] and stopped == [] and WarmFlow.recorded == []
+
+    WarmFlow.reuse = False
+    bridge.launchApp("flow")
+    assert launched == ["Flow"]
+    assert stopped == [{"keep_reusable": False}]
+    assert len(WarmFlow.recorded) == 1
+
+
+def test_flow_launch_waits_for_startup_cleanup(qt_app, monkeypatch):
+    from elysium.services.cleanup_service import CleanupStep, StartupCleanup
+    from elysium.ui.bridge import ElysiumBridge
+
+    bridge = ElysiumBridge()
+    flow = _sample_app("flow", "Flow")
+    monkeypatch.setattr(bridge._registry, "get", lambda app_id: flow if app_id == "flow" else None)
+    monkeypatch.setattr("elysium.ui.bridge.find_nodejs_bin_dir", lambda: "node")
+    launched = []
+    monkeypatch.setattr("elysium.ui.bridge.patch_flow_launcher", lambda flow_dir: None)
+    monkeypatch.setattr("elysium.ui.bridge.stop_flow_server", lambda registry, **kwargs: None)
+    monkeypatch.setattr("elysium.ui.bridge.FlowLifecycle", _ColdFlow)
+    monkeypatch.setattr(bridge._launcher, "launch", lambda name, extra_env=None: launched.append(name))
+
+    import threading
+
+    gate = threading.Event()
+    cleanup = StartupCleanup([CleanupStep("hold", lambda: gate.wait(5))])
+    bridge._cleanup = cleanup
+    cleanup.add_done_callback(bridge.cleanupFinished.emit)
+
+    bridge.launchApp("flow")
+    assert launched == []
+    assert bridge._launch_after_cleanup == ["flow"]
+
+    gate.set()
+    assert cleanup.wait(timeout=5)
+    qt_app.processEvents()
+    assert launched == ["Flow"]
+
+
+def test_cancel_slots_reach_update_worker_and_env_queue(qt_app, monkeypatch):
+    from elysium.ui.bridge import ElysiumBridge
+
+    bridge = ElysiumBridge()
+    calls = []
+
+    class RunningWorker:
+        def isRunning(self):
+            return True
+
+        def cancel_app(self, app_id):
+            calls.append(("worker", app_id))
+
+        def cancel(self):
+            calls.append(("worker", "*"))
+
+    bridge._update_thread = RunningWorker()
+    monkeypatch.setattr(bridge._env_queue, "cancel", lambda app_id: calls.append(("env", app_id)))
+    monkeypatch.setattr(bridge._env_queue, "cancel_all", lambda: calls.append(("env", "*")))
+
+    bridge.cancelUpdate("dfr")
+    bridge.cancelAll()
+    assert calls == [("worker", "dfr"), ("env", "dfr"), ("worker", "*"), ("env", "*")]
+
+
+def test_cancelled_update_does_not_prepare_env(qt_app, monkeypatch):
+    from elysium.services.update_service import UpdateOutcome
+    from elysium.ui.bridge import ElysiumBridge
+
+    bridge = ElysiumBridge()
+    app = _sample_app("dfr", "DFR")
+    monkeypatch.setattr(bridge._registry, "get", lambda app_id: app)
+    prepared = []
+    monkeypatch.setattr(bridge, "_prepare_env", lambda app, force=False: prepared.append(app.id))
+
+    bridge._on_app_update_outcome("dfr", UpdateOutcome.CANCELLED.value)
+    assert prepared == []
+    assert bridge._update_outcomes == {"dfr": "cancelled"}
+
+
+def test_setting_setters_emit_only_their_own_signal(qt_app, tmp_path, monkeypatch):
+    from elysium.core import settings as settings_module
+    from elysium.ui.bridge import ElysiumBridge
+
+    monkeypatch.setattr(settings_module, "get_settings_path", lambda: str(tmp_path / "settings.json"))
+    bridge = ElysiumBridge()
+    emitted = []
+    for name in ("darkModeChanged", "checkUpdatesOnStartupChanged", "useIsolatedEnvsChanged", "useQmlUiChanged"):
+        getattr(bridge, name).connect(lambda name=name: emitted.append(name))
+
+    bridge.setTheme(False)
+    bridge.setTheme(False)
+    bridge.setUseIsolatedEnvs(True)
+    settings_module.get_settings_store().flush()
+    QCoreApplication.processEvents()
+
+    assert emitted == ["darkModeChanged", "useIsolatedEnvsChanged"]
+    assert bridge.darkMode is False and bridge.useIsolatedEnvs is True
+
+
+def test_setting_changes_seen_on_a_worker_thread_reach_qml_on_the_ui_thread(qt_app, tmp_path, monkeypatch):
+    import json
+    import os
+    import threading
+
+    from elysium.core import settings as settings_module
+    from elysium.ui.bridge import ElysiumBridge
+
+    path = tmp_path / "settings.json"
+    monkeypatch.setattr(settings_module, "get_settings_path", lambda: str(path))
+    monkeypatch.setattr(settings_module, "RELOAD_CHECK_SECONDS", 0)
+    bridge = ElysiumBridge()
+    threads = []
+    bridge.darkModeChanged.connect(lambda: threads.append(threading.current_thread()))
+
+    # Another process switches the theme; a worker is the first to notice.
+    path.write_text(json.dumps({"theme": "Light"}), encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    worker = threading.Thread(target=lambda: settings_module.get_setting("theme"), name="worker")
+    worker.start()
+    worker.join()
+    assert threads == []
+
+    QCoreApplication.processEvents()
+    assert threads == [threading.main_thread()]
+    assert bridge.darkMode is False
@@ -0,0 +1,65 @@
+"""Tests for cancellation tokens and cancellable subprocess runs."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+
+from elysium.core import proc
+from elysium.core.cancel import CancelScope, CancelToken, cancelled, current_token, use_token
+
+SLEEPER = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+
+def test_callbacks_fire_once_and_children_follow_parent():
+    parent = CancelToken()
+    child = CancelToken(parent)
+    fired = []
+    remove = child.add_callback(lambda: fired.append("child"))
+    parent.cancel()
+    parent.cancel()
+    assert child.cancelled and fired == ["child"]
+    remove()
+    child.add_callback(lambda: fired.append("late"))  # already cancelled: runs now
+    assert fired == ["child", "late"]
+
+
+def test_scope_cancels_one_key_or_everything():
+    scope = CancelScope()
+    scope.cancel("dfr")
+    assert scope.token("dfr").cancelled
+    assert not scope.token("flow").cancelled
+    scope.cancel_all()
+    assert scope.token("flow").cancelled and scope.token("new").cancelled
+
+
+def test_use_token_is_ambient_per_thread():
+    token = CancelToken()
+    seen = []
+    with use_token(token):
+        assert current_token() is token
+        worker = threading.Thread(target=lambda: seen.append(current_token()))
+        worker.start()
+        worker.join()
+        token.cancel()
+        assert cancelled()
+    assert current_token() is None and seen == [None]
+
+
+def test_cancel_kills_running_child_promptly():
+    token = CancelToken()
+    threading.Timer(0.2, token.cancel).start()
+    started = time.monotonic()
+    result = proc.run(SLEEPER, cancel=token, timeout=30)
+    assert result.cancelled and not result.ok and not result.timed_out
+    assert time.monotonic() - started < 2
+    assert result.describe() == "cancelled"
+
+
+def test_cancelled_token_never_starts_a_child():
+    token = CancelToken()
+    token.cancel()
+    with use_token(token):
+        result = proc.run(SLEEPER)
+    assert result.cancelled and result.returncode is None and result.duration == 0.0
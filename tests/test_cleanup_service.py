@@ -0,0 +1,91 @@
+"""Tests for the background startup cleanup pipeline."""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+
+from elysium.core.polling import wait_until
+from elysium.services import process_service
+from elysium.services.cleanup_service import CleanupStep, StartupCleanup
+from elysium.services.process_backend import FakeBackend, ProcessInfo
+
+
+def test_steps_run_in_order_off_the_calling_thread():
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(("slow", threading.current_thread().name))
+        release.wait(5)
+
+    cleanup = StartupCleanup([CleanupStep("slow", slow), CleanupStep("fast", lambda: calls.append(("fast", "")))])
+    started = time.monotonic()
+    cleanup.start()
+    assert time.monotonic() - started < 0.5
+    assert not cleanup.done()
+    assert not cleanup.wait(timeout=0.05)
+
+    release.set()
+    assert cleanup.wait(timeout=5)
+    assert [name for name, _ in calls] == ["slow", "fast"]
+    assert calls[0][1] == "startup-cleanup"
+
+
+def test_failing_step_does_not_stop_the_rest():
+    ran = []
+
+    def boom():
+        raise OSError("powershell missing")
+
+    cleanup = StartupCleanup([CleanupStep("boom", boom), CleanupStep("after", lambda: ran.append(True))])
+    cleanup.start()
+    assert cleanup.wait(timeout=5)
+    assert ran == [True]
+    assert cleanup.errors == {"boom": "powershell missing"}
+
+
+def test_done_callback_fires_once_and_start_is_idempotent():
+    fired = []
+    cleanup = StartupCleanup([CleanupStep("noop", lambda: None)])
+    cleanup.add_done_callback(lambda: fired.append(True))
+    first = cleanup.start()
+    assert cleanup.start() is first
+    assert cleanup.wait(timeout=5)
+    assert wait_until(lambda: fired == [True], timeout=1)
+    cleanup.add_done_callback(lambda: fired.append(True))  # already done: runs now
+    assert fired == [True, True]
+
+
+def test_wait_until_honours_deadline():
+    started = time.monotonic()
+    assert not wait_until(lambda: False, timeout=0.1, interval=0.02)
+    assert 0.1 <= time.monotonic() - started < 0.5
+    ticks = iter([False, False, True])
+    assert wait_until(lambda: next(ticks), timeout=1, interval=0.01)
+
+
+def test_port_in_use():
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        port = server.getsockname()[1]
+        assert process_service.port_in_use(port)
+    assert not process_service.port_in_use(port)
+
+
+def test_close_other_instances_polls_for_exit_instead_of_sleeping():
+    class SlowExit(FakeBackend):
+        polls = 0
+
+        def is_running(self, pid):
+            self.polls += 1
+            return self.polls < 3
+
+    backend = SlowExit([ProcessInfo(5, "ELYSIUM.exe")])
+    started = time.monotonic()
+    killed = process_service.close_other_elysium_instances(current_pid=1, backend=backend)
+    assert [proc.pid for proc in killed] == [5]
+    assert backend.polls == 3
+    assert time.monotonic() - started < 0.5
@@ -0,0 +1,137 @@
+"""Tests for dependency checks and the requirements fingerprint cache."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from elysium.services import dependency_service
+from elysium.services.state_store import StateStore
+from tests.helpers import install_dist
+
+
+@pytest.fixture
+def store(tmp_path):
+    return StateStore(str(tmp_path / "state.db"))
+
+
+@pytest.fixture
+def site_dir(tmp_path):
+    path = tmp_path / "site-packages"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def requirements(tmp_path):
+    path = tmp_path / "requirements.txt"
+    path.write_text("requests>=2\nopenpyxl\n", encoding="utf-8")
+    return path
+
+
+def _fingerprint(requirements, site_dir, python_exe="python"):
+    return dependency_service.requirements_fingerprint(
+        str(requirements), python_exe=python_exe, site_dirs=[str(site_dir)]
+    )
+
+
+def test_fingerprint_stable_when_nothing_changes(requirements, site_dir):
+    assert _fingerprint(requirements, site_dir) == _fingerprint(requirements, site_dir)
+
+
+def test_fingerprint_changes_with_requirements(requirements, site_dir):
+    before = _fingerprint(requirements, site_dir)
+    requirements.write_text("requests>=2\n", encoding="utf-8")
+    assert _fingerprint(requirements, site_dir) != before
+
+
+def test_fingerprint_changes_with_interpreter(requirements, site_dir):
+    assert _fingerprint(requirements, site_dir, "a/python") != _fingerprint(requirements, site_dir, "b/python")
+
+
+def test_fingerprint_changes_when_site_packages_changes(requirements, site_dir):
+    before = _fingerprint(requirements, site_dir)
+    (site_dir / "newpkg-1.0.dist-info").mkdir()
+    stat = os.stat(site_dir)
+    os.utime(site_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert _fingerprint(requirements, site_dir) != before
+
+
+def test_fingerprint_missing_file_is_none(tmp_path, site_dir):
+    assert _fingerprint(tmp_path / "missing.txt", site_dir) is None
+
+
+def test_satisfied_cache_round_trip(requirements, site_dir, store):
+    fingerprint = _fingerprint(requirements, site_dir)
+    assert not dependency_service.is_fingerprint_satisfied("dfr", fingerprint, store)
+
+    dependency_service.record_satisfied("dfr", fingerprint, store)
+
+    assert dependency_service.is_fingerprint_satisfied("dfr", fingerprint, store)
+    assert not dependency_service.is_fingerprint_satisfied("hyper", fingerprint, store)
+    assert not dependency_service.is_fingerprint_satisfied("dfr", None, store)
+
+
+@pytest.fixture
+def index(site_dir):
+    install_dist(site_dir, "Requests", "2.31.0", ("PySocks>=1.5; extra == 'socks'",))
+    install_dist(site_dir, "openpyxl", "3.0.0")
+    return dependency_service.DistributionIndex([str(site_dir)])
+
+
+def test_index_normalizes_names(index):
+    assert index.version("requests") == "2.31.0"
+    assert index.version("REQUESTS") == "2.31.0"
+    assert index.version("numpy") is None
+
+
+def test_check_requirements_reports_missing_and_conflicting(index):
+    result = dependency_service.check_requirements(
+        ["requests>=2", "openpyxl>=3.1", "numpy", "not a requirement!"], index
+    )
+
+    assert result.satisfied == ["requests>=2"]
+    assert [issue.name for issue in result.missing] == ["numpy"]
+    assert [(issue.name, issue.installed_version) for issue in result.conflicting] == [("openpyxl", "3.0.0")]
+    assert result.invalid == ["not a requirement!"]
+    assert result.to_install() == ["numpy", "openpyxl>=3.1"]
+    assert not result.ok
+
+
+def test_check_requirements_skips_non_matching_markers(index):
+    result = dependency_service.check_requirements(['numpy; python_version < "3"'], index)
+    assert result.ok
+    assert result.satisfied == []
+
+
+def test_check_requirements_checks_extras(index, site_dir):
+    result = dependency_service.check_requirements(["requests[socks]"], index)
+    assert result.to_install() == ["PySocks>=1.5"]
+
+    install_dist(site_dir, "PySocks", "1.7.1")
+    index = dependency_service.DistributionIndex([str(site_dir)])
+    assert dependency_service.check_requirements(["requests[socks]"], index).satisfied == ["requests[socks]"]
+
+
+def test_read_requirements_strips_comments_and_options(tmp_path):
+    (tmp_path / "base.txt").write_text("openpyxl\n", encoding="utf-8")
+    path = tmp_path / "requirements.txt"
+    path.write_text(
+        "# header\n--index-url https://example.com\nrequests>=2  # http\n\n-r base.txt\n",
+        encoding="utf-8",
+    )
+    assert dependency_service.read_requirements(str(path)) == ["requests>=2", "openpyxl"]
+
+
+def test_distribution_index_is_shared_until_site_packages_changes(index, site_dir):
+    dependency_service.invalidate_distribution_index()
+    first = dependency_service.get_distribution_index([str(site_dir)])
+    assert dependency_service.get_distribution_index([str(site_dir)]) is first
+
+    install_dist(site_dir, "numpy", "1.26.0")
+    stat = os.stat(site_dir)
+    os.utime(site_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    refreshed = dependency_service.get_distribution_index([str(site_dir)])
+    assert refreshed is not first
+    assert refreshed.version("numpy") == "1.26.0"
@@ -0,0 +1,149 @@
+"""Tests for background isolated-env preparation."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+
+import pytest
+
+from elysium.core import proc
+from elysium.core.exceptions import EnvironmentNotReadyError
+from elysium.core.models import AppDefinition, AppLaunchConfig, AppLaunchType
+from elysium.services import env_prep_service, environment_service
+from elysium.services.env_prep_service import EnvPrepQueue, EnvState
+
+
+class FakeRegistry:
+    def app_install_dir(self, app):
+        return f"/apps/{app.id}"
+
+
+def _app(app_id: str, launch_type: AppLaunchType = AppLaunchType.PYTHON) -> AppDefinition:
+    return AppDefinition(id=app_id, name=app_id.upper(), launch=AppLaunchConfig(type=launch_type, entry="main.py"))
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(env_prep_service, "should_use_isolated_env", lambda app_id: app_id != "shared")
+
+
+def test_submit_reports_preparing_then_ready():
+    states: list[tuple[str, EnvState]] = []
+    seen: list[tuple[str, str]] = []
+    queue = EnvPrepQueue(
+        FakeRegistry(),
+        prepare=lambda app_id, app_dir: seen.append((app_id, app_dir)) or True,
+        on_state=lambda app_id, state: states.append((app_id, state)),
+    )
+
+    assert queue.submit(_app("dfr")).result(timeout=5) == EnvState.READY
+    assert queue.state("dfr") == EnvState.READY
+    assert seen == [("dfr", "/apps/dfr")]
+    assert states == [("dfr", EnvState.PREPARING), ("dfr", EnvState.READY)]
+
+
+def test_failures_are_recorded():
+    def boom(app_id, app_dir):
+        raise RuntimeError("venv creation failed")
+
+    queue = EnvPrepQueue(FakeRegistry(), prepare=boom)
+    assert queue.submit(_app("dfr")).result(timeout=5) == EnvState.FAILED
+    assert queue.error("dfr") == "venv creation failed"
+
+    queue = EnvPrepQueue(FakeRegistry(), prepare=lambda app_id, app_dir: False)
+    queue.submit(_app("dfr")).result(timeout=5)
+    assert queue.state("dfr") == EnvState.FAILED
+
+
+def test_duplicate_submits_share_one_build():
+    release = threading.Event()
+    calls: list[str] = []
+
+    def slow(app_id, app_dir):
+        calls.append(app_id)
+        release.wait(5)
+        return True
+
+    queue = EnvPrepQueue(FakeRegistry(), prepare=slow)
+    first = queue.submit(_app("dfr"))
+    assert queue.submit(_app("dfr")) is first
+    assert queue.state("dfr") == EnvState.PREPARING
+    release.set()
+    first.result(timeout=5)
+    assert calls == ["dfr"]
+
+
+def test_cancel_kills_running_build_and_drops_queued_one():
+    states: list[tuple[str, EnvState]] = []
+
+    def build(app_id, app_dir):
+        result = proc.run([sys.executable, "-c", "import time; time.sleep(30)"])
+        return result.ok
+
+    queue = EnvPrepQueue(FakeRegistry(), prepare=build, on_state=lambda app_id, state: states.append((app_id, state)))
+    running = queue.submit(_app("dfr"))
+    queued = queue.submit(_app("tools"))
+    time.sleep(0.2)
+
+    started = time.monotonic()
+    assert queue.cancel("tools")
+    assert queue.cancel("dfr")
+    assert running.result(timeout=5) == EnvState.UNKNOWN
+    assert time.monotonic() - started < 3
+    assert queued.cancelled()
+    assert queue.state("dfr") == queue.state("tools") == EnvState.UNKNOWN
+    assert queue.error("dfr") is None
+    assert ("tools", EnvState.UNKNOWN) in states
+    assert not queue.cancel("dfr")
+
+    queue = EnvPrepQueue(FakeRegistry(), prepare=lambda app_id, app_dir: True)
+    assert queue.submit(_app("dfr")).result(timeout=5) == EnvState.READY
+
+
+def test_apps_without_isolated_env_are_skipped():
+    queue = EnvPrepQueue(FakeRegistry(), prepare=lambda app_id, app_dir: True)
+    assert queue.submit(_app("shared")) is None
+    assert queue.submit(_app("flow", AppLaunchType.SCRIPT)) is None
+    assert queue.state("shared") == EnvState.UNKNOWN
+
+
+def test_resolve_python_never_builds_missing_env(monkeypatch, tmp_path):
+    monkeypatch.setattr(environment_service, "should_use_isolated_env", lambda app_id: True)
+    monkeypatch.setattr(environment_service, "get_venv_python", lambda app_id: str(tmp_path / "python"))
+    monkeypatch.setattr(environment_service, "ensure_venv", lambda app_id: pytest.fail("must not build"))
+
+    with pytest.raises(EnvironmentNotReadyError):
+        environment_service.resolve_python_for_app("dfr", str(tmp_path))
+
+    (tmp_path / "python").write_text("", encoding="utf-8")
+    assert environment_service.resolve_python_for_app("dfr", str(tmp_path)) == str(tmp_path / "python")
+
+
+def test_resolve_python_requires_a_matching_requirements_stamp(monkeypatch, tmp_path):
+    python_exe = tmp_path / "python"
+    python_exe.write_text("", encoding="utf-8")
+    site_dir = tmp_path / "site-packages"
+    site_dir.mkdir()
+    app_dir = tmp_path / "app"
+    app_dir.mkdir()
+    (app_dir / "requirements.txt").write_text("requests\n", encoding="utf-8")
+    monkeypatch.setattr(environment_service, "should_use_isolated_env", lambda app_id: True)
+    monkeypatch.setattr(environment_service, "get_venv_python", lambda app_id: str(python_exe))
+    monkeypatch.setattr(environment_service, "get_venv_site_packages", lambda app_id: str(site_dir))
+    monkeypatch.setattr(environment_service, "resolve_app_env_dir", lambda app_id: str(tmp_path))
+
+    with pytest.raises(EnvironmentNotReadyError):
+        environment_service.resolve_python_for_app("dfr", str(app_dir))
+    assert environment_service.resolve_python_for_app("dfr", str(app_dir), ready=True) == str(python_exe)
+
+    fingerprint = environment_service.requirements_fingerprint(
+        str(app_dir / "requirements.txt"), str(python_exe), [str(site_dir)]
+    )
+    environment_service._write_stamp("dfr", fingerprint, ["requests"])
+    assert environment_service.resolve_python_for_app("dfr", str(app_dir)) == str(python_exe)
+
+    (app_dir / "requirements.txt").write_text("requests\nnumpy\n", encoding="utf-8")
+    with pytest.raises(EnvironmentNotReadyError):
+        environment_service.resolve_python_for_app("dfr", str(app_dir))
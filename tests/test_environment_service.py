@@ -0,0 +1,71 @@
+"""Tests for requirements-delta installs into isolated envs."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from elysium.services import environment_service
+from elysium.services.pip_installer import InstallResult
+from tests.helpers import install_dist
+
+
+def _bump_mtime(path) -> None:
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    env_dir = tmp_path / "envs" / "dfr"
+    site_dir = env_dir / "site-packages"
+    site_dir.mkdir(parents=True)
+    install_dist(site_dir, "requests", "2.31.0")
+    calls: list[list[str] | None] = []
+
+    class FakeWheelhouse:
+        def install(self, requirements_file, python_exe=None, *, packages=None, **kwargs):
+            calls.append(packages)
+            for line in packages or []:
+                install_dist(site_dir, line.split("=")[0], "1.0")
+            _bump_mtime(site_dir)
+            return InstallResult(requested=packages or [requirements_file], ok=True)
+
+    monkeypatch.setattr(environment_service, "resolve_app_env_dir", lambda app_id: str(env_dir))
+    monkeypatch.setattr(environment_service, "ensure_venv", lambda app_id: str(env_dir / "python"))
+    monkeypatch.setattr(environment_service, "get_venv_site_packages", lambda app_id: str(site_dir))
+    monkeypatch.setattr(environment_service, "share_env_packages", lambda app_id: None)
+    monkeypatch.setattr(environment_service, "Wheelhouse", FakeWheelhouse)
+    return tmp_path / "requirements.txt", calls
+
+
+def test_only_added_requirements_are_installed(env):
+    requirements, calls = env
+    requirements.write_text("requests>=2\n", encoding="utf-8")
+    assert environment_service.install_requirements("dfr", str(requirements))
+    assert calls == []
+
+    requirements.write_text("requests>=2\nopenpyxl==1.0\n", encoding="utf-8")
+    assert environment_service.install_requirements("dfr", str(requirements))
+    assert calls == [["openpyxl==1.0"]]
+
+
+def test_unchanged_requirements_skip_resolution(env, monkeypatch):
+    requirements, calls = env
+    requirements.write_text("requests>=2\nopenpyxl==1.0\n", encoding="utf-8")
+    assert environment_service.install_requirements("dfr", str(requirements))
+    assert os.path.isfile(environment_service.requirements_stamp_path("dfr"))
+
+    monkeypatch.setattr(
+        environment_service, "check_requirements", lambda *a, **k: pytest.fail("stamp should short-circuit")
+    )
+    assert environment_service.install_requirements("dfr", str(requirements))
+    assert calls == [["openpyxl==1.0"]]
+
+
+def test_pip_options_fall_back_to_whole_file(env):
+    requirements, calls = env
+    requirements.write_text("--extra-index-url https://example.com/simple\nopenpyxl\n", encoding="utf-8")
+    assert environment_service.install_requirements("dfr", str(requirements))
+    assert calls == [None]
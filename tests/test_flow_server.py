@@ -0,0 +1,240 @@
+"""Tests for Flow server shutdown and warm reuse."""
+
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from elysium.core.polling import wait_until
+from elysium.services.flow_server import FlowLifecycle, FlowServerController, StopResult, probe_health
+from elysium.services.process_backend import FakeBackend, ProcessInfo, ProcFsBackend, process_tree
+from elysium.services.socket_table import (
+    FakeSocketTable,
+    ProcNetSocketTable,
+    parse_netstat,
+    parse_proc_net_tcp,
+    port_in_use,
+)
+
+PROC_NET_TCP = """\
+  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 0100007F:0BB8 00000000:0000 0A 00000000:00000000 00:00000000 00000000  1000        0 424242 1 0000000000000000 100 0 0 10 0
+   1: 0100007F:0BB8 0100007F:D431 01 00000000:00000000 00:00000000 00000000  1000        0 515151 1 0000000000000000 20 4 30 10 -1
+   2: 00000000:1F90 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 777 1 0000000000000000 100 0 0 10 0
+"""
+
+NETSTAT = """
+Active Connections
+
+  Proto  Local Address          Foreign Address        State           PID
+  TCP    0.0.0.0:135            0.0.0.0:0              LISTENING       1044
+  TCP    0.0.0.0:3000           0.0.0.0:0              LISTENING       8812
+  TCP    127.0.0.1:3000         127.0.0.1:52110        ESTABLISHED     8812
+  TCP    [::]:3000              [::]:0                 LISTENING       8813
+  TCP    127.0.0.1:30000        0.0.0.0:0              LISTENING       1
+"""
+
+SERVER = """
+import socket, subprocess, sys, time
+sock = socket.socket()
+sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+sock.bind(("127.0.0.1", int(sys.argv[1])))
+sock.listen()
+subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+print("ready", flush=True)
+time.sleep(60)
+"""
+
+
+def test_parse_proc_net_tcp_only_listening_rows():
+    assert parse_proc_net_tcp(PROC_NET_TCP, 3000) == {424242}
+    assert parse_proc_net_tcp(PROC_NET_TCP, 8080) == {777}
+    assert parse_proc_net_tcp(PROC_NET_TCP, 1) == set()
+
+
+def test_parse_netstat_listening_rows_for_port():
+    assert parse_netstat(NETSTAT, 3000) == {8812, 8813}
+    assert parse_netstat(NETSTAT, 30) == set()
+
+
+def test_process_tree_is_children_first():
+    table = [ProcessInfo(1, "cmd.exe", ppid=0), ProcessInfo(2, "node.exe", ppid=1), ProcessInfo(3, "node.exe", ppid=2)]
+    assert process_tree(table, {1}) == [3, 2, 1]
+
+
+def test_controller_combines_pid_file_port_owner_and_stale_launchers(tmp_path):
+    flow_dir = tmp_path / "Flow"
+    logs = flow_dir / "launcher" / "logs"
+    logs.mkdir(parents=True)
+    (logs / "server.pid").write_text("20\n")
+    (logs / "server.log").write_text("old log")
+    backend = FakeBackend([
+        ProcessInfo(20, "node.exe", rf"node {flow_dir}\server.js", ppid=1),
+        ProcessInfo(21, "node.exe", "node worker.js", ppid=20),
+        ProcessInfo(30, "node.exe", "node next dev", ppid=1),
+        ProcessInfo(40, "powershell.exe", r"powershell -File C:\x\Launch-Flow.ps1", ppid=1),
+        ProcessInfo(50, "node.exe", rf"node {flow_dir}\node_modules\.bin\next", ppid=1),
+        ProcessInfo(60, "node.exe", "node unrelated.js", ppid=1),
+    ])
+    controller = FlowServerController(str(flow_dir), port=1, backend=backend, sockets=FakeSocketTable({1: {30}}))
+
+    result = controller.stop(timeout=1)
+
+    assert backend.terminated.index(21) < backend.terminated.index(20)
+    assert sorted(result.killed) == [20, 21, 30, 40, 50]
+    assert [proc.pid for proc in backend.processes()] == [60]
+    assert not (logs / "server.pid").exists()
+    assert not (logs / "server.log").exists()
+
+
+def test_controller_ignores_recycled_pid_file_pid(tmp_path):
+    flow_dir = tmp_path / "Flow"
+    logs = flow_dir / "launcher" / "logs"
+    logs.mkdir(parents=True)
+    (logs / "server.pid").write_text("70\n")
+    backend = FakeBackend([
+        ProcessInfo(30, "node.exe", "node next dev", ppid=1),
+        ProcessInfo(70, "explorer.exe", r"C:\Windows\explorer.exe", ppid=1),
+        ProcessInfo(71, "notepad.exe", "notepad.exe", ppid=70),
+    ])
+    controller = FlowServerController(str(flow_dir), port=1, backend=backend, sockets=FakeSocketTable({1: {30}}))
+
+    assert controller.find_roots(backend.processes()) == {30}
+    controller.stop(timeout=1)
+    assert [proc.pid for proc in backend.processes()] == [70, 71]
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/net"), reason="needs /proc")
+def test_stops_dummy_server_tree_and_frees_port(tmp_path):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    flow_dir = tmp_path / "Flow"
+    logs = flow_dir / "launcher" / "logs"
+    logs.mkdir(parents=True)
+    server = subprocess.Popen([sys.executable, "-c", SERVER, str(port)], stdout=subprocess.PIPE, text=True)
+    backend = ProcFsBackend()
+    try:
+        assert server.stdout.readline().strip() == "ready"
+        (logs / "server.pid").write_text(str(server.pid))
+        (logs / "server.log").write_text("log")
+        assert wait_until(lambda: any(p.ppid == server.pid for p in backend.processes()), timeout=5)
+        children = [p.pid for p in backend.processes() if p.ppid == server.pid]
+        assert ProcNetSocketTable().listening_pids(port) == {server.pid}
+        (logs / "server.pid").write_text("")  # port lookup alone must find the server
+
+        started = time.monotonic()
+        result = FlowServerController(str(flow_dir), port=port, backend=backend, sockets=ProcNetSocketTable()).stop()
+        elapsed = time.monotonic() - started
+
+        assert set(result.killed) == {server.pid, *children}
+        assert result.port_free and not port_in_use(port)
+        assert server.wait(timeout=5) != 0
+        assert not any(backend.is_running(pid) for pid in children)
+        assert not (logs / "server.log").exists()
+        assert elapsed < 1.0
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.wait()
+        server.stdout.close()
+
+
+class FakeFlowServer:
+    """Local HTTP server standing in for the Flow dev server."""
+
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.requests: list[str] = []
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                owner.requests.append(self.path)
+                self.send_response(owner.status)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _checkout(tmp_path, sha="a" * 40):
+    flow_dir = tmp_path / "Flow"
+    (flow_dir / ".git" / "refs" / "heads").mkdir(parents=True)
+    (flow_dir / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (flow_dir / ".git" / "refs" / "heads" / "main").write_text(sha + "\n")
+    return flow_dir
+
+
+def test_probe_health_treats_only_5xx_and_silence_as_unhealthy():
+    with FakeFlowServer(404) as server:
+        assert probe_health(f"http://127.0.0.1:{server.port}/")
+        server.status = 503
+        assert not probe_health(f"http://127.0.0.1:{server.port}/")
+    assert not probe_health(f"http://127.0.0.1:{server.port}/", timeout=0.2)
+
+
+def test_healthy_server_from_current_commit_is_reused(tmp_path):
+    flow_dir = _checkout(tmp_path)
+    with FakeFlowServer() as server:
+        lifecycle = FlowLifecycle(str(flow_dir), port=server.port, health_path="/api/health")
+        assert not lifecycle.reusable()  # never launched by us: no stamp
+        lifecycle.record_launch()
+        assert lifecycle.launched_commit() == "a" * 40
+        assert lifecycle.reusable()
+        assert server.requests == ["/api/health"]
+
+
+def test_new_commit_or_unhealthy_server_forces_restart(tmp_path):
+    flow_dir = _checkout(tmp_path)
+    with FakeFlowServer() as server:
+        lifecycle = FlowLifecycle(str(flow_dir), port=server.port)
+        lifecycle.record_launch()
+        (flow_dir / ".git" / "refs" / "heads" / "main").write_text("b" * 40)
+        assert not lifecycle.reusable()
+        assert server.requests == []  # commit check comes before the probe
+
+        lifecycle.record_launch()
+        server.status = 500
+        assert not lifecycle.reusable()
+    assert not lifecycle.reusable()  # nothing listening any more
+
+
+def test_stop_flow_server_keeps_a_reusable_server(tmp_path, monkeypatch):
+    from elysium.services import process_service
+
+    flow_dir = _checkout(tmp_path)
+    (flow_dir / "launcher").mkdir()
+    flow = type("App", (), {"id": "flow", "folder_name": lambda self: "Flow"})()
+    registry = type("Registry", (), {"get": lambda self, app_id: flow})()
+    monkeypatch.setattr(process_service, "resolve_app_dir", lambda app_id, folder: str(flow_dir))
+    stops = []
+    monkeypatch.setattr(process_service.FlowServerController, "stop", lambda self, timeout: stops.append(self) or StopResult())
+    monkeypatch.setattr(process_service, "get_process_backend", lambda: FakeBackend([]))
+
+    with FakeFlowServer() as server:
+        FlowLifecycle(str(flow_dir), port=server.port).record_launch()
+        monkeypatch.setattr(process_service, "FlowLifecycle", lambda d: FlowLifecycle(d, port=server.port))
+        process_service.stop_flow_server(registry)
+        assert stops == []
+        process_service.stop_flow_server(registry, keep_reusable=False)
+        assert len(stops) == 1
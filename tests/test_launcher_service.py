@@ -68,3 +68,66 @@ def test_build_launch_plan_missing_entry(registry, tmp_path, monkeypatch):
     service = LauncherService(registry)
     with pytest.raises(FileNotFoundError):
         service.build_launch_plan("DFR")
+
+
+def test_build_launch_plan_refuses_while_env_is_preparing(registry, tmp_path, monkeypatch):
+    from elysium.core.exceptions import EnvironmentNotReadyError
+    from elysium.services.env_prep_service import EnvState
+
+    app_dir = tmp_path / "DFR"
+    app_dir.mkdir()
+    (app_dir / "DFR.py").write_text("print('ok')", encoding="utf-8")
+    monkeypatch.setattr(registry, "app_install_dir", lambda _app: str(app_dir))
+
+    class PreparingQueue:
+        def state(self, app_id):
+            return EnvState.PREPARING
+
+    monkeypatch.setattr("elysium.services.launcher_service.get_env_prep_queue", lambda: PreparingQueue())
+    service = LauncherService(registry)
+    with patch("elysium.services.launcher_service.resolve_python_for_app") as resolve:
+        with pytest.raises(EnvironmentNotReadyError):
+            service.build_launch_plan("DFR")
+    resolve.assert_not_called()
+
+
+def test_build_launch_plan_queues_prep_for_stale_env(registry, tmp_path, monkeypatch):
+    from elysium.core.exceptions import EnvironmentNotReadyError
+    from elysium.services import environment_service
+    from elysium.services.env_prep_service import EnvState
+
+    app_dir = tmp_path / "DFR"
+    app_dir.mkdir()
+    (app_dir / "DFR.py").write_text("print('ok')", encoding="utf-8")
+    (app_dir / "requirements.txt").write_text("requests\n", encoding="utf-8")
+    python_exe = tmp_path / "venv" / "python"
+    python_exe.parent.mkdir()
+    python_exe.write_text("", encoding="utf-8")
+    monkeypatch.setattr(registry, "app_install_dir", lambda _app: str(app_dir))
+    monkeypatch.setattr(environment_service, "should_use_isolated_env", lambda app_id: True)
+    monkeypatch.setattr(environment_service, "get_venv_python", lambda app_id: str(python_exe))
+    monkeypatch.setattr(environment_service, "requirements_satisfied", lambda app_id, app_dir: False)
+
+    class Queue:
+        def __init__(self, state):
+            self._state = state
+            self.submitted = []
+
+        def state(self, app_id):
+            return self._state
+
+        def submit(self, app):
+            self.submitted.append(app.id)
+
+    service = LauncherService(registry)
+    for state in (EnvState.UNKNOWN, EnvState.FAILED):
+        queue = Queue(state)
+        monkeypatch.setattr("elysium.services.launcher_service.get_env_prep_queue", lambda: queue)
+        with pytest.raises(EnvironmentNotReadyError):
+            service.build_launch_plan("DFR")
+        assert queue.submitted == ["dfr"]
+
+    queue = Queue(EnvState.READY)
+    monkeypatch.setattr("elysium.services.launcher_service.get_env_prep_queue", lambda: queue)
+    assert service.build_launch_plan("DFR").command[0] == str(python_exe)
+    assert queue.submitted == []
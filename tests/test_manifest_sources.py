@@ -0,0 +1,227 @@
+"""Tests for merged and remote manifest sources."""
+
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import yaml
+
+from elysium.services.app_registry import AppRegistry
+from elysium.services.manifest_sources import (
+    ManifestMerger,
+    ManifestSource,
+    RemoteManifestCache,
+    default_sources,
+    merge_manifests,
+)
+
+
+def _entry(app_id, name, **extra):
+    return {"id": app_id, "name": name, "launch": {"entry": f"{app_id}.py"}, **extra}
+
+
+def _dump(apps) -> bytes:
+    return yaml.safe_dump({"apps": apps}).encode("utf-8")
+
+
+class ManifestServer:
+    """Local HTTP server that honours If-None-Match like a static file host."""
+
+    def __init__(self, body: bytes, etag: str = '"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests: list[dict[str, str]] = []
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                owner.requests.append(dict(self.headers))
+                if self.headers.get("If-None-Match") == owner.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", owner.etag)
+                self.send_header("Last-Modified", "Wed, 01 Jan 2025 00:00:00 GMT")
+                self.send_header("Content-Length", str(len(owner.body)))
+                self.end_headers()
+                self.wfile.write(owner.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/apps.yaml"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def test_merge_later_sources_win_per_key_and_can_remove():
+    merged = merge_manifests([
+        {"apps": [_entry("a", "Alpha", tags=["x"]), _entry("b", "Beta")]},
+        {"apps": [{"id": "a", "name": "Alpha 2"}, {"id": "b", "remove": True}, _entry("c", "Gamma")]},
+    ])
+    assert [app["id"] for app in merged["apps"]] == ["a", "c"]
+    assert merged["apps"][0]["name"] == "Alpha 2"
+    assert merged["apps"][0]["tags"] == ["x"]
+
+
+def test_remote_fetch_is_conditional_and_survives_going_offline(tmp_path):
+    cache = RemoteManifestCache(str(tmp_path / "remote"))
+    with ManifestServer(_dump([_entry("team", "Team Tool")])) as server:
+        first = cache.fetch(server.url)
+        assert first.status == "fetched"
+        second = cache.fetch(server.url)
+        assert second.status == "not_modified" and second.path == first.path
+        assert server.requests[1]["If-None-Match"] == '"v1"'
+        assert server.requests[1]["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+
+        server.body, server.etag = _dump([_entry("team", "Team Tool 2")]), '"v2"'
+        assert cache.fetch(server.url).status == "fetched"
+
+    offline = cache.fetch(server.url)
+    assert offline.status == "offline" and offline.path == first.path
+    assert yaml.safe_load(open(offline.path, encoding="utf-8"))["apps"][0]["name"] == "Team Tool 2"
+
+
+def test_remote_fetch_within_ttl_skips_the_network(tmp_path):
+    cache = RemoteManifestCache(str(tmp_path / "remote"), ttl=300)
+    with ManifestServer(_dump([_entry("team", "Team Tool")])) as server:
+        cache.fetch(server.url)
+        assert cache.fetch(server.url).status == "cached"
+        assert len(server.requests) == 1
+
+
+def test_invalid_remote_body_keeps_the_cached_copy(tmp_path):
+    cache = RemoteManifestCache(str(tmp_path / "remote"))
+    with ManifestServer(_dump([_entry("team", "Team Tool")])) as server:
+        good = cache.fetch(server.url).path
+        server.body, server.etag = b"apps: [unclosed", '"broken"'
+        result = cache.fetch(server.url)
+    assert result.status == "offline" and result.path == good
+    assert b"Team Tool" in open(good, "rb").read()
+
+
+def test_registry_follows_merged_sources(tmp_path, monkeypatch):
+    from elysium.services import app_registry
+
+    bundled = tmp_path / "apps.yaml"
+    bundled.write_bytes(_dump([_entry("a", "Alpha"), _entry("b", "Beta")]))
+    overrides = tmp_path / "overrides.yaml"
+    with ManifestServer(_dump([_entry("team", "Team Tool")])) as server:
+        merger = ManifestMerger(
+            [
+                ManifestSource("bundled", str(bundled)),
+                ManifestSource("team", server.url),
+                ManifestSource("overrides", str(overrides)),
+            ],
+            output_path=str(tmp_path / "cache" / "merged.yaml"),
+            remote=RemoteManifestCache(str(tmp_path / "cache" / "remote")),
+        )
+        monkeypatch.setattr(app_registry, "resolve_manifest_path", merger.path)
+        monkeypatch.setattr(app_registry, "RELOAD_CHECK_SECONDS", 0)
+        monkeypatch.setattr("elysium.services.manifest_sources.CHECK_INTERVAL_SECONDS", 0)
+
+        registry = AppRegistry()
+        assert [app.id for app in registry.apps] == ["a", "b"]  # remote not fetched yet
+        merged_path = merger.path(fetch=True)
+        assert [app.id for app in registry.apps] == ["a", "b", "team"]
+
+    stamp = (tmp_path / "cache" / "merged.yaml").stat().st_mtime_ns
+    assert merger.path(fetch=True) == merged_path  # offline: cached copy, same merge
+    assert (tmp_path / "cache" / "merged.yaml").stat().st_mtime_ns == stamp
+
+    overrides.write_bytes(_dump([{"id": "a", "name": "Alpha (local)"}, {"id": "b", "remove": True}]))
+    assert [app.name for app in registry.apps] == ["Alpha (local)", "Team Tool"]
+    assert registry.get("b") is None
+
+
+def test_stale_base_copy_does_not_resurrect_removed_apps(tmp_path, monkeypatch):
+    from elysium.core import paths
+    from elysium.services import manifest_sources
+
+    base_manifests = tmp_path / "manifests"
+    base_manifests.mkdir()
+    bundled_ids = [app.id for app in AppRegistry(paths.get_manifest_path()).apps]
+    stale = [_entry(app_id, app_id) for app_id in bundled_ids] + [_entry("retired_tool", "Retired Tool")]
+    (base_manifests / "apps.yaml").write_bytes(_dump(stale))
+    (base_manifests / "overrides.yaml").write_bytes(_dump([_entry("local_tool", "Local Tool")]))
+    monkeypatch.setattr(paths, "get_base_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(manifest_sources, "get_base_dir", lambda: str(tmp_path))
+
+    sources = default_sources({})
+    assert [source.name for source in sources] == ["local", "overrides"]
+    merger = ManifestMerger(
+        sources,
+        output_path=str(tmp_path / "cache" / "merged.yaml"),
+        remote=RemoteManifestCache(str(tmp_path / "cache" / "remote")),
+    )
+    ids = [app.id for app in AppRegistry(merger.path()).apps]
+    assert "retired_tool" not in ids
+    assert ids == bundled_ids + ["local_tool"]
+
+
+def test_merger_is_rebuilt_when_manifest_settings_change(tmp_path, monkeypatch):
+    from elysium.core import settings as settings_module
+    from elysium.services import manifest_sources
+
+    monkeypatch.setattr(settings_module, "get_settings_path", lambda: str(tmp_path / "settings.json"))
+    monkeypatch.setattr(manifest_sources, "get_cache_dir", lambda: str(tmp_path / "cache"))
+    monkeypatch.setattr(manifest_sources, "_MERGER", None)
+    monkeypatch.setattr(manifest_sources, "_subscribed_store", None)
+
+    settings_module.set_setting("manifest_url", "")
+    first = manifest_sources.get_manifest_merger()
+    assert manifest_sources.get_manifest_merger() is first
+    assert not any(source.remote for source in first.sources)
+
+    settings_module.set_setting("manifest_url", "https://example.invalid/apps.yaml")
+    second = manifest_sources.get_manifest_merger()
+    assert second is not first
+    assert [s.location for s in second.sources if s.remote] == ["https://example.invalid/apps.yaml"]
+
+    settings_module.set_setting("manifest_ttl_seconds", 5.0)
+    assert manifest_sources.get_manifest_merger().remote.ttl == 5.0
+
+
+def test_invalid_remote_and_override_entries_are_dropped(tmp_path, monkeypatch):
+    from elysium.services import app_registry
+
+    bundled = tmp_path / "apps.yaml"
+    bundled.write_bytes(_dump([_entry("a", "Alpha"), _entry("b", "Beta")]))
+    overrides = tmp_path / "overrides.yaml"
+    overrides.write_bytes(_dump([
+        {"id": "newtool", "name": "New Tool"},  # no launch section
+        {"id": "a", "launch": "not a mapping"},
+        {"id": "b", "name": "Beta (local)"},
+    ]))
+    remote = _dump([{"id": "team", "name": "Team Tool", "tags": "not-a-list"}, _entry("good", "Good Tool")])
+    with ManifestServer(remote) as server:
+        merger = ManifestMerger(
+            [
+                ManifestSource("local", str(bundled)),
+                ManifestSource("team", server.url),
+                ManifestSource("overrides", str(overrides)),
+            ],
+            output_path=str(tmp_path / "cache" / "merged.yaml"),
+            remote=RemoteManifestCache(str(tmp_path / "cache" / "remote")),
+        )
+        merger.path(fetch=True)
+    monkeypatch.setattr(app_registry, "resolve_manifest_path", merger.path)
+    monkeypatch.setattr("elysium.services.manifest_sources.CHECK_INTERVAL_SECONDS", 0)
+
+    registry = AppRegistry()
+    assert [(app.id, app.name) for app in registry.apps] == [
+        ("a", "Alpha"),
+        ("b", "Beta (local)"),
+        ("good", "Good Tool"),
+    ]
+    assert registry.get("a").launch.entry == "a.py"
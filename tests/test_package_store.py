@@ -0,0 +1,90 @@
+"""Tests for the content-addressed package store."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from elysium.services.package_store import PackageStore, usage_report
+
+
+def _write(path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+
+
+@pytest.fixture
+def envs(tmp_path):
+    for env in ("dfr", "hyper"):
+        site = tmp_path / "envs" / env / "site-packages"
+        _write(site / "requests" / "__init__.py", b"shared requests code" * 100)
+        _write(site / "openpyxl" / "cell.py", b"shared openpyxl code" * 100)
+        _write(site / f"{env}_only.py", env.encode() * 10)
+    return tmp_path / "envs"
+
+
+def test_link_tree_shares_identical_files(tmp_path, envs):
+    store = PackageStore(str(tmp_path / "store"))
+
+    first = store.link_tree(str(envs / "dfr"))
+    second = store.link_tree(str(envs / "hyper"))
+
+    assert first.new_objects == 3 and first.linked == 0
+    assert second.linked == 2 and second.new_objects == 1
+    a = os.stat(envs / "dfr" / "site-packages" / "requests" / "__init__.py")
+    b = os.stat(envs / "hyper" / "site-packages" / "requests" / "__init__.py")
+    assert (a.st_dev, a.st_ino) == (b.st_dev, b.st_ino)
+    assert (envs / "hyper" / "site-packages" / "requests" / "__init__.py").read_bytes() == b"shared requests code" * 100
+
+
+def test_link_tree_is_idempotent(tmp_path, envs):
+    store = PackageStore(str(tmp_path / "store"))
+    store.link_tree(str(envs / "dfr"))
+    store.link_tree(str(envs / "hyper"))
+
+    again = store.link_tree(str(envs / "hyper"))
+    assert again.linked == 0 and again.new_objects == 0
+
+
+def test_object_edited_in_place_is_replaced_not_shared(tmp_path, envs):
+    store = PackageStore(str(tmp_path / "store"))
+    store.link_tree(str(envs / "dfr"))
+    edited = envs / "dfr" / "site-packages" / "requests" / "__init__.py"
+    with open(edited, "r+b") as f:  # same inode, so the store object changes too
+        f.write(b"patched")
+
+    stats = store.link_tree(str(envs / "hyper"))
+
+    original = b"shared requests code" * 100
+    hyper = envs / "hyper" / "site-packages" / "requests" / "__init__.py"
+    assert hyper.read_bytes() == original
+    assert stats.linked == 1 and stats.new_objects == 2
+    assert os.stat(hyper).st_ino != os.stat(edited).st_ino
+    third = tmp_path / "third" / "requests" / "__init__.py"
+    _write(third, original)
+    store.link_tree(str(tmp_path / "third"))
+    assert os.stat(third).st_ino == os.stat(hyper).st_ino
+
+
+def test_usage_report_counts_deduplicated_bytes(tmp_path, envs):
+    store = PackageStore(str(tmp_path / "store"))
+    for env in ("dfr", "hyper"):
+        store.link_tree(str(envs / env))
+
+    seen: set[tuple[int, int]] = set()
+    dfr = usage_report(str(envs / "dfr"), seen)
+    hyper = usage_report(str(envs / "hyper"), seen)
+
+    assert dfr.deduplicated_bytes == 0
+    assert hyper.deduplicated_bytes == 4000
+    assert hyper.physical_bytes == len(b"hyper" * 10)
+
+
+def test_gc_removes_unreferenced_objects(tmp_path, envs):
+    store = PackageStore(str(tmp_path / "store"))
+    store.link_tree(str(envs / "dfr"))
+    os.remove(envs / "dfr" / "site-packages" / "dfr_only.py")
+
+    assert store.gc() == len(b"dfr" * 10)
+    assert store.gc() == 0
@@ -0,0 +1,148 @@
+"""Tests for the batched pip installer, run against a local wheel directory."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import zipfile
+
+import pytest
+
+from elysium.services import pip_installer
+from elysium.services.pip_installer import FailureKind, PipInstaller, classify_failure
+
+
+def _record_line(path: str, data: bytes) -> str:
+    digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode()
+    return f"{path},sha256={digest},{len(data)}"
+
+
+def build_wheel(wheel_dir, name: str, version: str, requires: tuple[str, ...] = ()) -> None:
+    """Write a minimal pure-Python wheel containing a single module."""
+    dist_info = f"{name}-{version}.dist-info"
+    metadata = "\n".join(
+        ["Metadata-Version: 2.1", f"Name: {name}", f"Version: {version}"]
+        + [f"Requires-Dist: {req}" for req in requires]
+    ) + "\n"
+    files = {
+        f"{name}.py": f"VERSION = {version!r}\n".encode(),
+        f"{dist_info}/METADATA": metadata.encode(),
+        f"{dist_info}/WHEEL": b"Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    record = [_record_line(path, data) for path, data in files.items()] + [f"{dist_info}/RECORD,,"]
+    files[f"{dist_info}/RECORD"] = ("\n".join(record) + "\n").encode()
+    with zipfile.ZipFile(wheel_dir / f"{name}-{version}-py3-none-any.whl", "w") as zf:
+        for path, data in files.items():
+            zf.writestr(path, data)
+
+
+@pytest.fixture
+def local_index(tmp_path):
+    wheels = tmp_path / "wheels"
+    wheels.mkdir()
+    build_wheel(wheels, "alpha", "1.0")
+    build_wheel(wheels, "beta", "2.1", ("alpha>=1",))
+    return wheels
+
+
+def _installer(tmp_path, local_index, **kwargs) -> PipInstaller:
+    target = tmp_path / "target"
+    return PipInstaller(
+        extra_args=["--no-index", "--find-links", str(local_index), "--target", str(target)],
+        **kwargs,
+    )
+
+
+def test_install_batch_reports_each_package(tmp_path, local_index):
+    lines: list[str] = []
+    result = _installer(tmp_path, local_index, on_output=lines.append).install(["beta==2.1"])
+
+    assert result.ok
+    assert result.installed == {"alpha": "1.0", "beta": "2.1"}
+    assert len(result.attempts) == 1
+    assert (tmp_path / "target" / "beta.py").is_file()
+    assert lines
+
+
+def test_missing_package_is_not_retried(tmp_path, local_index):
+    result = _installer(tmp_path, local_index).install(["alpha", "gamma"])
+
+    assert not result.ok
+    assert result.failure == FailureKind.NOT_FOUND
+    assert result.failed == ["alpha", "gamma"]
+    assert len(result.attempts) == 1
+
+
+def test_retry_uses_only_the_matching_strategy(monkeypatch):
+    calls: list[tuple[list[str], list[str]]] = []
+    outputs = iter([(1, "ReadTimeoutError: Read timed out.", None), (0, "ok", {"install": []})])
+
+    def fake_run(self, target_args, args):
+        calls.append((target_args, args))
+        return next(outputs)
+
+    monkeypatch.setattr(PipInstaller, "_run", fake_run)
+    result = PipInstaller().install(["alpha", "beta"])
+
+    assert result.ok
+    assert result.already_satisfied == ["alpha", "beta"]
+    assert calls == [
+        (["alpha", "beta"], []),
+        (["alpha", "beta"], pip_installer.RETRY_STRATEGIES[FailureKind.NETWORK]),
+    ]
+
+
+PERMISSION_DENIED = "ERROR: Could not install packages due to an OSError: [Errno 13] Permission denied"
+
+
+def test_same_failure_kind_is_retried_once(monkeypatch, tmp_path):
+    calls: list[list[str]] = []
+
+    def fake_run(self, target_args, args):
+        calls.append(args)
+        return 1, PERMISSION_DENIED, None
+
+    monkeypatch.setattr(PipInstaller, "_run", fake_run)
+    result = PipInstaller(str(tmp_path / "bin" / "python")).install(["alpha"])
+
+    assert result.failure == FailureKind.PERMISSION
+    assert calls == [[], ["--user"]]
+
+
+def test_user_retry_is_skipped_for_venvs_and_explicit_locations(monkeypatch, tmp_path):
+    calls: list[list[str]] = []
+
+    def fake_run(self, target_args, args):
+        calls.append(args)
+        return 1, PERMISSION_DENIED, None
+
+    monkeypatch.setattr(PipInstaller, "_run", fake_run)
+    venv = tmp_path / "venv"
+    (venv / "Scripts").mkdir(parents=True)
+    (venv / "pyvenv.cfg").write_text("home = C:\\Python311\n", encoding="utf-8")
+    system_python = str(tmp_path / "bin" / "python")
+
+    for installer in (
+        PipInstaller(str(venv / "Scripts" / "python.exe")),
+        PipInstaller(system_python, extra_args=["--target", str(tmp_path / "t")]),
+        PipInstaller(system_python, extra_args=[f"--prefix={tmp_path}"]),
+    ):
+        calls.clear()
+        result = installer.install(["alpha"])
+        assert result.failure == FailureKind.PERMISSION
+        assert calls == [installer.extra_args]
+
+
+@pytest.mark.parametrize(
+    ("output", "kind"),
+    [
+        ("SSLError(SSLCertVerificationError(1, '[SSL: CERTIFICATE_VERIFY_FAILED]'))", FailureKind.SSL),
+        ("Failed to establish a new connection: [Errno 11001] getaddrinfo failed", FailureKind.NETWORK),
+        ("ERROR: Failed building wheel for lxml", FailureKind.BUILD),
+        ("[WinError 5] Access is denied: 'C:\\\\Python\\\\Lib'", FailureKind.PERMISSION),
+        ("ERROR: No matching distribution found for nope", FailureKind.NOT_FOUND),
+        ("something else entirely", FailureKind.UNKNOWN),
+    ],
+)
+def test_classify_failure(output, kind):
+    assert classify_failure(output) == kind
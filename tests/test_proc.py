@@ -0,0 +1,102 @@
+"""Tests for the shared subprocess runner."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from elysium.core import proc
+from elysium.core.polling import wait_until
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def test_drains_both_pipes_without_deadlock():
+    # Far more than a pipe buffer on each stream, written interleaved.
+    code = "import sys\nfor i in range(3000):\n    sys.stdout.write('o' * 50 + '\\n'); sys.stderr.write('e' * 50 + '\\n')"
+    result = proc.run(_python(code), timeout=30)
+    assert result.ok
+    assert result.stdout.count("\n") == 3000
+    assert result.stderr.count("\n") == 3000
+    assert not result.truncated
+
+
+def test_line_callbacks_stream_progress():
+    code = (
+        "import sys\n"
+        "sys.stderr.write('Receiving objects:  50%\\rReceiving objects: 100%\\n'); sys.stderr.flush()\n"
+        "print('done')"
+    )
+    out, err = [], []
+    result = proc.run(_python(code), on_stdout=out.append, on_stderr=err.append, timeout=30)
+    assert result.ok
+    assert out == ["done"]
+    assert err == ["Receiving objects:  50%", "Receiving objects: 100%"]
+
+
+def test_merge_stderr_folds_into_stdout():
+    code = "import sys; print('a', flush=True); print('b', file=sys.stderr)"
+    lines = []
+    result = proc.run(_python(code), merge_stderr=True, on_stdout=lines.append, timeout=30)
+    assert sorted(lines) == ["a", "b"]
+    assert result.stderr == ""
+
+
+def test_output_is_bounded_to_the_tail():
+    code = "import sys; sys.stdout.write('x' * 1_000_000 + 'END')"
+    result = proc.run(_python(code), max_output=100, timeout=30)
+    assert result.ok and result.truncated
+    assert len(result.stdout) == 100 and result.stdout.endswith("END")
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="needs /proc to check the grandchild")
+def test_timeout_kills_the_whole_tree(tmp_path):
+    pid_file = tmp_path / "grandchild.pid"
+    code = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+        "print('started', flush=True)\n"
+        "time.sleep(60)"
+    )
+    started = time.monotonic()
+    result = proc.run(_python(code), timeout=1)
+    assert result.timed_out and not result.ok
+    assert result.stdout == "started\n"
+    assert time.monotonic() - started < 5
+    grandchild = int(pid_file.read_text())
+
+    def reaped() -> bool:
+        try:
+            with open(f"/proc/{grandchild}/stat") as f:
+                return f.read().rsplit(")", 1)[1].split()[0] == "Z"
+        except OSError:
+            return True
+
+    assert wait_until(reaped, timeout=5)
+
+
+def test_launch_failure_is_a_result_not_an_exception(tmp_path):
+    result = proc.run([str(tmp_path / "missing-binary")])
+    assert not result.ok
+    assert result.returncode is None and result.error
+    assert result.describe().startswith("could not start")
+
+
+def test_async_runs_overlap():
+    async def both():
+        return await asyncio.gather(
+            proc.run_async(_python("import time; time.sleep(0.5)")),
+            proc.run_async(_python("import time; time.sleep(0.5)")),
+        )
+
+    started = time.monotonic()
+    results = asyncio.run(both())
+    assert all(result.ok for result in results)
+    assert time.monotonic() - started < 0.95
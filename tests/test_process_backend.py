@@ -0,0 +1,116 @@
+"""Tests for process enumeration backends."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from elysium.services import process_backend, process_service
+from elysium.services.process_backend import (
+    ELYSIUM_PROCESSES,
+    FakeBackend,
+    PowerShellBackend,
+    ProcessInfo,
+    ProcessMatch,
+    ProcFsBackend,
+)
+
+
+def _table():
+    return [
+        ProcessInfo(10, "python.exe", r"C:\Python\python.exe -u C:\Users\me\Documents\Elysium\elysium.py"),
+        ProcessInfo(11, "ElysiumLauncher.exe", ""),
+        ProcessInfo(12, "python.exe", "python -m pytest"),
+        ProcessInfo(13, "pythonw.exe", "pythonw elysium_launcher.py --quiet"),
+        ProcessInfo(99, "python.exe", "python ELYSIUM.py"),
+    ]
+
+
+def test_elysium_match_is_case_insensitive():
+    matched = [proc.pid for proc in _table() if ELYSIUM_PROCESSES.matches(proc)]
+    assert matched == [10, 11, 13, 99]
+    assert not ProcessMatch(names=("ELYSIUM.exe",)).matches(ProcessInfo(1, "node.exe", "elysium.exe"))
+
+
+def test_close_other_instances_spares_current_process():
+    backend = FakeBackend(_table())
+
+    killed = process_service.close_other_elysium_instances(current_pid=99, backend=backend)
+
+    assert [proc.pid for proc in killed] == [10, 11, 13]
+    assert backend.terminated == [10, 11, 13]
+    assert [proc.pid for proc in backend.processes()] == [12, 99]
+
+
+def test_close_other_instances_survives_backend_errors():
+    class Broken(FakeBackend):
+        def processes(self):
+            raise OSError("access denied")
+
+    assert process_service.close_other_elysium_instances(current_pid=1, backend=Broken()) == []
+
+
+def test_powershell_kill_script_filters_in_one_call():
+    script = PowerShellBackend.kill_script(
+        ProcessMatch(cmdline_contains=("ELYSIUM.py", "it's.py"), names=("ELYSIUM.exe",)),
+        exclude={42},
+    )
+    assert "$exclude = @(42)" in script
+    assert "$_.CommandLine -like '*ELYSIUM.py*'" in script
+    assert "'*it''s.py*'" in script
+    assert "$_.Name -in @('ELYSIUM.exe')" in script
+
+
+def test_powershell_wait_for_exit_is_one_wait_process_call(monkeypatch):
+    from elysium.core.proc import ProcResult
+
+    scripts: list[str] = []
+
+    def fake_run(script, *, timeout):
+        scripts.append(script)
+        return ProcResult(["powershell"], returncode=0, stdout="" if "Wait-Process" in script else "7\r\n")
+
+    monkeypatch.setattr(process_backend, "run_ps_script", fake_run)
+    backend = PowerShellBackend()
+
+    assert backend.wait_for_exit([7, 8], timeout=2.5)
+    assert len(scripts) == 1
+    assert "Wait-Process -Id $ids -Timeout 3" in scripts[0] and "$ids = @(7,8)" in scripts[0]
+    assert "Win32_Process" not in scripts[0]
+    assert backend.is_running(7) and len(scripts) == 2
+    assert backend.wait_for_exit([], timeout=1) and len(scripts) == 2
+
+
+def test_default_backend_prefers_psutil(monkeypatch):
+    monkeypatch.setattr(process_backend, "psutil", object())
+    assert isinstance(process_backend.default_process_backend(), process_backend.PsutilBackend)
+    monkeypatch.setattr(process_backend, "psutil", None)
+    monkeypatch.setattr(process_backend.sys, "platform", "win32")
+    assert isinstance(process_backend.default_process_backend(), PowerShellBackend)
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="needs /proc")
+def test_procfs_backend_finds_and_kills_child(tmp_path):
+    marker = tmp_path / "ELYSIUM.py"
+    marker.write_text("import time\ntime.sleep(60)\n")
+    child = subprocess.Popen([sys.executable, str(marker)])
+    try:
+        backend = ProcFsBackend()
+        deadline = time.monotonic() + 5
+        found = []
+        while not found and time.monotonic() < deadline:
+            found = [p for p in backend.find(ELYSIUM_PROCESSES, exclude={os.getpid()}) if p.pid == child.pid]
+        assert found and found[0].ppid == os.getpid()
+
+        match = ProcessMatch(cmdline_contains=(str(marker),))
+        killed = backend.kill_matching(match, exclude={os.getpid()})
+        assert [proc.pid for proc in killed] == [child.pid]
+        assert child.wait(timeout=5) != 0
+    finally:
+        if child.poll() is None:
+            child.kill()
+            child.wait()
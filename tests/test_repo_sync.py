@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import json
 import os
+import shutil
+import subprocess
 import sys
 import tempfile
+import time
 import unittest
 from unittest.mock import patch
 
@@ -60,5 +64,107 @@ class RepoSyncTests(unittest.TestCase):
         )
 
 
+def _git(*args: str, cwd: str | None = None) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class SyncTokenTests(unittest.TestCase):
+    """ELYSIUM.py must not pull again right after the launcher EXE synced."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        origin = os.path.join(self.tmp, "origin.git")
+        seed = os.path.join(self.tmp, "seed")
+        self.install_dir = os.path.join(self.tmp, "install")
+        _git("init", "--bare", "-b", "main", origin)
+        _git("init", "-b", "main", seed)
+        os.makedirs(os.path.join(seed, "elysium"))
+        for name in ("ELYSIUM.py", os.path.join("elysium", "__init__.py")):
+            with open(os.path.join(seed, name), "w", encoding="utf-8") as handle:
+                handle.write("# stub\n")
+        _git("add", ".", cwd=seed)
+        _git("commit", "-m", "init", cwd=seed)
+        _git("push", origin, "main", cwd=seed)
+        _git("clone", origin, self.install_dir)
+        self.entry = os.path.join(self.install_dir, "ELYSIUM.py")
+
+        env = {k: v for k, v in os.environ.items() if not k.startswith("ELYSIUM_")}
+        env_patch = patch.dict(os.environ, env, clear=True)
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
+        install_patch = patch.object(repo_sync, "resolve_install_dir", return_value=self.install_dir)
+        install_patch.start()
+        self.addCleanup(install_patch.stop)
+        self._sys_path = list(sys.path)
+        self.addCleanup(self._restore_sys_path)
+
+        self.git_calls: list[list[str]] = []
+        real_git_run = repo_sync._git_run
+
+        def counting_git_run(git_exe, args, *, cwd=None):
+            self.git_calls.append(args)
+            return real_git_run(git_exe, args, cwd=cwd)
+
+        git_patch = patch.object(repo_sync, "_git_run", side_effect=counting_git_run)
+        git_patch.start()
+        self.addCleanup(git_patch.stop)
+
+    def _restore_sys_path(self):
+        sys.path[:] = self._sys_path
+
+    def test_launcher_sync_then_child_start_pulls_once(self):
+        # Launcher EXE: sync_repo() then launch ELYSIUM.py with the inherited env.
+        repo_sync.sync_repo(self.install_dir)
+        self.assertIn(repo_sync.SYNC_TOKEN_ENV, os.environ)
+        repo_sync.ensure_runtime_ready(self.entry)
+
+        pulls = [args for args in self.git_calls if "pull" in args]
+        self.assertEqual(len(pulls), 1)
+        self.assertEqual(len(self.git_calls), 1)
+
+    def test_stamp_alone_skips_sync_without_token(self):
+        repo_sync.sync_repo(self.install_dir)
+        os.environ.pop(repo_sync.SYNC_TOKEN_ENV)
+        self.git_calls.clear()
+
+        repo_sync.ensure_runtime_ready(self.entry)
+
+        self.assertEqual(self.git_calls, [])
+        with open(os.path.join(self.install_dir, ".git", repo_sync.SYNC_STAMP_NAME), encoding="utf-8") as handle:
+            stamp = json.load(handle)
+        self.assertEqual(stamp["sha"], _git("rev-parse", "HEAD", cwd=self.install_dir))
+
+    def test_stale_or_disabled_window_syncs_again(self):
+        sha = repo_sync.read_head_sha(self.install_dir)
+        os.environ[repo_sync.SYNC_TOKEN_ENV] = f"{sha}:{time.time() - 600:.3f}"
+        repo_sync.ensure_runtime_ready(self.entry)
+        self.assertEqual(len(self.git_calls), 1)
+
+        os.environ[repo_sync.SYNC_WINDOW_ENV] = "0"
+        repo_sync.ensure_runtime_ready(self.entry)
+        self.assertEqual(len(self.git_calls), 2)
+
+    def test_token_for_other_commit_is_ignored(self):
+        os.environ[repo_sync.SYNC_TOKEN_ENV] = f"{'0' * 40}:{time.time():.3f}"
+        self.assertFalse(repo_sync.recent_sync_is_fresh(self.install_dir))
+        repo_sync.ensure_runtime_ready(self.entry)
+        self.assertEqual(len(self.git_calls), 1)
+
+    def test_read_head_sha_matches_git(self):
+        self.assertEqual(repo_sync.read_head_sha(self.install_dir), _git("rev-parse", "HEAD", cwd=self.install_dir))
+        _git("pack-refs", "--all", cwd=self.install_dir)
+        self.assertEqual(repo_sync.read_head_sha(self.install_dir), _git("rev-parse", "HEAD", cwd=self.install_dir))
+
+
 if __name__ == "__main__":
     unittest.main()
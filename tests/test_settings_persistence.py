@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import json
+import os
+import subprocess
+import sys
 
 import pytest
 
 from elysium.core import settings as settings_module
+from elysium.core.polling import wait_until
 
 
 @pytest.fixture
@@ -56,3 +60,150 @@ def test_qml_ui_flag_persists(settings_file):
     assert settings_module.load_settings()["use_qml_ui"] is True
     raw = json.loads(settings_file.read_text(encoding="utf-8"))
     assert raw["use_qml_ui"] is True
+
+
+def test_reads_are_cached_until_the_file_changes(settings_file, monkeypatch):
+    monkeypatch.setattr(settings_module, "RELOAD_CHECK_SECONDS", 0)
+    store = settings_module.SettingsStore(str(settings_file))
+    settings_file.write_text(json.dumps({"theme": "Light"}), encoding="utf-8")
+    reads = []
+    real_read = settings_module._read_file
+    monkeypatch.setattr(settings_module, "_read_file", lambda path: reads.append(path) or real_read(path))
+
+    for _ in range(50):
+        assert store.get("theme") == "Light"
+        assert store.get("use_isolated_envs") is False
+    assert len(reads) == 1
+
+    # Another process rewrites the file.
+    settings_file.write_text(json.dumps({"theme": "Dark", "log_level": "DEBUG"}), encoding="utf-8")
+    os.utime(settings_file, ns=(1, 1))
+    assert store.get("log_level") == "DEBUG"
+    assert len(reads) == 2
+
+
+def test_writes_are_debounced_into_one_atomic_replace(settings_file, monkeypatch):
+    store = settings_module.SettingsStore(str(settings_file), debounce=0.1)
+    writes = []
+    real_write = settings_module._write_file
+    monkeypatch.setattr(settings_module, "_write_file", lambda path, data: writes.append(dict(data)) or real_write(path, data))
+
+    for x in range(100):
+        store.update({"window_x": x, "window_y": x})
+    assert store.get("window_x") == 99
+    assert not settings_file.exists()
+    assert wait_until(lambda: settings_file.exists(), timeout=5)
+    assert writes == [{"window_x": 99, "window_y": 99, "schema_version": settings_module.SETTINGS_SCHEMA_VERSION}]
+    assert os.listdir(settings_file.parent) == ["settings.json", "settings.json.lock"]
+
+
+def test_failed_write_leaves_previous_file_intact(settings_file, monkeypatch):
+    store = settings_module.SettingsStore(str(settings_file))
+    store.set("theme", "Light", flush=True)
+
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(settings_module.json, "dump", crash)
+    store.set("theme", "Dark", flush=True)
+    assert json.loads(settings_file.read_text(encoding="utf-8"))["theme"] == "Light"
+    assert sorted(os.listdir(settings_file.parent)) == ["settings.json", "settings.json.lock"]
+    assert store.get("theme") == "Dark"  # still pending for the next flush
+
+
+def test_stores_in_two_processes_do_not_clobber_each_other(settings_file):
+    writer = (
+        "import sys\n"
+        "from elysium.core.settings import SettingsStore\n"
+        "store = SettingsStore(sys.argv[1])\n"
+        "for i in range(25):\n"
+        "    store.set(f'{sys.argv[2]}_{i}', i, flush=True)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.getcwd()}
+    procs = [
+        subprocess.Popen([sys.executable, "-c", writer, str(settings_file), name], env=env)
+        for name in ("launcher", "elysium")
+    ]
+    assert [proc.wait(timeout=60) for proc in procs] == [0, 0]
+    data = json.loads(settings_file.read_text(encoding="utf-8"))
+    assert set(data) - {"schema_version"} == {f"{name}_{i}" for name in ("launcher", "elysium") for i in range(25)}
+
+
+def test_values_are_validated_and_coerced(settings_file):
+    store = settings_module.SettingsStore(str(settings_file))
+    store.set("max_parallel_updates", "6")
+    assert store.get("max_parallel_updates") == 6
+    with pytest.raises(ValueError):
+        store.set("theme", "Purple")
+    with pytest.raises(ValueError):
+        store.set("max_parallel_updates", 0)
+    store.set("custom_key", {"kept": True})
+    assert store.get("custom_key") == {"kept": True}
+
+
+def test_old_file_is_migrated_once_at_load(settings_file, monkeypatch):
+    monkeypatch.setattr(settings_module, "RELOAD_CHECK_SECONDS", 0)
+    settings_file.write_text(
+        json.dumps({"theme": "light", "app_view_mode": "GRID", "window_x": "", "max_parallel_updates": -3}),
+        encoding="utf-8",
+    )
+    migrations = []
+    real_migrate = settings_module.migrate_settings
+    monkeypatch.setattr(settings_module, "migrate_settings", lambda data: migrations.append(1) or real_migrate(data))
+    store = settings_module.SettingsStore(str(settings_file))
+
+    for _ in range(20):
+        assert store.get("theme") == "Light"
+        assert store.get("app_view_mode") == "grid"
+        assert store.get("window_x") is None
+        assert store.get("max_parallel_updates") == 4  # invalid value falls back to the default
+    assert migrations == [1]
+
+    store.set("window_y", 10, flush=True)
+    raw = json.loads(settings_file.read_text(encoding="utf-8"))
+    assert raw["schema_version"] == settings_module.SETTINGS_SCHEMA_VERSION
+    assert raw["theme"] == "Light" and raw["window_y"] == 10
+
+
+def test_subscribers_hear_only_their_key(settings_file, monkeypatch):
+    monkeypatch.setattr(settings_module, "RELOAD_CHECK_SECONDS", 0)
+    store = settings_module.SettingsStore(str(settings_file), debounce=60)
+    themes, views = [], []
+    store.subscribe("theme", themes.append)
+    unsubscribe = store.subscribe("app_view_mode", views.append)
+
+    store.set("theme", "Light")
+    store.set("theme", "Light")
+    store.set("log_level", "DEBUG")
+    store.flush()
+    assert themes == ["Light"] and views == []
+
+    # Edited by another process.
+    settings_file.write_text(json.dumps({"theme": "Dark", "app_view_mode": "grid"}), encoding="utf-8")
+    os.utime(settings_file, ns=(1, 1))
+    store.get("log_level")
+    assert themes == ["Light", "Dark"] and views == ["grid"]
+
+    unsubscribe()
+    store.set("app_view_mode", "list")
+    assert views == ["grid"]
+
+
+def test_bound_method_subscribers_do_not_keep_their_owner_alive(settings_file):
+    store = settings_module.SettingsStore(str(settings_file), debounce=60)
+    seen = []
+
+    class Owner:
+        def on_theme(self, value):
+            seen.append(value)
+
+    owner = Owner()
+    store.subscribe("theme", owner.on_theme)
+    store.set("theme", "Light")
+    del owner
+    store.set("theme", "Dark")
+    assert seen == ["Light"]
+
+
+def test_default_settings_match_the_schema():
+    assert settings_module.settings_model()().model_dump() == settings_module.DEFAULT_SETTINGS
@@ -0,0 +1,168 @@
+"""Tests for the single-instance lock and hand-off."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from elysium.core.single_instance import (
+    SingleInstance,
+    claim_single_instance,
+    hand_off,
+    request_from_argv,
+)
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def primary(tmp_path):
+    received: list[dict] = []
+    instance = SingleInstance(str(tmp_path))
+    assert instance.acquire()
+    instance.serve(received.append)
+    yield instance, received
+    instance.release()
+
+
+def test_request_from_argv():
+    assert request_from_argv([]) == {"action": "show"}
+    assert request_from_argv(["--launch", "dfr"]) == {"action": "launch", "app_id": "dfr"}
+    assert request_from_argv(["--launch"]) == {"action": "show"}
+
+
+def test_second_instance_cannot_take_lock(primary, tmp_path):
+    assert not SingleInstance(str(tmp_path)).acquire()
+
+
+def test_hand_off_delivers_request(primary, tmp_path):
+    _instance, received = primary
+    started = time.monotonic()
+    assert hand_off({"action": "launch", "app_id": "flow"}, str(tmp_path))
+    assert time.monotonic() - started < 1.0
+    assert received == [{"action": "launch", "app_id": "flow"}]
+
+
+def test_hand_off_without_running_instance(tmp_path):
+    assert not hand_off({"action": "show"}, str(tmp_path))
+    # The probe must not keep the lock.
+    assert SingleInstance(str(tmp_path)).acquire()
+
+
+def test_claim_returns_none_after_hand_off(primary, tmp_path):
+    assert claim_single_instance({"action": "show"}, directory=str(tmp_path)) is None
+    assert primary[1] == [{"action": "show"}]
+
+
+def test_claim_takes_over_unresponsive_holder(tmp_path):
+    holder = SingleInstance(str(tmp_path))
+    assert holder.acquire()  # holds the lock but never serves
+    conflicts = []
+
+    def on_conflict():
+        conflicts.append(True)
+        holder.release()
+
+    instance = claim_single_instance(
+        {"action": "show"}, directory=str(tmp_path), on_conflict=on_conflict, timeout=0.2
+    )
+    try:
+        assert conflicts == [True]
+        assert instance is not None and instance.primary
+    finally:
+        instance.release()
+
+
+def test_release_cleans_up_and_frees_lock(tmp_path):
+    instance = SingleInstance(str(tmp_path))
+    assert instance.acquire()
+    instance.serve(lambda message: None)
+    with open(instance.info_path, encoding="utf-8") as f:
+        address = json.load(f)["address"]
+    instance.release()
+
+    assert not os.path.exists(instance.info_path)
+    if not sys.platform.startswith("win"):
+        assert not os.path.exists(address)
+    assert SingleInstance(str(tmp_path)).acquire()
+
+
+def test_handler_error_is_reported(tmp_path):
+    instance = SingleInstance(str(tmp_path))
+    assert instance.acquire()
+
+    def broken(message):
+        raise ValueError("no such app")
+
+    instance.serve(broken)
+    try:
+        reply = SingleInstance(str(tmp_path)).send({"action": "launch", "app_id": "x"}, timeout=1.0)
+        assert reply == {"ok": False, "error": "no such app"}
+        assert not hand_off({"action": "show"}, str(tmp_path), timeout=1.0)
+    finally:
+        instance.release()
+
+
+def test_hand_off_across_processes(tmp_path):
+    ready = tmp_path / "ready"
+    log = tmp_path / "received.json"
+    script = textwrap.dedent(
+        f"""
+        import json, sys, threading, time
+        sys.path.insert(0, {_REPO_ROOT!r})
+        from elysium.core.single_instance import SingleInstance
+
+        done = threading.Event()
+        def on_message(message):
+            with open({str(log)!r}, "w") as f:
+                json.dump(message, f)
+            done.set()
+
+        instance = SingleInstance({str(tmp_path)!r})
+        assert instance.acquire()
+        instance.serve(on_message)
+        open({str(ready)!r}, "w").close()
+        done.wait(10)
+        instance.release()
+        """
+    )
+    child = subprocess.Popen([sys.executable, "-c", script])
+    try:
+        deadline = time.monotonic() + 10
+        while not ready.exists() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert hand_off({"action": "launch", "app_id": "dfr"}, str(tmp_path))
+        assert child.wait(timeout=10) == 0
+        assert json.loads(log.read_text()) == {"action": "launch", "app_id": "dfr"}
+    finally:
+        if child.poll() is None:
+            child.kill()
+            child.wait()
+
+
+def test_concurrent_acquire_has_one_winner(tmp_path):
+    results = []
+    barrier = threading.Barrier(4)
+    instances = [SingleInstance(str(tmp_path)) for _ in range(4)]
+
+    def contend(instance):
+        barrier.wait()
+        results.append(instance.acquire())
+
+    threads = [threading.Thread(target=contend, args=(i,)) for i in instances]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    try:
+        assert sorted(results) == [False, False, False, True]
+    finally:
+        for instance in instances:
+            instance.release()
@@ -0,0 +1,145 @@
+import ast
+import importlib.util
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from elysium.core.lazy import lazy_import
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
+
+import bench_startup  # noqa: E402
+
+
+def _top_level_imports(path):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = []
+    pending = list(tree.body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.append(node.module)
+        elif isinstance(node, (ast.If, ast.Try)):
+            pending.extend(node.body)
+            pending.extend(node.orelse)
+            pending.extend(getattr(node, "handlers", []))
+        elif isinstance(node, ast.ExceptHandler):
+            pending.extend(node.body)
+    return names
+
+
+def test_legacy_entry_point_has_no_heavy_top_level_imports():
+    imports = _top_level_imports(os.path.join(REPO_ROOT, "ELYSIUM.py"))
+    banned = bench_startup.forbidden_imports(imports) + [name for name in imports if name == "winreg"]
+    assert banned == []
+
+
+def test_pre_splash_modules_do_not_load_heavy_packages(tmp_path):
+    # Runs without Qt: import what ELYSIUM.py imports at top level and read
+    # the UI flag the way it does, then look at sys.modules. elysium.main is
+    # the QML shell, which replaces the legacy splash altogether.
+    modules = sorted(
+        {
+            name
+            for name in _top_level_imports(os.path.join(REPO_ROOT, "ELYSIUM.py"))
+            if name.startswith("elysium") and name != "elysium.main"
+        }
+    )
+    (tmp_path / "settings.json").write_text('{"use_qml_ui": false, "theme": "light"}', encoding="utf-8")
+    code = (
+        "import importlib, sys\n"
+        "from elysium.core import paths\n"
+        f"paths.get_settings_path = lambda: {str(tmp_path / 'settings.json')!r}\n"
+        f"for name in {modules!r}:\n"
+        "    importlib.import_module(name)\n"
+        "from elysium.core.settings import peek_setting\n"
+        "assert peek_setting('use_qml_ui', True) is False\n"
+        "print('\\n'.join(sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    loaded = result.stdout.split()
+    assert "pydantic" not in loaded
+    assert bench_startup.forbidden_imports(loaded) == []
+
+
+def test_lazy_import_defers_module_body(tmp_path, monkeypatch):
+    (tmp_path / "lazy_probe_mod.py").write_text("import sys\nsys.lazy_probe_loaded = True\nVALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delattr(sys, "lazy_probe_loaded", raising=False)
+    try:
+        module = lazy_import("lazy_probe_mod")
+        assert not hasattr(sys, "lazy_probe_loaded")
+        assert module.VALUE == 42
+        assert sys.lazy_probe_loaded is True
+        assert lazy_import("lazy_probe_mod") is module
+    finally:
+        sys.modules.pop("lazy_probe_mod", None)
+
+
+def test_lazy_import_first_access_is_thread_safe(tmp_path, monkeypatch):
+    (tmp_path / "lazy_slow_mod.py").write_text(
+        "import sys, time\nsys.lazy_slow_runs = getattr(sys, 'lazy_slow_runs', 0) + 1\ntime.sleep(0.2)\nLAST = 2\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delattr(sys, "lazy_slow_runs", raising=False)
+    results, errors = [], []
+    try:
+        module = lazy_import("lazy_slow_mod")
+        start = threading.Barrier(4)
+
+        def read():
+            start.wait()
+            try:
+                results.append(module.LAST)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert errors == []
+        assert results == [2, 2, 2, 2]
+        assert sys.lazy_slow_runs == 1
+    finally:
+        sys.modules.pop("lazy_slow_mod", None)
+
+
+def test_lazy_import_missing_module_raises():
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("elysium_no_such_module")
+
+
+def test_parse_importtime_sums_top_level_cumulative():
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |   encodings.aliases",
+            "import time:       200 |        300 | encodings",
+            "import time:        50 |         50 | openpyxl",
+        ]
+    )
+    total, modules = bench_startup.parse_importtime(stderr)
+    assert total == 350
+    assert modules == ["encodings.aliases", "encodings", "openpyxl"]
+    assert bench_startup.forbidden_imports(modules) == ["openpyxl"]
+    assert bench_startup.forbidden_imports(["elysium.services.git_service", "requests_toolbelt"]) == [
+        "elysium.services.git_service"
+    ]
+
+
+@pytest.mark.skipif(importlib.util.find_spec("PyQt5") is None, reason="legacy UI needs PyQt5")
+def test_no_heavy_modules_before_splash():
+    run = bench_startup.run_once()
+    assert bench_startup.forbidden_imports(run["modules"]) == []
@@ -0,0 +1,58 @@
+"""Tests for the persistent app state store."""
+
+from __future__ import annotations
+
+import pytest
+
+from elysium.services.state_store import StateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return StateStore(str(tmp_path / "state.db"))
+
+
+def test_update_merges_fields(store):
+    store.record_update("dfr", "abc123")
+    store.record_install_state("dfr", True, 1700000000.0)
+
+    record = store.get("dfr")
+    assert record.commit_sha == "abc123"
+    assert record.updated_at is not None
+    assert record.installed is True
+    assert record.entry_mtime == 1700000000.0
+    assert record.last_launch_ok is None
+
+
+def test_snapshot_survives_reopen(store, tmp_path):
+    store.record_launch("flow", False)
+    store.record_remote_head("flow", "def456")
+
+    reopened = StateStore(str(tmp_path / "state.db"))
+    snapshot = reopened.all()
+    assert set(snapshot) == {"flow"}
+    assert snapshot["flow"].last_launch_ok is False
+    assert snapshot["flow"].remote_sha == "def456"
+
+
+def test_remote_is_fresh_respects_ttl(store):
+    store.record_remote_head("dfr", "abc")
+    record = store.get("dfr")
+    assert record.remote_is_fresh(300)
+    assert not record.remote_is_fresh(300, now=record.remote_checked_at + 301)
+
+
+def test_unknown_fields_rejected(store):
+    with pytest.raises(ValueError):
+        store.update("dfr", bogus=1)
+
+
+def test_corrupt_database_is_replaced(tmp_path):
+    path = tmp_path / "state.db"
+    path.write_bytes(b"not a sqlite database" * 64)
+
+    store = StateStore(str(path))
+    store.record_update("dfr", "abc")
+
+    assert store.get("dfr").commit_sha == "abc"
+    assert (tmp_path / "state.db.corrupt").is_file()
@@ -0,0 +1,101 @@
+"""Tests for startup phase timelines."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import zipfile
+
+import pytest
+
+from elysium.core import timeline
+from elysium.core.timeline import PhaseTimer, prune_timelines, recent_timelines
+from elysium.services import diagnostics_service
+
+
+def test_phases_are_relative_to_origin(tmp_path):
+    origin = time.monotonic() - 1.0
+    timer = PhaseTimer(origin=origin, directory=str(tmp_path))
+    timer.record("ensure_runtime_ready", origin, origin + 0.25)
+    with timer.phase("app_registry_load"):
+        pass
+    timer.mark("ui_ready")
+
+    data = timer.to_dict()
+    names = [p["name"] for p in data["phases"]]
+    assert names == ["ensure_runtime_ready", "app_registry_load", "ui_ready"]
+    assert data["phases"][0]["start_ms"] == 0
+    assert data["phases"][0]["duration_ms"] == 250
+    assert data["phases"][1]["start_ms"] >= 1000
+    assert data["phases"][2]["duration_ms"] == 0
+    assert data["total_ms"] >= 1000
+
+
+def test_phase_records_on_exception_and_from_threads(tmp_path):
+    timer = PhaseTimer(directory=str(tmp_path))
+    with pytest.raises(RuntimeError):
+        with timer.phase("failing"):
+            raise RuntimeError("boom")
+    worker = threading.Thread(target=timer.mark, args=("worker",), name="init-worker")
+    worker.start()
+    worker.join()
+    assert [(p.name, p.thread) for p in timer.phases][-1] == ("worker", "init-worker")
+    assert timer.phases[0].name == "failing"
+
+
+def test_save_rewrites_one_file_per_launch(tmp_path):
+    timer = PhaseTimer(directory=str(tmp_path))
+    timer.mark("ui_ready")
+    first = timer.save()
+    timer.mark("first_update_pass")
+    assert timer.save() == first
+
+    assert os.listdir(tmp_path) == [os.path.basename(first)]
+    with open(first, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert [p["name"] for p in saved["phases"]] == ["ui_ready", "first_update_pass"]
+
+
+def test_recent_timelines_newest_first_and_prune(tmp_path):
+    for stamp in ("20260101_000000", "20260102_000000", "20260103_000000"):
+        (tmp_path / f"timeline_{stamp}_1.json").write_text("{}")
+    (tmp_path / "other.json").write_text("{}")
+
+    recent = [os.path.basename(p) for p in recent_timelines(2, directory=str(tmp_path))]
+    assert recent == ["timeline_20260103_000000_1.json", "timeline_20260102_000000_1.json"]
+
+    prune_timelines(str(tmp_path), keep=1)
+    assert sorted(os.listdir(tmp_path)) == ["other.json", "timeline_20260103_000000_1.json"]
+
+
+def test_export_diagnostics_includes_last_timelines(tmp_path, monkeypatch):
+    logs = tmp_path / "logs"
+    timelines = logs / "timelines"
+    timelines.mkdir(parents=True)
+    for day in range(1, 6):
+        (timelines / f"timeline_2026010{day}_000000_1.json").write_text("{}")
+    (logs / "launcher.log").write_text("log")
+
+    monkeypatch.setattr(diagnostics_service, "get_logs_dir", lambda: str(logs))
+    monkeypatch.setattr(diagnostics_service, "get_timelines_dir", lambda: str(timelines))
+    monkeypatch.setattr(timeline, "get_timelines_dir", lambda: str(timelines))
+    monkeypatch.setattr(diagnostics_service, "get_settings_path", lambda: str(tmp_path / "missing.json"))
+    monkeypatch.setattr(diagnostics_service, "resolve_manifest_path", lambda: str(tmp_path / "missing.yaml"))
+    sources = [{"name": "local", "location": str(tmp_path / "missing.yaml"), "path": None}]
+    monkeypatch.setattr(diagnostics_service, "manifest_sources_info", lambda: sources)
+    monkeypatch.setattr(diagnostics_service, "collect_app_states", lambda registry=None: {})
+    monkeypatch.setattr(diagnostics_service, "AppRegistry", lambda: None)
+
+    zip_path = diagnostics_service.export_diagnostics(str(tmp_path / "out"), timelines=2)
+
+    with zipfile.ZipFile(zip_path) as zf:
+        names = set(zf.namelist())
+        assert json.loads(zf.read("manifests/sources.json")) == sources
+    assert {n for n in names if n.startswith("timelines/")} == {
+        "timelines/timeline_20260105_000000_1.json",
+        "timelines/timeline_20260104_000000_1.json",
+    }
+    assert "logs/launcher.log" in names
+    assert not any(n.startswith("logs/timelines") for n in names)
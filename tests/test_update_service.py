@@ -0,0 +1,225 @@
+"""Tests for the concurrent app update engine."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from elysium.core import proc
+from elysium.core.cancel import CancelScope
+from elysium.core.models import AppDefinition, AppLaunchConfig
+from elysium.services.state_store import StateStore
+from elysium.services.update_service import UpdateOutcome, UpdateService
+
+
+def _repo_app(app_id: str) -> AppDefinition:
+    return AppDefinition(
+        id=app_id,
+        name=app_id.upper(),
+        repo_url=f"https://example.com/{app_id}.git",
+        launch=AppLaunchConfig(entry="main.py"),
+    )
+
+
+class FakeRegistry:
+    def __init__(self, install_dirs: dict[str, str] | None = None):
+        self.install_dirs = install_dirs or {}
+
+    def app_install_dir(self, app):
+        return self.install_dirs.get(app.id, f"/tmp/{app.id}")
+
+
+def _git(*args: str, cwd=None) -> str:
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def _commit(work_dir, message: str) -> None:
+    (work_dir / "file.txt").write_text(message, encoding="utf-8")
+    _git("add", "file.txt", cwd=work_dir)
+    _git("-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-qm", message, cwd=work_dir)
+
+
+@pytest.fixture
+def git_remote(tmp_path):
+    """A bare remote with one commit plus a shallow app checkout of it."""
+    remote = tmp_path / "remote.git"
+    _git("init", "-q", "--bare", str(remote))
+    author = tmp_path / "author"
+    _git("clone", "-q", str(remote), str(author))
+    _commit(author, "first")
+    _git("push", "-q", "origin", "HEAD", cwd=author)
+
+    url = remote.as_uri()
+    checkout = tmp_path / "checkout"
+    _git("clone", "-q", "--depth", "1", url, str(checkout))
+    return url, author, checkout
+
+
+def test_update_apps_runs_concurrently(monkeypatch):
+    service = UpdateService(FakeRegistry())
+    apps = [_repo_app(f"app{i}") for i in range(8)]
+
+    def slow_update(app, *, timeout=None):
+        time.sleep(0.2)
+        return UpdateOutcome.PULLED
+
+    monkeypatch.setattr(service, "sync_app", slow_update)
+
+    started = time.monotonic()
+    results = service.update_apps(apps, max_workers=8)
+    elapsed = time.monotonic() - started
+
+    assert results == {app.id: UpdateOutcome.PULLED for app in apps}
+    assert elapsed < 0.2 * 4
+
+
+def test_update_apps_respects_max_workers(monkeypatch):
+    service = UpdateService(FakeRegistry())
+    apps = [_repo_app(f"app{i}") for i in range(6)]
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def tracked_update(app, *, timeout=None):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return UpdateOutcome.PULLED
+
+    monkeypatch.setattr(service, "sync_app", tracked_update)
+    service.update_apps(apps, max_workers=2)
+
+    assert peak == 2
+
+
+def test_update_apps_reports_each_app_as_it_finishes(monkeypatch):
+    service = UpdateService(FakeRegistry())
+    apps = [_repo_app("slow"), _repo_app("fast")]
+    delays = {"slow": 0.3, "fast": 0.0}
+
+    def update(app, *, timeout=None):
+        time.sleep(delays[app.id])
+        return UpdateOutcome.PULLED if app.id == "fast" else UpdateOutcome.FAILED
+
+    monkeypatch.setattr(service, "sync_app", update)
+    started: list[str] = []
+    finished: list[tuple[str, UpdateOutcome]] = []
+
+    service.update_apps(
+        apps,
+        max_workers=2,
+        on_started=lambda app: started.append(app.id),
+        on_finished=lambda app, ok: finished.append((app.id, ok)),
+    )
+
+    assert sorted(started) == ["fast", "slow"]
+    assert finished == [("fast", UpdateOutcome.PULLED), ("slow", UpdateOutcome.FAILED)]
+
+
+def test_update_apps_skips_unstarted_apps_after_cancel(monkeypatch):
+    service = UpdateService(FakeRegistry())
+    apps = [_repo_app(f"app{i}") for i in range(4)]
+    cancel = CancelScope()
+
+    def update(app, *, timeout=None):
+        cancel.cancel_all()
+        return UpdateOutcome.UP_TO_DATE
+
+    monkeypatch.setattr(service, "sync_app", update)
+    results = service.update_apps(apps, max_workers=1, cancel=cancel)
+
+    assert results == {"app0": UpdateOutcome.UP_TO_DATE}
+
+
+def test_cancelling_one_app_kills_its_git_and_frees_the_worker(monkeypatch):
+    service = UpdateService(FakeRegistry())
+    cancel = CancelScope()
+    finished: list[tuple[str, UpdateOutcome]] = []
+
+    def update(app, *, timeout=None):
+        if app.id == "hung":
+            threading.Timer(0.2, cancel.cancel, args=("hung",)).start()
+            result = proc.run([sys.executable, "-c", "import time; time.sleep(30)"])
+            return UpdateOutcome.PULLED if result.ok else UpdateOutcome.FAILED
+        return UpdateOutcome.UP_TO_DATE
+
+    monkeypatch.setattr(service, "sync_app", update)
+    started = time.monotonic()
+    results = service.update_apps(
+        [_repo_app("hung"), _repo_app("next")],
+        max_workers=1,
+        cancel=cancel,
+        on_finished=lambda app, outcome: finished.append((app.id, outcome)),
+    )
+
+    assert time.monotonic() - started < 3
+    assert results == {"hung": UpdateOutcome.CANCELLED, "next": UpdateOutcome.UP_TO_DATE}
+    assert not UpdateOutcome.CANCELLED.ok
+
+
+def test_update_apps_passes_timeout(monkeypatch):
+    service = UpdateService(FakeRegistry())
+    seen: list[float | None] = []
+
+    def update(app, *, timeout=None):
+        seen.append(timeout)
+        return UpdateOutcome.UP_TO_DATE
+
+    monkeypatch.setattr(service, "sync_app", update)
+    service.update_apps([_repo_app("dfr")], max_workers=1, timeout=12.5)
+
+    assert seen == [12.5]
+
+
+def _sync_service(tmp_path, url, checkout, ttl: float):
+    app = _repo_app("dfr").model_copy(update={"repo_url": url})
+    store = StateStore(str(tmp_path / "state.db"))
+    service = UpdateService(FakeRegistry({"dfr": str(checkout)}), store, head_ttl=ttl)
+    return service, app
+
+
+def test_sync_app_skips_pull_when_remote_head_matches(git_remote, tmp_path, monkeypatch):
+    url, _author, checkout = git_remote
+    service, app = _sync_service(tmp_path, url, checkout, ttl=300)
+    pulls: list[str] = []
+    monkeypatch.setattr(service, "update_app", lambda app, timeout=None: pulls.append(app.id) or True)
+
+    assert service.sync_app(app) == UpdateOutcome.UP_TO_DATE
+    assert service.sync_app(app) == UpdateOutcome.UP_TO_DATE_CACHED
+    assert pulls == []
+
+
+def test_sync_app_cached_hit_does_no_network_probe(git_remote, tmp_path, monkeypatch):
+    url, _author, checkout = git_remote
+    service, app = _sync_service(tmp_path, url, checkout, ttl=300)
+    service.state_store.record_remote_head("dfr", _git("rev-parse", "HEAD", cwd=checkout))
+
+    def no_probe(*args, **kwargs):
+        raise AssertionError("ls-remote should not run on a fresh cache hit")
+
+    monkeypatch.setattr(service, "remote_head", no_probe)
+    assert service.sync_app(app) == UpdateOutcome.UP_TO_DATE_CACHED
+
+
+def test_sync_app_pulls_when_remote_moved(git_remote, tmp_path, monkeypatch):
+    url, author, checkout = git_remote
+    service, app = _sync_service(tmp_path, url, checkout, ttl=0)
+    pulls: list[str] = []
+    monkeypatch.setattr(service, "update_app", lambda app, timeout=None: pulls.append(app.id) or True)
+    assert service.sync_app(app) == UpdateOutcome.UP_TO_DATE
+
+    _commit(author, "second")
+    _git("push", "-q", "origin", "HEAD", cwd=author)
+
+    assert service.sync_app(app) == UpdateOutcome.PULLED
+    assert pulls == ["dfr"]
+    assert service.state_store.get("dfr").remote_sha == _git("rev-parse", "HEAD", cwd=author)
@@ -0,0 +1,109 @@
+"""Tests for the shared wheelhouse cache."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from elysium.services.wheelhouse import Wheelhouse, main
+from tests.test_pip_installer import build_wheel
+
+
+@pytest.fixture
+def source_index(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    build_wheel(source, "alpha", "1.0")
+    build_wheel(source, "beta", "2.1", ("alpha>=1",))
+    return source
+
+
+@pytest.fixture
+def requirements(tmp_path):
+    path = tmp_path / "requirements.txt"
+    path.write_text("beta==2.1\n", encoding="utf-8")
+    return path
+
+
+def _write_wheel(directory, name: str, size: int, mtime: float) -> str:
+    path = os.path.join(directory, f"{name}-1.0-py3-none-any.whl")
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_install_populates_then_works_offline(tmp_path, source_index, requirements):
+    wheelhouse = Wheelhouse(str(tmp_path / "wheelhouse"), max_bytes=10**9)
+    source_args = ["--no-index", "--find-links", str(source_index)]
+
+    first = wheelhouse.install(
+        str(requirements), install_args=["--target", str(tmp_path / "env1")], source_args=source_args
+    )
+    assert first.ok
+    assert first.installed == {"alpha": "1.0", "beta": "2.1"}
+    assert sorted(os.path.basename(w.path) for w in wheelhouse.wheels()) == [
+        "alpha-1.0-py3-none-any.whl",
+        "beta-2.1-py3-none-any.whl",
+    ]
+
+    # With the source gone, a rebuild must come entirely from the wheelhouse.
+    for wheel in source_index.iterdir():
+        wheel.unlink()
+    second = wheelhouse.install(str(requirements), install_args=["--target", str(tmp_path / "env2")])
+    assert second.ok
+    assert len(second.attempts) == 1
+    assert (tmp_path / "env2" / "beta.py").is_file()
+
+
+def test_install_never_evicts_the_wheels_it_just_built(tmp_path, source_index, requirements):
+    directory = tmp_path / "wheelhouse"
+    directory.mkdir()
+    stale = _write_wheel(directory, "stale", 100, 1_000)
+    wheelhouse = Wheelhouse(str(directory), max_bytes=1)
+
+    result = wheelhouse.install(
+        str(requirements),
+        install_args=["--target", str(tmp_path / "env")],
+        source_args=["--no-index", "--find-links", str(source_index)],
+    )
+
+    assert result.ok
+    assert (tmp_path / "env" / "beta.py").is_file()
+    assert sorted(os.path.basename(w.path) for w in wheelhouse.wheels()) == [
+        "alpha-1.0-py3-none-any.whl",
+        "beta-2.1-py3-none-any.whl",
+    ]
+    assert not os.path.exists(stale)
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    wheelhouse = Wheelhouse(str(tmp_path), max_bytes=250)
+    oldest = _write_wheel(tmp_path, "oldest", 100, 1_000)
+    middle = _write_wheel(tmp_path, "middle", 100, 2_000)
+    newest = _write_wheel(tmp_path, "newest", 100, 3_000)
+
+    assert wheelhouse.prune() == [oldest]
+    assert wheelhouse.prune(max_bytes=100) == [middle]
+    assert [w.path for w in wheelhouse.wheels()] == [newest]
+
+
+def test_touch_refreshes_used_wheels(tmp_path):
+    wheelhouse = Wheelhouse(str(tmp_path), max_bytes=100)
+    used = _write_wheel(tmp_path, "Foo_Bar", 100, 1_000)
+    unused = _write_wheel(tmp_path, "other", 100, 2_000)
+
+    wheelhouse.touch({"foo-bar": "1.0"})
+
+    assert wheelhouse.prune() == [unused]
+    assert os.path.exists(used)
+
+
+def test_prune_command(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr("elysium.services.wheelhouse.get_wheelhouse_dir", lambda: str(tmp_path))
+    _write_wheel(tmp_path, "alpha", 2048, 1_000)
+
+    assert main(["prune", "--max-mb", "0"]) == 0
+    assert "removed alpha-1.0-py3-none-any.whl" in capsys.readouterr().out
+    assert not list(tmp_path.glob("*.whl"))